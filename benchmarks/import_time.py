@@ -0,0 +1,87 @@
+"""Benchmark of the package import time.
+
+Run `python -X importtime -c "import <module>"` several times in fresh
+interpreters and report the cumulative import time of the package and the
+heaviest modules it pulls in.
+
+Usage
+-----
+    python benchmarks/import_time.py [-n RUNS] [-t TOP] [module]
+
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def import_times(module):
+    """
+    Import the module in a fresh interpreter and parse `-X importtime`.
+
+    Parameters
+    ----------
+    module: Str.
+        Name of the module to import.
+
+    Returns
+    -------
+        Dictionary with the cumulative import time in microseconds of each
+        module imported by `import module` (interpreter startup excluded).
+
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+
+    # Children are reported before their parent, so the import tree of the
+    # module is the block of nested lines right before its top level line.
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative)))
+
+    times = {}
+    for depth, name, cumulative in reversed(entries):
+        if times and depth == 0:
+            break
+        if times or (depth == 0 and name == module):
+            times[name] = cumulative
+
+    return times
+
+
+def main():
+    """Run the benchmark and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="pretty_verbose")
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument("-t", "--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [run[args.module] for run in runs]
+
+    print(
+        f"import {args.module}: median {statistics.median(totals)/1000:.2f}ms"
+        f" (min {min(totals)/1000:.2f}ms, max {max(totals)/1000:.2f}ms, "
+        f"{args.runs} runs)"
+    )
+
+    print("Heaviest modules (median cumulative time):")
+    medians = {
+        name: statistics.median(run.get(name, 0) for run in runs)
+        for name in runs[0]
+    }
+    heaviest = sorted(medians.items(), key=lambda item: -item[1])
+    for name, value in heaviest[1:args.top + 1]:
+        print(f"  {value/1000:8.2f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
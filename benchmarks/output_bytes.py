@@ -0,0 +1,70 @@
+"""Benchmark of the bytes written to a terminal console.
+
+Print a mix of messages and progress lines to an in-memory terminal and
+compare the bytes written with the bytes the lines would take padded to the
+terminal width, as they were before the erase-line sequences.
+
+Usage
+-----
+    python benchmarks/output_bytes.py [-n MESSAGES] [-c COLUMNS]
+
+"""
+import argparse
+import io
+
+from pretty_verbose import VerboseMessages
+from pretty_verbose.constants import colors
+
+
+def output_bytes(n_messages, columns):
+    """
+    Print the messages and count the bytes.
+
+    Parameters
+    ----------
+    n_messages: Int.
+        Number of messages, half of them progress lines.
+
+    columns: Int.
+        Width of the terminal.
+
+    Returns
+    -------
+        Tuple with the bytes written and the bytes padding the lines.
+
+    """
+    stream = io.StringIO()
+    messages = VerboseMessages(
+        level=3, name="bench", no_save=True, stream=stream, plain=False
+    )
+
+    for i in range(n_messages // 2):
+        messages.info(f"Processing item {i}.")
+        messages.progress("Progress", 100 * (i + 1) / (n_messages // 2))
+
+    output = stream.getvalue()
+    padded = 0
+    for line in output.replace("\r", "\r\n").splitlines(keepends=True):
+        text = line.rstrip("\r\n").replace(colors.ERASE_LINE, "")
+        padded += max(len(text), columns) + len(line) - len(line.rstrip())
+
+    return len(output.encode()), padded
+
+
+def main():
+    """Run the benchmark and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--messages", type=int, default=10000)
+    parser.add_argument("-c", "--columns", type=int, default=300)
+    args = parser.parse_args()
+
+    written, padded = output_bytes(args.messages, args.columns)
+    print(
+        f"{args.messages} messages, {args.columns} columns: "
+        f"{written} bytes with erase-line, {padded} bytes padded "
+        f"({padded / written:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark of the memory used by each `Task` of a `Process` tree.
+
+Create a process with many tasks and report the bytes allocated per task,
+measured with `tracemalloc`.
+
+Usage
+-----
+    python benchmarks/task_memory.py [-n TASKS]
+
+"""
+import argparse
+import gc
+import tracemalloc
+
+from pretty_verbose import Process
+
+
+def bytes_per_task(n_tasks):
+    """
+    Measure the bytes allocated by each task of a process.
+
+    Parameters
+    ----------
+    n_tasks: Int.
+        Number of tasks to create.
+
+    Returns
+    -------
+        Float with the number of bytes per task.
+
+    """
+    process = Process(-1, "bench", no_save=True)
+
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+
+    for i in range(n_tasks):
+        process.new_task(f"task_{i}")
+
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (end - start) / n_tasks
+
+
+def main():
+    """Run the benchmark and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--tasks", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(
+        f"{bytes_per_task(args.tasks):.0f} bytes per Task "
+        f"({args.tasks} tasks)"
+    )
+
+
+if __name__ == "__main__":
+    main()
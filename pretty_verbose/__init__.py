@@ -1,13 +1,31 @@
 """Main file of the package with the imports and the aliases."""
 from pretty_verbose.error_classes import (LoggerError, LoggerErrorBase,
                                           MissingLogFolderError, RunningError)
-from pretty_verbose.logger_classes import Logger
 from pretty_verbose.messages_classes import VerboseMessages
 from pretty_verbose.processes_classes import Process, Task
 
 __all__ = [
     "VerboseMessages",
     "Task", "Process",
-    "Logger",
+    "Logger", "VerboseHandler", "Watchdog",
     "RunningError", "LoggerError", "LoggerErrorBase", "MissingLogFolderError"
 ]
+
+# Objects imported on first access, to keep the package import cheap.
+_LAZY_IMPORTS = {
+    "Logger": "pretty_verbose.logger_classes",
+    "VerboseHandler": "pretty_verbose.handler_classes",
+    "Watchdog": "pretty_verbose.watchdog_classes",
+}
+
+
+def __getattr__(name):
+    """Import the lazy objects of the package on first access."""
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module 'pretty_verbose' has no attribute '{name}'")
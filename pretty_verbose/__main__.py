@@ -0,0 +1,198 @@
+"""Command line tools for the saved logs: `python -m pretty_verbose`."""
+import argparse
+import sys
+
+
+def parse_time(value):
+    """Parse the time of the filters of the command line."""
+    from pretty_verbose.reader_classes import parse_time
+
+    try:
+        return parse_time(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"{error}")
+
+
+def add_filters(parser):
+    """Add the arguments to filter the messages to a parser."""
+    parser.add_argument(
+        "paths", nargs="+", help="Log files, or directories with log files."
+    )
+    parser.add_argument(
+        "-t", "--type", dest="types", action="append", type=str.upper,
+        help="Keep this type of message (repeatable)."
+    )
+    parser.add_argument(
+        "-s", "--scope", dest="scopes", action="append",
+        help="Keep the messages of this scope (repeatable)."
+    )
+    parser.add_argument(
+        "--since", type=parse_time,
+        help="Keep the messages written at or after this time."
+    )
+    parser.add_argument(
+        "--until", type=parse_time,
+        help="Keep the messages written at or before this time."
+    )
+    parser.add_argument(
+        "--sep", default=None,
+        help="Separator of the values, detected from the header by default."
+    )
+
+
+def iter_entries(args):
+    """Iterate over the filtered entries of the files of the arguments."""
+    from pretty_verbose.reader_classes import (
+        LogReader, log_paths, merge_entries
+    )
+
+    readers = [LogReader(path, sep=args.sep) for path in log_paths(args.paths)]
+    filters = dict(
+        types=args.types, scopes=args.scopes, since=args.since,
+        until=args.until
+    )
+    if getattr(args, "merge", False):
+        yield from merge_entries(readers, **filters)
+        return
+
+    for reader in readers:
+        yield from reader.entries(**filters)
+
+
+def replay(args):
+    """Replay the logs on the console."""
+    from pretty_verbose.reader_classes import replay
+
+    replay(
+        iter_entries(args), layout=args.layout,
+        plain=True if args.plain else (False if args.color else None)
+    )
+
+
+def summary(args):
+    """Print a summary of the logs."""
+    from pretty_verbose.reader_classes import log_paths
+    from pretty_verbose.summary_classes import summarize
+
+    print(summarize(
+        log_paths(args.paths), bucket=args.bucket, mask_numbers=not args.exact,
+        types=args.types, scopes=args.scopes, since=args.since,
+        until=args.until, max_workers=args.workers, sep=args.sep
+    ).report(args.top))
+
+
+def merge(args):
+    """Merge the logs in one timeline."""
+    import os
+
+    from pretty_verbose.reader_classes import log_paths, write_log
+
+    if args.output is None:
+        write_log(iter_entries(args), sys.stdout)
+        return
+
+    # The output is never one of the inputs, even if it is in their directory.
+    output = os.path.realpath(args.output)
+    args.paths = [
+        path for path in log_paths(args.paths)
+        if os.path.realpath(path) != output
+    ]
+    write_log(iter_entries(args), args.output)
+
+
+def build_parser():
+    """Build the parser of the command line."""
+    from pretty_verbose.messages_classes import DEFAULT_LAYOUT
+
+    parser = argparse.ArgumentParser(
+        prog="python -m pretty_verbose",
+        description="Tools for the logs saved by pretty_verbose."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_replay = commands.add_parser(
+        "replay", help="Print saved logs as they were shown on the console."
+    )
+    add_filters(parser_replay)
+    parser_replay.add_argument(
+        "--layout", default=DEFAULT_LAYOUT, help="Layout of the lines."
+    )
+    colors = parser_replay.add_mutually_exclusive_group()
+    colors.add_argument(
+        "--plain", action="store_true", help="Print without colors."
+    )
+    colors.add_argument(
+        "--color", action="store_true",
+        help="Print with colors even if the output is not a terminal."
+    )
+    parser_replay.add_argument(
+        "-m", "--merge", action="store_true",
+        help="Merge the messages of all the logs by time."
+    )
+    parser_replay.set_defaults(function=replay)
+
+    parser_merge = commands.add_parser(
+        "merge", help="Merge saved logs by time in one log with scopes."
+    )
+    add_filters(parser_merge)
+    parser_merge.add_argument(
+        "-o", "--output", default=None,
+        help="Merged log file, the standard output by default."
+    )
+    parser_merge.set_defaults(function=merge, merge=True)
+
+    parser_summary = commands.add_parser(
+        "summary", help="Count the messages of saved logs."
+    )
+    add_filters(parser_summary)
+    parser_summary.add_argument(
+        "--bucket", type=int, default=3600,
+        help="Seconds of the time buckets of the error rate."
+    )
+    parser_summary.add_argument(
+        "--top", type=int, default=10,
+        help="Number of most frequent messages."
+    )
+    parser_summary.add_argument(
+        "--exact", action="store_true",
+        help="Do not count together the messages that only differ in numbers."
+    )
+    parser_summary.add_argument(
+        "--workers", type=int, default=None,
+        help="Number of processes, the number of CPUs by default."
+    )
+    parser_summary.set_defaults(function=summary)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the command line.
+
+    Parameters
+    ----------
+    argv: Array. Default: None.
+        Arguments, the ones of the command line if None.
+
+    Returns
+    -------
+        Int with the exit code.
+
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        args.function(args)
+    except BrokenPipeError:
+        # Output closed early, e.g. piped to `head`.
+        sys.stderr.close()
+        return 0
+    except (OSError, ValueError) as error:
+        print(f"{args.command}: {error}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
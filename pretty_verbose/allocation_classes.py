@@ -0,0 +1,181 @@
+"""Classes of the memory allocations of the tasks."""
+import threading
+import tracemalloc
+
+# Frames stored by tracemalloc for each allocation.
+TRACE_FRAMES = 1
+
+# Allocation sites kept for each tracked run.
+TOP_SITES = 10
+
+# Trackers running, the trace is only active while there is one.
+_ACTIVE = []
+_LOCK = threading.Lock()
+_OWN_TRACE = False
+
+# The allocations of tracemalloc and the trackers are not reported.
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def _sync_peak():
+    """Pass the peak of the trace to the running trackers."""
+    peak = tracemalloc.get_traced_memory()[1]
+    for tracker in _ACTIVE:
+        if peak > tracker.peak:
+            tracker.peak = peak
+
+
+def _reset_peak():
+    """Reset the peak of the trace to the current memory.
+
+    Python < 3.9 can not reset the peak, so the peak of the trackers is the
+    one since the trace was started.
+
+    """
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+
+
+class AllocationStats:
+    """Memory allocated by a task between the start and stop of its timer.
+
+    Attributes
+    ----------
+    net: Int.
+        Allocated bytes still alive at the stop, negative if freed.
+
+    peak: Int.
+        Highest traced memory over the one at the start, in bytes.
+
+    sites: Array.
+        Tuples with the place (`file:line`), the net bytes and the number of
+        blocks of the sites which allocated more memory.
+
+    """
+    __slots__ = ("net", "peak", "sites")
+
+    def __init__(self, net, peak, sites):
+        self.net = net
+        self.peak = peak
+        self.sites = sites
+
+    def __repr__(self):
+        return f"AllocationStats({self})"
+
+    def __str__(self):
+        return (
+            f"allocated {self.net / 2 ** 20:+.3f}MiB, "
+            f"peak {self.peak / 2 ** 20:.3f}MiB"
+        )
+
+    def report(self, top=None):
+        """
+        Return the allocation sites as text.
+
+        Parameters
+        ----------
+        top: Int. Default: None.
+            Number of sites, all of the kept ones if None.
+
+        Returns
+        -------
+            List of strings, one for each site.
+
+        """
+        return [
+            f"{site}: {size / 1024:+.1f}KiB in {count:+} blocks"
+            for site, size, count in self.sites[:top]
+        ]
+
+
+class AllocationTracker:
+    """Tracker of the memory allocated while it runs.
+
+    The trace of tracemalloc is started with the first running tracker and
+    stopped with the last one, unless it was already started by someone
+    else. The trace is global, so the allocations of the other threads are
+    also counted.
+
+    Parameters
+    ----------
+    top: Int. Default: TOP_SITES.
+        Allocation sites kept.
+
+    """
+    __slots__ = ("top", "peak", "_current", "_snapshot")
+
+    def __init__(self, top=TOP_SITES):
+        self.top = top
+        self.peak = 0
+        self._current = None
+        self._snapshot = None
+
+    def start(self):
+        """Start tracking the allocations."""
+        global _OWN_TRACE
+
+        # The memory taken by the snapshots is left out of the peaks.
+        with _LOCK:
+            if not _ACTIVE and not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+                _OWN_TRACE = True
+
+            _sync_peak()
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(
+                _FILTERS
+            )
+            self._current = self.peak = tracemalloc.get_traced_memory()[0]
+            _reset_peak()
+            _ACTIVE.append(self)
+
+    def stop(self):
+        """
+        Stop tracking the allocations.
+
+        Returns
+        -------
+            AllocationStats.
+
+        """
+        with _LOCK:
+            _sync_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            _reset_peak()
+            self.__release()
+
+        sites = [
+            (
+                f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}",
+                diff.size_diff, diff.count_diff
+            )
+            for diff in snapshot.compare_to(self._snapshot, "lineno")[
+                :self.top
+            ]
+            if diff.size_diff
+        ]
+        self._snapshot = None
+
+        return AllocationStats(
+            current - self._current, max(self.peak - self._current, 0), sites
+        )
+
+    def cancel(self):
+        """Stop tracking the allocations, discarding them."""
+        self._snapshot = None
+        with _LOCK:
+            self.__release()
+
+    def __release(self):
+        """Remove the tracker, stopping the trace if it is the last one."""
+        global _OWN_TRACE
+
+        if self in _ACTIVE:
+            _ACTIVE.remove(self)
+
+        if not _ACTIVE and _OWN_TRACE:
+            tracemalloc.stop()
+            _OWN_TRACE = False
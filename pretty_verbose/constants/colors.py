@@ -6,3 +6,6 @@ GREEN = "\033[38;2;50;200;50m"
 BLUE = "\033[38;2;50;150;255m"
 CYAN = "\033[38;2;0;255;255m"
 RESET = "\033[0m"
+
+# Erase from the cursor to the end of the line.
+ERASE_LINE = "\033[K"
@@ -0,0 +1,10 @@
+"""Types of messages with their minimum verbose level and color."""
+from pretty_verbose.constants import colors
+
+MESSAGE_TYPES = {
+    "ERROR": (0, colors.RED),
+    "WARNING": (1, colors.YELLOW),
+    "SUCCESS": (2, colors.GREEN),
+    "INFO": (3, colors.BLUE),
+    "DEBUG": (4, colors.MAGENTA),
+}
@@ -0,0 +1,105 @@
+"""Bridge from the standard `logging` module into the messengers."""
+import logging
+
+from pretty_verbose.constants.message_types import MESSAGE_TYPES
+
+# Message type of the logging levels, from the highest.
+LEVEL_TYPES = (
+    (logging.ERROR, "ERROR"),
+    (logging.WARNING, "WARNING"),
+    (logging.INFO, "INFO"),
+)
+
+
+def message_type(levelno):
+    """
+    Return the message type of a logging level.
+
+    Parameters
+    ----------
+    levelno: Int.
+        Level of the `logging` record.
+
+    Returns
+    -------
+        Str with the type of message.
+
+    """
+    for level, name in LEVEL_TYPES:
+        if levelno >= level:
+            return name
+    return "DEBUG"
+
+
+class VerboseHandler(logging.Handler):
+    """Handler that writes the `logging` records with a messenger.
+
+    The records go through the sinks of the messenger, so they share the
+    console, the log file and any buffered sink with its own messages. Levels
+    from ERROR up are errors, WARNING warnings, INFO infos and lower levels
+    debug messages.
+
+    The records that the messenger would discard are rejected before the
+    filters and the formatting, and the others are formatted once.
+
+    Parameters
+    ----------
+    messages: VerboseMessages.
+        Messenger, or task or process, which writes the records.
+
+    level: Int. Default: logging.NOTSET.
+        Minimum `logging` level of the records.
+
+    """
+
+    def __init__(self, messages, level=logging.NOTSET):
+        super().__init__(level)
+        self.messages = messages
+
+    def handle(self, record):
+        message_name = message_type(record.levelno)
+        if not self.messages.accepts(MESSAGE_TYPES[message_name][0]):
+            return False
+
+        return super().handle(record)
+
+    def emit(self, record):
+        try:
+            message_name = message_type(record.levelno)
+            min_level, color = MESSAGE_TYPES[message_name]
+            self.messages.log(
+                min_level, message_name, color, self.format(record)
+            )
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def capture_logging(messages, logger=None, level=logging.NOTSET):
+    """
+    Write the records of a `logging` logger with a messenger.
+
+    Parameters
+    ----------
+    messages: VerboseMessages.
+        Messenger, or task or process, which writes the records.
+
+    logger: Str, Logger. Default: None.
+        Logger, or its name, the root logger if None.
+
+    level: Int. Default: logging.NOTSET.
+        Minimum `logging` level of the records.
+
+    Returns
+    -------
+        The VerboseHandler added to the logger.
+
+    """
+    if not isinstance(logger, logging.Logger):
+        logger = logging.getLogger(logger)
+
+    handler = VerboseHandler(messages, level)
+    logger.addHandler(handler)
+
+    return handler
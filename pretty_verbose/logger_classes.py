@@ -1,6 +1,5 @@
 """Classes of the logger."""
-import readline
-from pathlib import Path
+import os
 
 from pretty_verbose.processes_classes import Process
 
@@ -12,6 +11,13 @@ class Logger(Process):
     A logger is a module that administrates the terminal outputs of different
     proceses, and is able as well to create or delete processes.
 
+    The `readline` module is only imported, and the history file read, when
+    the user is asked for an input for the first time, so importing the
+    package stays cheap for non interactive programs. The history in memory
+    is trimmed to the length cap after each input, while the new entries are
+    appended to the history file, which is only rewritten with the last
+    entries when it passes twice the cap.
+
     Parameters
     ----------
     level: Int. Default: 1.
@@ -32,6 +38,9 @@ class Logger(Process):
     log_file: Path, Str. Default: ".".
         Log file in which save the verbose output.
 
+    history_length: Int. Default: 1000.
+        Maximum number of entries of the input history, unlimited if -1.
+
     **config:
         Parameters passed to `Process`.
 
@@ -43,19 +52,77 @@ class Logger(Process):
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, level, name="Main", log_dir=".", **config):
+    def __init__(
+        self, level, name="Main", log_dir=".", history_length=1000, **config
+    ):
         # create process.
-        self.__history_file = Path(log_dir).resolve() / ".history"
-
-        if self.__history_file.exists():
-            readline.read_history_file(self.__history_file)
+        self.__history_file = os.path.join(
+            os.path.realpath(log_dir), ".history"
+        )
+        self.__history_length = history_length
+        self.__history_size = 0
+        self.__readline = None
 
         super().__init__(level, name, log_dir, **config)
 
-    def __del__(self):
-        """Function called when the object is deleted."""
-        readline.write_history_file(self.__history_file)
-        return super().__del__()
+    def __load_history(self):
+        """Import readline and load the history file on the first input."""
+        import readline
+
+        # The file is read after the entries already in memory, e.g. the
+        # ones of the interactive interpreter, which are kept. The history
+        # length of readline is left unset, as it would also truncate the
+        # file on every append.
+        n_entries = readline.get_current_history_length()
+        if os.path.exists(self.__history_file):
+            try:
+                readline.read_history_file(self.__history_file)
+            except OSError:
+                pass
+        self.__history_size = readline.get_current_history_length() - n_entries
+
+        self.__readline = readline
+        self.__trim_history()
+
+    def __trim_history(self):
+        """Drop the oldest entries of the history in memory over the cap."""
+        readline = self.__readline
+        if self.__history_length < 0:
+            return
+
+        while readline.get_current_history_length() > self.__history_length:
+            readline.remove_history_item(0)
+
+    def __save_history(self, n_new):
+        """
+        Append the new entries to the history file.
+
+        Parameters
+        ----------
+        n_new: Int.
+            Number of entries added to the history by the input.
+
+        """
+        self.__trim_history()
+        if n_new <= 0 or not os.path.isdir(
+            os.path.dirname(self.__history_file)
+        ):
+            return
+
+        readline = self.__readline
+        self.__history_size += n_new
+        if (
+            0 <= self.__history_length * 2 < self.__history_size or
+            not hasattr(readline, "append_history_file")
+        ):
+            # Rewrite the file with the last entries only.
+            readline.write_history_file(self.__history_file)
+            self.__history_size = readline.get_current_history_length()
+        else:
+            readline.append_history_file(
+                min(n_new, readline.get_current_history_length()),
+                self.__history_file
+            )
 
     def input(self, *message, input_text="INPUT", **opts):
         """
@@ -80,7 +147,12 @@ class Logger(Process):
             String with the response.
 
         """
+        if self.__readline is None:
+            self.__load_history()
+
+        n_entries = self.__readline.get_current_history_length()
         response = super().input(*message, input_text=input_text, **opts)
-        if self.__history_file.parent.exists():
-            readline.write_history_file()
+        self.__save_history(
+            self.__readline.get_current_history_length() - n_entries
+        )
         return response
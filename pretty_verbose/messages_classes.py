@@ -1,26 +1,72 @@
 """Class of the messages printing."""
-import csv
 import os
-import re
-from dataclasses import dataclass
-from datetime import datetime
-from pathlib import Path
+from time import perf_counter_ns, time_ns
 
 from pretty_verbose import LoggerErrorBase, MissingLogFolderError, RunningError
 from pretty_verbose.constants import colors
+from pretty_verbose.constants.message_types import MESSAGE_TYPES
+from pretty_verbose.sink_classes import (COMPRESSION_SUFFIXES, RING_CAPACITY,
+                                         ConsoleSink, FileSink, Record,
+                                         RingBufferSink)
+
+
+# Layout of the console lines.
+DEFAULT_LAYOUT = "{color}{time}[{type}] [{scope}]:{decorator}{reset}{message}"
+
+
+def compile_layout(
+    layout, message_type, scope, decorator, color, reset=colors.RESET
+):
+    """
+    Fill the fixed fields of a line layout.
+
+    Parameters
+    ----------
+    layout: Str.
+        Layout with the fields `{color}`, `{time}`, `{type}`, `{scope}`,
+        `{decorator}`, `{reset}` and `{message}`.
+
+    message_type: Str.
+        Type of message.
+
+    scope: Str.
+        Scope of the messenger.
+
+    decorator: Str.
+        Decorator to initialize the message.
+
+    color: Color.
+        Color for the console text.
+
+    reset: Color. Default: colors.RESET.
+        Code to reset the color.
+
+    Returns
+    -------
+        Template to be filled with `template.format(time, message)`.
+
+    """
+    def escape(value):
+        return value.replace("{", "{{").replace("}", "}}")
+
+    return layout.format(
+        color=escape(color), type=escape(message_type), scope=escape(scope),
+        decorator=escape(decorator), reset=escape(reset),
+        time="{0}", message="{1}"
+    )
 
 
-@dataclass
 class OutputConfig:
     """Configuration for the CSV output.
 
+    The configurations are immutable and shared, `OutputConfig.get` returns
+    the same object for the same values, so all the tasks of a process tree
+    point to one configuration.
+
     Attributes
     ----------
-    filename: Path, Str. Default: "messages.log".
-        Log file in which save the verbose output.
-
-    log_dir: Path, Str. Default: ".".
-        Directory for the output log files.
+    log_dir: Str. Default: ".".
+        Directory for the output log files, stored as a resolved path.
 
     sep: Str. Default: ";".
         Separator of the log file.
@@ -31,12 +77,114 @@ class OutputConfig:
     no_save: Bool. Default: False.
         When active prevents the output saving.
 
+    mode: Str. Default: "sync".
+        Writing policy of the log file, see `FileSink`.
+
+    compression: Str. Default: None.
+        Compress the log file with "gzip" (`.log.gz`) or "xz" (`.log.xz`).
+
+    flush_interval: Float. Default: 1.0.
+        Seconds between the flushes of the compressed log files.
+
     """
-    filename: str
-    log_dir: Path
-    sep: int = ";"
-    overwrite: int = False
-    no_save: int = False
+    __slots__ = (
+        "log_dir", "sep", "overwrite", "no_save", "mode", "compression",
+        "flush_interval"
+    )
+
+    # Shared configurations.
+    __configs = {}
+
+    def __init__(
+        self, log_dir=".", sep=";", overwrite=False, no_save=False,
+        mode="sync", compression=None, flush_interval=1.0
+    ):
+        object.__setattr__(self, "log_dir", os.path.realpath(log_dir or "."))
+        object.__setattr__(self, "sep", sep)
+        object.__setattr__(self, "overwrite", bool(overwrite))
+        object.__setattr__(self, "no_save", bool(no_save))
+        object.__setattr__(self, "mode", mode)
+        object.__setattr__(self, "compression", compression)
+        object.__setattr__(self, "flush_interval", flush_interval)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            "OutputConfig is immutable, use `OutputConfig.replace`"
+        )
+
+    def __repr__(self):
+        return (
+            f"OutputConfig(log_dir={self.log_dir!r}, sep={self.sep!r}, "
+            f"overwrite={self.overwrite!r}, no_save={self.no_save!r}, "
+            f"mode={self.mode!r}, compression={self.compression!r}, "
+            f"flush_interval={self.flush_interval!r})"
+        )
+
+    @classmethod
+    def get(
+        cls, log_dir=".", sep=";", overwrite=False, no_save=False, mode="sync",
+        compression=None, flush_interval=1.0
+    ):
+        """
+        Return the shared configuration with the given values.
+
+        Parameters
+        ----------
+        log_dir: Path, Str. Default: ".".
+            Directory for the output log files.
+
+        sep: Str. Default: ";".
+            Separator of the log file.
+
+        overwrite: Bool. Default: False.
+            Overwrite the log file.
+
+        no_save: Bool. Default: False.
+            When active prevents the output saving.
+
+        mode: Str. Default: "sync".
+            Writing policy of the log file, see `FileSink`.
+
+        compression: Str. Default: None.
+            Compress the log file with "gzip" or "xz".
+
+        flush_interval: Float. Default: 1.0.
+            Seconds between the flushes of the compressed log files.
+
+        Returns
+        -------
+            OutputConfig object.
+
+        """
+        config = cls(
+            log_dir, sep, overwrite, no_save, mode, compression,
+            flush_interval
+        )
+        key = tuple(getattr(config, attr) for attr in cls.__slots__)
+
+        return cls.__configs.setdefault(key, config)
+
+    def replace(self, **changes):
+        """
+        Return the shared configuration with some values changed.
+
+        Parameters
+        ----------
+        **changes:
+            New values of the attributes.
+
+        Returns
+        -------
+            OutputConfig object.
+
+        """
+        if not changes:
+            return self
+
+        values = {key: getattr(self, key) for key in self.__slots__}
+        values.update(changes)
+
+        return self.get(**values)
 
 
 class VerboseMessages:
@@ -77,8 +225,54 @@ class VerboseMessages:
     no_save: Bool. Default: False.
         When active prevents the output saving.
 
+    mode: Str. Default: "sync".
+        Writing policy of the log file, see `FileSink`.
+
+    output_conf: OutputConfig. Default: None.
+        Shared output configuration, the other output parameters override its
+        values.
+
+    layout: Str. Default: DEFAULT_LAYOUT.
+        Layout of the console lines, with the fields `{color}`, `{time}`,
+        `{type}`, `{scope}`, `{decorator}`, `{reset}` and `{message}`.
+
+    stream: File. Default: None.
+        Console stream, `sys.stdout` if None.
+
+    plain: Bool. Default: None.
+        Print plain lines, without colors, padding or progress lines ending
+        in a carriage return. If None, it is active when the console stream is
+        not a terminal (a pipe, a file, the systemd journal...).
+
+    console_sink: ConsoleSink. Default: None.
+        Shared console sink, used instead of `stream` and `plain`.
+
+    sinks: Array. Default: ().
+        Additional sinks, each one with its own level, which can be shared by
+        several messengers.
+
+    ring_buffer: Bool, Int, RingBufferSink. Default: None.
+        Keep the last records, of every level, in memory. If it is an integer,
+        a buffer with that capacity is created, dumped to `{name}.crash.log`
+        in the log directory. If True, the buffer has the default capacity.
+
+    metrics: Bool, LogMetrics. Default: None.
+        Count the messages emitted and suppressed, the bytes written by the
+        sinks and the time spent logging. If True, new metrics are created.
+
+    Notes
+    -----
+    Each message is turned once into a `Record` and routed to the console
+    sink, the sink of the log file and the additional sinks. The console and
+    the log file follow the level of the messenger, while the additional
+    sinks have their own levels.
+
     """
-    __log_started = False
+    __slots__ = (
+        "level", "_name", "_scope", "_log_path", "_layout", "_templates",
+        "_console", "_file", "_sinks", "_metrics", "__output_conf",
+        "__log_started", "__weakref__"
+    )
 
     def __init__(self, level=1, name="", filename="messages.log", **config):
         """Construct the class."""
@@ -86,28 +280,313 @@ class VerboseMessages:
         self.level = level
 
         # Set verbose scope.
-        if name:
-            self.name = self.scope = name
-        else:
-            self.name = self.scope = config.pop("scope", "")
+        self._templates = None
+        scope = config.pop("scope", "")
+        self.name = self.scope = name if name else scope
+        self._layout = DEFAULT_LAYOUT
+        layout = config.pop("layout", DEFAULT_LAYOUT)
+
+        # Set console stream.
+        console_sink = config.pop("console_sink", None)
+        if console_sink is None or "stream" in config or "plain" in config:
+            console_sink = ConsoleSink(
+                config.pop("stream", None), config.pop("plain", None)
+            )
+        self._console = console_sink
+        self._file = None
+
+        # Set additional sinks.
+        self._sinks = tuple(config.pop("sinks", ()))
+        ring_buffer = config.pop("ring_buffer", None)
+
+        # Set metrics.
+        metrics = config.pop("metrics", None)
+        if metrics is True:
+            from pretty_verbose.metrics_classes import LogMetrics
+
+            metrics = LogMetrics()
+        self._metrics = metrics or None
 
         # Create output configuration.
-        self.__output_conf = OutputConfig(
-            filename=filename,
-            log_dir=Path(config.pop("log_dir", "")).resolve(),
-            **config
-        )
+        output_conf = config.pop("output_conf", None)
+        if output_conf is None:
+            self.__output_conf = OutputConfig.get(**config)
+        else:
+            self.__output_conf = output_conf.replace(**config)
 
         # Set verbose output file.
-        self.filename = self.__output_conf.log_dir / filename
+        self._log_path = os.path.join(self.__output_conf.log_dir, filename)
+        suffix = COMPRESSION_SUFFIXES.get(self.__output_conf.compression)
+        if suffix is not None and not self._log_path.endswith(suffix):
+            self._log_path += suffix
+
+        # Set in-memory buffer of records.
+        if isinstance(ring_buffer, bool):
+            ring_buffer = RING_CAPACITY if ring_buffer else None
+        if isinstance(ring_buffer, int):
+            ring_buffer = RingBufferSink(
+                ring_buffer, sep=self.__output_conf.sep,
+                path=os.path.join(
+                    self.__output_conf.log_dir,
+                    f"{self._name or 'messages'}.crash.log"
+                )
+            )
+        elif ring_buffer is not None and not isinstance(
+            ring_buffer, RingBufferSink
+        ):
+            raise TypeError(
+                "ring_buffer must be a bool, an int or a RingBufferSink, not "
+                f"{type(ring_buffer).__name__}"
+            )
+        if ring_buffer is not None and ring_buffer not in self._sinks:
+            self._sinks += (ring_buffer,)
+
+        # Set console layout.
+        if layout is not DEFAULT_LAYOUT:
+            self.set_layout(layout)
 
         # Init the log DataFrame.
+        self.__log_started = False
         self.start_log()
 
+    @property
+    def name(self):
+        """Name of the messenger."""
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        self._templates = None
+
+    @property
+    def scope(self):
+        """Scope shown in the messages."""
+        return self._scope
+
+    @scope.setter
+    def scope(self, scope):
+        self._scope = scope
+        self._templates = None
+
+    def console(self):
+        """Get the console stream."""
+        return self._console.stream
+
+    def console_sink(self):
+        """Get the console sink."""
+        return self._console
+
+    def is_plain(self):
+        """Whether the console lines are plain or not."""
+        return self._console.plain
+
+    def set_console(self, stream=None, plain=None):
+        """
+        Set the console stream.
+
+        Parameters
+        ----------
+        stream: File. Default: None.
+            Console stream, `sys.stdout` if None.
+
+        plain: Bool. Default: None.
+            Print plain lines, without colors, padding or progress lines. If
+            None, it is active when the stream is not a terminal.
+
+        """
+        self._console = ConsoleSink(stream, plain)
+
+    def sinks(self):
+        """Get all the sinks of the messenger."""
+        sinks = [self._console]
+        if self._file is not None:
+            sinks.append(self._file)
+        sinks.extend(self._sinks)
+        return sinks
+
+    def add_sink(self, sink):
+        """
+        Add a sink to the messenger.
+
+        Parameters
+        ----------
+        sink: Sink.
+            Sink to be added, with its own level.
+
+        """
+        self._sinks += (sink,)
+
+    def remove_sink(self, sink):
+        """
+        Remove an additional sink from the messenger.
+
+        Parameters
+        ----------
+        sink: Sink.
+            Sink to be removed.
+
+        """
+        self._sinks = tuple(
+            other for other in self._sinks if other is not sink
+        )
+
+    def metrics(self):
+        """Get the metrics of the messenger, None if they are not active."""
+        return self._metrics
+
+    def metrics_summary(self):
+        """
+        Return a summary line of the metrics.
+
+        Returns
+        -------
+            String with the summary, None if the metrics are not active.
+
+        """
+        if self._metrics is None:
+            return None
+
+        return self._metrics.summary(self.sinks())
+
+    def write_metrics(self, path):
+        """
+        Write the metrics to a Prometheus text file.
+
+        Parameters
+        ----------
+        path: Path, Str.
+            File of the metrics, e.g. in the directory of the textfile
+            collector of the node exporter.
+
+        Returns
+        -------
+            Path of the file, None if the metrics are not active.
+
+        """
+        if self._metrics is None:
+            self.warning("The metrics are not active", skip_save=True)
+            return None
+
+        return self._metrics.write_prometheus(path, self.sinks())
+
+    def flush(self):
+        """Write the records buffered by the sinks."""
+        for sink in self.sinks():
+            sink.flush()
+
+    def layout(self):
+        """Get the layout of the console lines."""
+        return self._layout
+
+    def set_layout(self, layout):
+        """
+        Set the layout of the console lines.
+
+        Parameters
+        ----------
+        layout: Str.
+            Layout with the fields `{color}`, `{time}`, `{type}`, `{scope}`,
+            `{decorator}`, `{reset}` and `{message}`.
+
+        """
+        try:
+            compile_layout(layout, "", "", "", "").format("", "")
+        except (KeyError, IndexError, ValueError) as exc:
+            self.error(
+                f"Invalid layout {layout!r}: {exc!r}.",
+                err_id=107, err_str="INVALID LAYOUT"
+            )
+
+        self._layout = layout
+        self._templates = None
+
+    def get_template(self, message_type, color, decorator=" ", plain=None):
+        """
+        Return the compiled console template of a kind of message.
+
+        The templates are compiled once per type, color and decorator, and
+        discarded when the name, the scope or the layout change.
+
+        Parameters
+        ----------
+        message_type: Str.
+            Type of message.
+
+        color: Color.
+            Color for the console text.
+
+        decorator: Str. Default: " ".
+            Decorator to initialize the message.
+
+        plain: Bool. Default: None.
+            Template without colors, the mode of the console if None.
+
+        Returns
+        -------
+            Template to be filled with `template.format(time, message)`.
+
+        """
+        if plain is None:
+            plain = self._console.plain
+
+        templates = self._templates
+        if templates is None:
+            templates = self._templates = {}
+
+        key = (message_type, color, decorator, plain)
+        template = templates.get(key)
+        if template is None:
+            if plain:
+                template = compile_layout(
+                    self._layout, message_type, self._scope, decorator, "", ""
+                )
+            else:
+                template = compile_layout(
+                    self._layout, message_type, self._scope, decorator, color
+                )
+            templates[key] = template
+
+        return template
+
+    @property
+    def filename(self):
+        """Path of the log file."""
+        from pathlib import Path
+        return Path(self._log_path)
+
     def output_conf(self):
         """Get the output configuration for the log."""
         return self.__output_conf
 
+    def ring_buffer(self):
+        """Get the in-memory buffer of records, None if it is not active."""
+        for sink in self._sinks:
+            if isinstance(sink, RingBufferSink):
+                return sink
+        return None
+
+    def dump_ring(self, path=None):
+        """
+        Dump the in-memory buffer of records to a file.
+
+        Parameters
+        ----------
+        path: Path, Str. Default: None.
+            File in which dump the records, the path of the buffer if None.
+
+        Returns
+        -------
+            Path of the file, None if the buffer is not active.
+
+        """
+        ring = self.ring_buffer()
+        if ring is None:
+            self.warning("The ring buffer is not active", skip_save=True)
+            return None
+
+        return ring.dump(path)
+
     def start_log(self):
         """
         Star the log file.
@@ -120,15 +599,15 @@ class VerboseMessages:
             return
 
         # Check if the directory exists.
-        if not self.filename.parent.exists():
+        p_folder = os.path.dirname(self._log_path)
+        if not os.path.isdir(p_folder):
 
-            p_folder = self.filename.parent
             self.warning(
                 f"The log dir '{p_folder}' does not exist!", skip_save=True
             )
 
             if self.confirm("Do you want to create it?", skip_save=True):
-                p_folder.mkdir(parents=True)
+                os.makedirs(p_folder)
             else:
                 self.error(
                     f"Logger folder '{p_folder}' does not exist",
@@ -140,116 +619,192 @@ class VerboseMessages:
             self.warning("The log file is already started", "ignoring...")
             return
 
-        if not self.filename.exists() or self.__output_conf.overwrite:
-            with open(
-                self.filename, "w", newline="", encoding="utf-8"
-            ) as file:
-                log_messages = csv.writer(
-                    file, delimiter=self.__output_conf.sep
-                )
-                log_messages.writerow(
-                    ["message_type", "n_datetime", "message"]
-                )
+        self._file = FileSink(
+            self._log_path, sep=self.__output_conf.sep,
+            overwrite=self.__output_conf.overwrite,
+            mode=self.__output_conf.mode,
+            compression=self.__output_conf.compression,
+            flush_interval=self.__output_conf.flush_interval
+        )
 
         self.__log_started = True
 
     def set_no_save(self, no_save):
         """Set the value of not_save."""
-        self.__output_conf.no_save = no_save
+        self.__output_conf = self.__output_conf.replace(no_save=no_save)
+
+        if no_save and self._file is not None:
+            self._file.close()
+            self._file = None
+            self.__log_started = False
+
         # Init the log DataFrame.
         self.start_log()
 
-    def __add_message(self, message_type, right_now, message):
+    def log(
+        self, min_level, name, color, *message, decorator=" ", end="\n",
+        skip_save=False
+    ):
         """
-        Add a new row to the log.
+        Print a log message with name, color and decorator.
 
         Parameters
         ----------
-        message_type: Str.
-            Typo off message, (DEBUG, ERROR, WARNING, INFO).
+        min_lebel: Int.
+            Minimum level of verbose to print the message.
 
-        right_now: Str.
-            Time of the message.
+        name: Str.
+            Type of message.
+
+        color: Color.
+            Color for the console text.
 
         message: Str.
             Message text.
 
+        decorator: Str. Default: " ".
+            Decorator to initialize the message.
+
+        end: Str. Default: "\n".
+            End of the line for the printing.
+
+        skip_save: Bool. Default: False.
+            Skip saving the log to a file.
+
         """
-        with open(self.filename, "a", newline="", encoding="utf-8") as file:
-            log_messages = csv.writer(file, delimiter=self.__output_conf.sep)
-            log_messages.writerow([message_type, right_now, message])
+        level = self.level
+        metrics = self._metrics
+        if level < min_level and not self.__sinks_accept(min_level):
+            if metrics is not None:
+                metrics.add_suppressed(name)
+            return
+
+        if metrics is not None:
+            start = perf_counter_ns()
+
+        if len(message) == 0:
+            self.warning("Empty message", skip_save=skip_save)
+
+        # Join messages.
+        message = ", ".join(f"{el}" for el in message)
+
+        record = Record(
+            name, min_level, color, decorator, end, time_ns(),
+            self._scope, message, self
+        )
+
+        if metrics is None:
+            self.__route(record, level, skip_save)
+            return
 
-    def get_time(self):
+        metrics.latency["format"].add(perf_counter_ns() - start)
+        self.__route(record, level, skip_save)
+
+        # Routed directly, so the summary never triggers another summary.
+        if metrics.summary_due():
+            self.__route(
+                Record(
+                    "INFO", 3, colors.BLUE, " ", "\n", time_ns(),
+                    self._scope, metrics.summary(self.sinks()), self
+                ),
+                level
+            )
+
+    def accepts(self, min_level):
         """
-        Print the time in the color given.
+        Check if a message of a level would be written by any sink.
 
         Parameters
         ----------
-        color: Color.
-            Color for the console text.
+        min_level: Int.
+            Minimum level of verbose of the message.
 
         Returns
         -------
-            String with the actual time.
+            Bool, False if the message would be discarded.
 
         """
-        now = datetime.now().strftime("[%d/%m/%Y %H:%M:%S]")
-        return now
+        return self.level >= min_level or self.__sinks_accept(min_level)
 
-    def format_message(self, message_type, message, decorator=" "):
+    def __sinks_accept(self, min_level):
         """
-        Print the message in the color given.
+        Check if any sink with its own level writes the messages of a level.
 
         Parameters
         ----------
-        color: Color.
-            Color for the console text.
-
-        message_type: str.
-            Type of message.
+        min_level: Int.
+            Minimum level of verbose of the message.
 
-        message: Str.
-            Message text.
+        """
+        console_level = self._console.level
+        if console_level is not None and console_level >= min_level:
+            return True
 
-        decorator: Str. Default: " ".
-            Decorator to initialize the message.
+        for sink in self._sinks:
+            if sink.level is not None and sink.level >= min_level:
+                return True
 
-        Returns
-        -------
-            String with the message in color.
+        file_level = None if self._file is None else self._file.level
+        return file_level is not None and file_level >= min_level
 
+    def __route(self, record, level, skip_save=False, console=True):
         """
-        text = (
-            f"[{message_type}] [{self.scope}]:{decorator}" +
-            f"{colors.RESET}{message}"
-        )
-        return text
+        Send a record to the sinks which accept it.
 
-    def get_terminal_columns(self):
-        """
-        Return the number of columns of the terminal.
+        Parameters
+        ----------
+        record: Record.
+            Record to be written.
 
-        Returns
-        -------
-            Integer, number of columns of the terminal.
+        level: Int.
+            Level of verbose of the messenger.
 
-        """
-        try:
-            return os.get_terminal_size().columns
-        except OSError:
-            return 80
+        skip_save: Bool. Default: False.
+            Skip the sinks which save the messages.
 
-    def log(
-        self, min_level, name, color, *message, decorator=" ", end="\n",
+        console: Bool. Default: True.
+            Send the record to the console.
+
+        """
+        min_level = record.min_level
+        metrics = self._metrics
+        if metrics is not None:
+            start = perf_counter_ns()
+
+        if console and self._console.accepts(min_level, level):
+            self._console.emit(record)
+
+        if metrics is not None:
+            console_end = perf_counter_ns()
+            metrics.latency["console"].add(console_end - start)
+
+        if (
+            not skip_save and self._file is not None and
+            self._file.accepts(min_level, level)
+        ):
+            self._file.emit(record)
+
+        for sink in self._sinks:
+            if sink.accepts(min_level, level) and not (
+                skip_save and sink.saves
+            ):
+                sink.emit(record)
+
+        if metrics is not None:
+            metrics.latency["file"].add(perf_counter_ns() - console_end)
+            metrics.add_emitted(record.message_type)
+
+    def log_many(
+        self, min_level, name, color, messages, decorator=" ", same_time=True,
         skip_save=False
     ):
         """
-        Print a log message with name, color and decorator.
+        Print several log messages with a single console and file write.
 
         Parameters
         ----------
         min_lebel: Int.
-            Minimum level of verbose to print the message.
+            Minimum level of verbose to print the messages.
 
         name: Str.
             Type of message.
@@ -257,39 +812,96 @@ class VerboseMessages:
         color: Color.
             Color for the console text.
 
-        message: Str.
-            Message text.
+        messages: Iterable.
+            Messages, each one a value or a tuple of values to be joined.
 
         decorator: Str. Default: " ".
-            Decorator to initialize the message.
+            Decorator to initialize the messages.
 
-        end: Str. Default: "\n".
-            End of the line for the printing.
+        same_time: Bool. Default: True.
+            Use a single time for all the messages of the batch.
 
         skip_save: Bool. Default: False.
             Skip saving the log to a file.
 
         """
-        if self.level >= min_level:
-            # Get time in the given color.
-            now = self.get_time()
+        level = self.level
+        metrics = self._metrics
+        if level < min_level and not self.__sinks_accept(min_level):
+            if metrics is not None:
+                metrics.add_suppressed(
+                    name, len(messages) if hasattr(messages, "__len__") else 1
+                )
+            return
 
-            if len(message) == 0:
-                self.warning("Empty message", skip_save=skip_save)
+        if metrics is not None:
+            start = perf_counter_ns()
+
+        now = time_ns()
+        records = []
+
+        for message in messages:
+            if not same_time:
+                now = time_ns()
 
             # Join messages.
-            message = ", ".join(f"{el}" for el in message)
+            if isinstance(message, tuple):
+                message = ", ".join(f"{el}" for el in message)
+            else:
+                message = f"{message}"
+
+            records.append(Record(
+                name, min_level, color, decorator, "\n", now, self._scope,
+                message, self
+            ))
+
+        if not records:
+            return
+
+        if metrics is not None:
+            format_end = perf_counter_ns()
+            metrics.latency["format"].add(format_end - start)
+
+        # Write all the records at once in each sink.
+        if self._console.accepts(min_level, level):
+            self._console.emit_many(records)
+
+        if metrics is not None:
+            console_end = perf_counter_ns()
+            metrics.latency["console"].add(console_end - format_end)
 
-            text = color + now + self.format_message(name, message, decorator)
+        sinks = self._sinks
+        if not skip_save and self._file is not None:
+            sinks = (self._file,) + sinks
 
-            # Print message in the given color.
-            print(text.ljust(self.get_terminal_columns()), end=end)
+        for sink in sinks:
+            if sink.accepts(min_level, level) and not (
+                skip_save and sink.saves
+            ):
+                sink.emit_many(records)
 
-            if self.__output_conf.no_save or skip_save:
-                return
+        if metrics is not None:
+            metrics.latency["file"].add(perf_counter_ns() - console_end)
+            metrics.add_emitted(name, len(records))
 
-            # Add message to log file.
-            self.__add_message(name, now, f"{message}")
+    def batch(self, message_type, messages, **opts):
+        """
+        Print several messages of the same type at once.
+
+        Parameters
+        ----------
+        message_type: Str.
+            Type of message (ERROR, WARNING, SUCCESS, INFO, DEBUG).
+
+        messages: Iterable.
+            Messages, each one a value or a tuple of values to be joined.
+
+        **opts:
+            Arguments passed to `VerboseMessages.log_many`.
+
+        """
+        min_level, color = MESSAGE_TYPES[message_type.upper()]
+        self.log_many(min_level, message_type.upper(), color, messages, **opts)
 
     def error(self, *message, err_id=0, err_str="", err_class=None, **opts):
         """
@@ -336,6 +948,11 @@ class VerboseMessages:
                 err_id = 1
 
             self.log(0, "ERROR", colors.RED, err_msg, **opts)
+
+            for sink in self._sinks:
+                if isinstance(sink, RingBufferSink):
+                    sink.dump()
+
             exit(err_id)
 
         else:
@@ -498,16 +1115,30 @@ class VerboseMessages:
             self.error("Action aborted by the user")
             exit(1)
 
-        # Print time in magenta.
-        now = self.get_time()
+        self.log_input(response, opts.get("skip_save", False))
 
-        if self.__output_conf.no_save or opts.get("skip_save", False):
-            return response
+        return response
 
-        # Add message to log file.
-        self.__add_message("USER INPUT", now, f"{response}".strip())
+    def log_input(self, response, skip_save=False):
+        """
+        Add a user input to the log, without printing it.
 
-        return response
+        Parameters
+        ----------
+        response: Str.
+            Input of the user.
+
+        skip_save: Bool. Default: False.
+            Skip saving the log to a file.
+
+        """
+        self.__route(
+            Record(
+                "USER INPUT", -1e9, colors.CYAN, " ", "\n", time_ns(),
+                self._scope, f"{response}".strip(), self
+            ),
+            self.level, skip_save, console=False
+        )
 
     def select(self, *message, options: dict, **opts):
         """
@@ -521,94 +1152,26 @@ class VerboseMessages:
         options: Array.
             Available options.
 
+        many: Bool. Default: False.
+            Allow selecting several options and ranges (`1, 3-5`).
+
+        repeat: Bool. Default: False.
+            Keep the options selected more than once.
+
+        page_size: Int. Default: None.
+            Options shown per page. If None, the options are paginated when
+            there are more than `prompts.PAGE_THRESHOLD`.
+
         **opts:
             Arguments passed to VerboseMessages.
 
         Returns
         -------
-            Value of the selected option.
-
-        """
-        many = {
-            False: {
-                "num_re": r"\d+",
-                "list_re": r"\d+",
-                "allow": False
-            },
-            True: {
-                "num_re": r"\d+(?:-\d+)?",
-                "list_re": r"\d+(?:-\d+)?(?:\s*,\s*\d+(?:-\d+)?)*",
-                "allow": True,
-                "repeat": {
-                    True: lambda x: x,
-                    False: lambda x: list(dict.fromkeys(x)),
-                }
-            }
-        }[opts.pop("many", False)]
-        repeat = opts.pop("repeat", False)
-
-        while True:
-            # Print input message.
-            response = self.input(
-                "\n".join([
-                    ", ".join(f"{el}" for el in message),
-                    *[f"{i}) {key}" for i, key in enumerate(options)]
-                ]), input_text="Please select an option", **opts
-            )
-
-            if re.fullmatch(many["list_re"], response) is None:
-                self.warning("Invalid option.")
-                continue
-
-            if not many["allow"]:
-                selected = int(response)
+            Value of the selected option, tuple of values if `many`.
 
-                if selected < len(options):
-                    return options[selected]
-
-                self.warning(
-                    f"Value {selected} out of range, please select between "
-                    f"0 and {len(options) - 1}."
-                )
-                continue
-
-            ret_vals = []
-
-            for sel in re.findall(many["num_re"], response):
-                if "-" in sel:
-                    a, b = map(int, sel.split('-'))
-                    if a > b:
-                        self.warning(f"Not valid option {sel}")
-                        ret_vals = None
-                        break
-
-                    if b < len(options):
-                        for item in options[a:b+1]:
-                            ret_vals.append(item)
-                        continue
-
-                    self.warning(
-                        f"Values {sel} out of range, please select between "
-                        f"0 and {len(options) - 1}."
-                    )
-                    ret_vals = None
-                    break
-
-                selected = int(sel)
-
-                if selected < len(options):
-                    ret_vals.append(options[selected])
-                    continue
-
-                self.warning(
-                    f"Values {sel} out of range, please select between "
-                    f"0 and {len(options) - 1}."
-                )
-                ret_vals = None
-                break
-
-            if ret_vals is not None:
-                return (*many["repeat"][repeat](ret_vals),)
+        """
+        from pretty_verbose import prompts
+        return prompts.select(self, *message, options=options, **opts)
 
     def confirm(self, *message, **opts):
         """
@@ -627,14 +1190,5 @@ class VerboseMessages:
             Bool with the confirmation value.
 
         """
-        while True:
-            # Print input message.
-            response = self.input(*message, input_text="[Y/n]", **opts)
-
-            if re.fullmatch(r"([Yy](es)?)?", response) is not None:
-                return True
-
-            if re.match(r"[Nn]o?", response) is not None:
-                return False
-
-            self.warning("Invalid option.")
+        from pretty_verbose import prompts
+        return prompts.confirm(self, *message, **opts)
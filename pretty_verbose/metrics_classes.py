@@ -0,0 +1,443 @@
+"""Classes of the metrics of the messengers and the tasks."""
+import math
+import os
+import time
+
+# Stages of the logging of a message.
+STAGES = ("format", "console", "file")
+
+
+class LatencyHistogram:
+    """Histogram of durations with power of two buckets of nanoseconds.
+
+    The bucket `i` counts the durations `d` with `2**(i-1) <= d < 2**i` ns,
+    so a duration is recorded with a single `int.bit_length`.
+
+    Attributes
+    ----------
+    buckets: Array.
+        Number of durations of each bucket.
+
+    count: Int.
+        Number of durations.
+
+    total: Int.
+        Sum of the durations in nanoseconds.
+
+    """
+    __slots__ = ("buckets", "count", "total")
+
+    N_BUCKETS = 48
+
+    def __init__(self):
+        self.buckets = [0] * self.N_BUCKETS
+        self.count = 0
+        self.total = 0
+
+    def add(self, duration):
+        """
+        Record a duration.
+
+        Parameters
+        ----------
+        duration: Int.
+            Duration in nanoseconds.
+
+        """
+        self.buckets[min(duration.bit_length(), self.N_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += duration
+
+    def mean(self):
+        """Return the mean duration in nanoseconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, fraction):
+        """
+        Return the upper bound of the bucket of a quantile.
+
+        Parameters
+        ----------
+        fraction: Float.
+            Fraction of the durations, between 0 and 1.
+
+        Returns
+        -------
+            Int with the duration in nanoseconds.
+
+        """
+        target = fraction * self.count
+        seen = 0
+        for i, n_durations in enumerate(self.buckets):
+            seen += n_durations
+            if n_durations and seen >= target:
+                return 2 ** i
+        return 0
+
+
+class LogMetrics:
+    """Counters of the messages and time spent logging them.
+
+    The metrics can be shared by several messengers, the tasks and
+    subprocesses of a `Process` use the metrics of their parent.
+
+    Parameters
+    ----------
+    summary_interval: Float. Default: None.
+        Seconds between the summary lines printed by the messengers, never if
+        None.
+
+    Attributes
+    ----------
+    emitted: Dict.
+        Number of messages written of each type.
+
+    suppressed: Dict.
+        Number of messages of each type discarded by the verbose level.
+
+    latency: Dict.
+        `LatencyHistogram` of each stage ("format", "console" and "file").
+
+    """
+    __slots__ = (
+        "emitted", "suppressed", "latency", "summary_interval",
+        "_next_summary", "started"
+    )
+
+    def __init__(self, summary_interval=None):
+        self.emitted = {}
+        self.suppressed = {}
+        self.latency = {stage: LatencyHistogram() for stage in STAGES}
+        self.summary_interval = summary_interval
+        self.started = time.monotonic()
+        self._next_summary = (
+            None if summary_interval is None
+            else self.started + summary_interval
+        )
+
+    def add_emitted(self, message_type, n_messages=1):
+        """Count written messages."""
+        self.emitted[message_type] = (
+            self.emitted.get(message_type, 0) + n_messages
+        )
+
+    def add_suppressed(self, message_type, n_messages=1):
+        """Count discarded messages."""
+        self.suppressed[message_type] = (
+            self.suppressed.get(message_type, 0) + n_messages
+        )
+
+    def summary_due(self):
+        """
+        Check if it is time for a summary line, and schedule the next one.
+
+        Returns
+        -------
+            Bool, whether the summary line should be printed.
+
+        """
+        if self._next_summary is None:
+            return False
+
+        now = time.monotonic()
+        if now < self._next_summary:
+            return False
+
+        self._next_summary = now + self.summary_interval
+        return True
+
+    def snapshot(self, sinks=()):
+        """
+        Return the values of the metrics.
+
+        Parameters
+        ----------
+        sinks: Array. Default: ().
+            Sinks of which report the written bytes.
+
+        Returns
+        -------
+            Dictionary with the metrics.
+
+        """
+        return {
+            "uptime": time.monotonic() - self.started,
+            "emitted": dict(self.emitted),
+            "suppressed": dict(self.suppressed),
+            "bytes": {sink.label(): sink.bytes_written for sink in sinks},
+            "latency": {
+                stage: {
+                    "count": histogram.count,
+                    "mean_ns": histogram.mean(),
+                    "p99_ns": histogram.quantile(0.99),
+                }
+                for stage, histogram in self.latency.items()
+            },
+        }
+
+    def summary(self, sinks=()):
+        """
+        Return a summary line of the metrics.
+
+        Parameters
+        ----------
+        sinks: Array. Default: ().
+            Sinks of which report the written bytes.
+
+        Returns
+        -------
+            String with the summary.
+
+        """
+        emitted = sum(self.emitted.values())
+        suppressed = sum(self.suppressed.values())
+        written = sum(sink.bytes_written for sink in sinks)
+        spent = sum(histogram.total for histogram in self.latency.values())
+        stages = ", ".join(
+            f"{stage} {histogram.mean() / 1000:.1f}us"
+            for stage, histogram in self.latency.items()
+        )
+
+        return (
+            f"Log metrics: {emitted} emitted, {suppressed} suppressed, "
+            f"{written} bytes written, {spent / 1e6:.3f}ms spent logging "
+            f"(mean {stages})"
+        )
+
+    def prometheus(self, sinks=(), prefix="pretty_verbose"):
+        """
+        Return the metrics in the Prometheus text format.
+
+        Parameters
+        ----------
+        sinks: Array. Default: ().
+            Sinks of which report the written bytes.
+
+        prefix: Str. Default: "pretty_verbose".
+            Prefix of the metric names.
+
+        Returns
+        -------
+            String with the metrics.
+
+        """
+        def escape(value):
+            return (
+                f"{value}".replace("\\", "\\\\").replace('"', '\\"')
+                .replace("\n", "\\n")
+            )
+
+        lines = []
+        for name, counts, label in (
+            ("records_emitted_total", self.emitted, "type"),
+            ("records_suppressed_total", self.suppressed, "type"),
+            (
+                "sink_bytes_total",
+                {sink.label(): sink.bytes_written for sink in sinks}, "sink"
+            ),
+        ):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.extend(
+                f'{prefix}_{name}{{{label}="{escape(key)}"}} {value}'
+                for key, value in counts.items()
+            )
+
+        name = f"{prefix}_log_latency_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for stage, histogram in self.latency.items():
+            cumulative = 0
+            for i, n_durations in enumerate(histogram.buckets):
+                cumulative += n_durations
+                lines.append(
+                    f'{name}_bucket{{stage="{stage}",le="{2 ** i / 1e9:g}"}} '
+                    f"{cumulative}"
+                )
+            lines.extend((
+                f'{name}_bucket{{stage="{stage}",le="+Inf"}} '
+                f"{histogram.count}",
+                f'{name}_sum{{stage="{stage}"}} {histogram.total / 1e9}',
+                f'{name}_count{{stage="{stage}"}} {histogram.count}',
+            ))
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, sinks=(), prefix="pretty_verbose"):
+        """
+        Write the metrics to a Prometheus text file.
+
+        The file is replaced atomically, so the textfile collector of the node
+        exporter never reads a partial file.
+
+        Parameters
+        ----------
+        path: Path, Str.
+            File of the metrics, usually `*.prom`.
+
+        sinks: Array. Default: ().
+            Sinks of which report the written bytes.
+
+        prefix: Str. Default: "pretty_verbose".
+            Prefix of the metric names.
+
+        Returns
+        -------
+            Path of the file.
+
+        """
+        tmp_path = f"{os.fspath(path)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(self.prometheus(sinks, prefix))
+        os.replace(tmp_path, path)
+
+        return path
+
+
+class RateCounter:
+    """Counter of processed items with exponentially weighted rates.
+
+    `add` only sums the items and checks the clock. The rates are updated at
+    most once per tick (a second, or the shortest window), like the load
+    average of Unix: the items counted since the last tick are blended into
+    the rate of each window with the weight `1 - exp(-elapsed / window)`.
+
+    Parameters
+    ----------
+    windows: Array. Default: WINDOWS.
+        Windows of the rates in seconds.
+
+    Attributes
+    ----------
+    total: Int.
+        Number of items.
+
+    rates: Array.
+        Rate of each window in items per second.
+
+    """
+    __slots__ = (
+        "total", "windows", "rates", "started", "tick", "_last_tick",
+        "_next_tick", "_ticked"
+    )
+
+    WINDOWS = (1.0, 10.0, 60.0)
+
+    def __init__(self, windows=None):
+        self.windows = tuple(self.WINDOWS if windows is None else windows)
+        self.rates = [None] * len(self.windows)
+        self.total = 0
+        self.started = self._last_tick = time.monotonic()
+        self.tick = min((1.0,) + self.windows)
+        self._next_tick = self.started + self.tick
+        self._ticked = 0
+
+    def add(self, n_items=1):
+        """
+        Count processed items.
+
+        Parameters
+        ----------
+        n_items: Int. Default: 1.
+            Number of items.
+
+        """
+        self.total += n_items
+        now = time.monotonic()
+        if now >= self._next_tick:
+            self.update(now)
+
+    def update(self, now=None):
+        """
+        Blend the items counted since the last tick into the rates.
+
+        Parameters
+        ----------
+        now: Float. Default: None.
+            Monotonic time, the current one if None.
+
+        """
+        if now is None:
+            now = time.monotonic()
+
+        elapsed = now - self._last_tick
+        if elapsed <= 0:
+            return
+
+        rate = (self.total - self._ticked) / elapsed
+        rates = self.rates
+        for i, window in enumerate(self.windows):
+            if rates[i] is None:
+                rates[i] = rate
+            else:
+                rates[i] += (1 - math.exp(-elapsed / window)) * (
+                    rate - rates[i]
+                )
+
+        self._ticked = self.total
+        self._last_tick = now
+        self._next_tick = now + self.tick
+
+    def mean_rate(self):
+        """Return the mean rate since the counter was created."""
+        elapsed = time.monotonic() - self.started
+        return self.total / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self):
+        """
+        Return the values of the counter, updating the rates if it is time.
+
+        Returns
+        -------
+            Dictionary with the `total`, the `mean` rate and the `rates` of
+            each window.
+
+        """
+        now = time.monotonic()
+        if now >= self._next_tick:
+            self.update(now)
+
+        return {
+            "total": self.total,
+            "mean": self.mean_rate(),
+            "rates": {
+                window: rate or 0.0
+                for window, rate in zip(self.windows, self.rates)
+            },
+        }
+
+
+def merge_throughput(snapshots):
+    """
+    Add the snapshots of several counters.
+
+    The rates are summed, as the counters of the tasks of a process count
+    items processed at the same time.
+
+    Parameters
+    ----------
+    snapshots: Iterable.
+        Dictionaries returned by `RateCounter.snapshot`.
+
+    Returns
+    -------
+        Dictionary with the same structure.
+
+    """
+    merged = {"total": 0, "mean": 0.0, "rates": {}}
+    for snapshot in snapshots:
+        merged["total"] += snapshot["total"]
+        merged["mean"] += snapshot["mean"]
+        for window, rate in snapshot["rates"].items():
+            merged["rates"][window] = merged["rates"].get(window, 0.0) + rate
+
+    return merged
+
+
+def format_throughput(name, snapshot):
+    """Return a line with the values of a counter."""
+    values = [f"{snapshot['total']} items"]
+    values.extend(
+        f"{rate:.1f}/s ({window:g}s)"
+        for window, rate in snapshot["rates"].items()
+    )
+    values.append(f"mean {snapshot['mean']:.1f}/s")
+    return f"Throughput of {name}: " + ", ".join(values)
@@ -1,9 +1,255 @@
 """Classes of the Processes."""
-import re
+import time
 from datetime import datetime
+from sys import intern
 
 from pretty_verbose.messages_classes import VerboseMessages
 
+# Watchdog of the running timers, set by `Watchdog.start`.
+_WATCHDOG = None
+
+
+def _timed_call(exec_f, args, cpu_clock):
+    """Call a function measuring its wall and CPU time.
+
+    It is a module function so it can be sent to a process pool.
+
+    Parameters
+    ----------
+    exec_f: Callable.
+        Function to be called.
+
+    args: Array.
+        Arguments of the function.
+
+    cpu_clock: Callable.
+        Clock of the CPU time (`time.thread_time` or `time.process_time`).
+
+    Returns
+    -------
+        Tuple with the result, the raised exception, the starting and stopping
+        times and the CPU time in seconds.
+
+    """
+    result = error = None
+    cpu_i = cpu_clock()
+    t_i = datetime.now()
+
+    try:
+        result = exec_f(*args)
+    except Exception as exc:
+        error = exc
+
+    t_f = datetime.now()
+    return result, error, t_i, t_f, cpu_clock() - cpu_i
+
+
+class Timer:
+    """Values of the timer of a task.
+
+    The values can also be accessed as items (`timer["on"]`).
+
+    Attributes
+    ----------
+    ti: datetime.datetime.
+        Starting time.
+
+    tf: datetime.datetime.
+        Stopping time.
+
+    diff: datetime.timedelta.
+        Duration of the last run of the timer.
+
+    on: Bool.
+        Whether the timer is running or not.
+
+    usage_i: ResourceUsage.
+        Resources used when the timer was started, if they are sampled.
+
+    usage: ResourceUsage.
+        Resources used in the last run of the timer, if they are sampled.
+
+    tracker: AllocationTracker.
+        Tracker of the allocations of the running timer, if they are tracked.
+
+    allocations: AllocationStats.
+        Memory allocated in the last run of the timer, if it is tracked.
+
+    """
+    __slots__ = (
+        "ti", "tf", "diff", "on", "usage_i", "usage", "tracker", "allocations"
+    )
+
+    def __init__(self):
+        self.ti = self.tf = self.diff = None
+        self.usage_i = self.usage = None
+        self.tracker = self.allocations = None
+        self.on = False
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+
+class TaskStats:
+    """Aggregated timing of the released tasks of a kind.
+
+    Attributes
+    ----------
+    count: Int.
+        Number of tasks.
+
+    timed: Int.
+        Number of tasks with a finished timer, the ones of the durations.
+
+    total: Float.
+        Summed duration of the tasks in milliseconds.
+
+    min: Float.
+        Shortest duration in milliseconds, None if no task was timed.
+
+    max: Float.
+        Longest duration in milliseconds, None if no task was timed.
+
+    usage: ResourceUsage.
+        Summed resources used by the tasks, None if they are not sampled.
+
+    counters: Dict.
+        Summed totals of the counters of the tasks, by their name, None if
+        they have no counters.
+
+    """
+    __slots__ = ("count", "timed", "total", "min", "max", "usage", "counters")
+
+    def __init__(self):
+        self.count = 0
+        self.timed = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.usage = None
+        self.counters = None
+
+    def __repr__(self):
+        usage = "" if self.usage is None else f", usage=({self.usage})"
+        return (
+            f"TaskStats(count={self.count}, timed={self.timed}, "
+            f"mean={_format_ms(self.mean())}, min={_format_ms(self.min)}, "
+            f"max={_format_ms(self.max)}{usage})"
+        )
+
+    def add(self, duration, usage=None, counters=None):
+        """
+        Add the duration of a task.
+
+        Parameters
+        ----------
+        duration: Float.
+            Duration in milliseconds, None if the task was not timed.
+
+        usage: ResourceUsage. Default: None.
+            Resources used by the task, if they are sampled.
+
+        counters: Dict. Default: None.
+            Counters of the task, of which the totals are kept.
+
+        """
+        self.count += 1
+        if usage is not None:
+            self.__add_usage(usage)
+        if counters:
+            self.__add_counters(
+                (name, counter.total) for name, counter in counters.items()
+            )
+        if duration is None:
+            return
+
+        self.timed += 1
+        self.total += duration
+        if self.min is None or duration < self.min:
+            self.min = duration
+        if self.max is None or duration > self.max:
+            self.max = duration
+
+    def merge(self, other):
+        """Add the tasks of other statistics."""
+        self.count += other.count
+        self.total += other.total
+        if other.timed:
+            if self.timed:
+                self.min = min(self.min, other.min)
+                self.max = max(self.max, other.max)
+            else:
+                self.min, self.max = other.min, other.max
+            self.timed += other.timed
+        if other.usage is not None:
+            self.__add_usage(other.usage)
+        if other.counters:
+            self.__add_counters(other.counters.items())
+
+    def __add_counters(self, totals):
+        """Add the totals of counters, by their name."""
+        if self.counters is None:
+            self.counters = {}
+        for name, total in totals:
+            self.counters[name] = self.counters.get(name, 0) + total
+
+    def __add_usage(self, usage):
+        """Add the resources used by tasks."""
+        if self.usage is None:
+            from pretty_verbose.resource_classes import ResourceUsage
+
+            self.usage = ResourceUsage()
+        self.usage.merge(usage)
+
+    def mean(self):
+        """Return the mean duration in milliseconds, None if not timed."""
+        return self.total / self.timed if self.timed else None
+
+
+def _format_ms(value):
+    """Format a duration in milliseconds, `n/a` if it is None."""
+    return "n/a" if value is None else f"{value:.3f}ms"
+
+
+# Digits of the names of the tasks, masked to group the tasks of a kind.
+_DIGITS = str.maketrans("0123456789", "#" * 10)
+
+
+def _task_kind(name):
+    """Return the name with its numbers masked (`request_17`: `request_#`)."""
+    kind = name.translate(_DIGITS)
+    while "##" in kind:
+        kind = kind.replace("##", "#")
+    return kind
+
+
+class Section:
+    """Block of code timed with the timer of a task, see `Task.section`."""
+    __slots__ = (
+        "task", "name", "profile", "allocations", "print_timer", "_profiler"
+    )
+
+    def __init__(self, task, name, profile, allocations, print_timer):
+        self.task = task
+        self.name = name
+        self.profile = profile
+        self.allocations = allocations
+        self.print_timer = print_timer
+        self._profiler = None
+
+    def __enter__(self):
+        self.task.start_timer(self.allocations)
+        self._profiler = self.task._start_profile(self.profile)
+        return self.task
+
+    def __exit__(self, *exc_info):
+        self.task._stop_profile(self._profiler, self.name)
+        self._profiler = None
+        self.task.task_done(self.print_timer)
+
 
 class Task(VerboseMessages):
     """Class that abstracts a task, which communicate its status.
@@ -28,15 +274,33 @@ class Task(VerboseMessages):
     process: Bool. Default: None.
         Parent process.
 
+    deadline: Float. Default: None.
+        Seconds the timer can run before the watchdog warns about the task,
+        the default deadline of the watchdog if None.
+
+    resources: Bool. Default: False.
+        Sample the resources used (CPU time, peak memory and context
+        switches) when the timer is started and stopped, see `usage`.
+
+    allocations: Bool. Default: False.
+        Track with tracemalloc the memory allocated while the timer runs, see
+        `allocations`.
+
     **config:
         Parameters passed to `VerboseMessages`.
 
     """
+    __slots__ = (
+        "_timer", "_name_parts", "_parent", "_counters", "_deadline",
+        "_resources", "_allocations", "_profiles"
+    )
+
     # Structure of the process name.
     NAME_REGEX = r"^(([^ \n]+\.)*([^ \n]+:))?([^ \n.:]*)$"
 
     def __init__(
-        self, level, name, timer=False, process=None, **config
+        self, level, name, timer=False, process=None, deadline=None,
+        resources=False, allocations=False, **config
     ):
         # Create messager.
         super().__init__(
@@ -44,8 +308,18 @@ class Task(VerboseMessages):
             filename=config.pop("log_file", f"{name}.log"), **config
         )
 
-        # Timer of the task.
-        self.timer = {"ti": None, "tf": None, "diff": None, "on": False}
+        # Timer and counters of the task, created on first use.
+        self._timer = None
+        self._counters = None
+        self._parent = None
+        self._deadline = deadline
+        self._resources = resources
+        self._allocations = allocations
+        self._profiles = None
+
+        # Components of the name, parsed once.
+        self._name_parts = None
+        self.get_parents()
 
         # Start timer.
         if timer:
@@ -63,9 +337,18 @@ class Task(VerboseMessages):
 
     def __del__(self):
         """Show timer if active."""
-        if self.timer["on"]:
+        # The timer is not set if the init failed.
+        timer = getattr(self, "_timer", None)
+        if timer is not None and timer.on:
             self.task_done(True)
 
+    @property
+    def timer(self):
+        """Timer of the task."""
+        if self._timer is None:
+            self._timer = Timer()
+        return self._timer
+
     def __get_milliseconds(self, interval):
         """Get the time of the interval in milliseconds.
 
@@ -77,7 +360,10 @@ class Task(VerboseMessages):
         """
         return interval.total_seconds()*1000
 
-    def exec_time(self, exec_f, *args, print_timer=False):
+    def exec_time(
+        self, exec_f, *args, print_timer=False, allocations=None,
+        profile=False
+    ):
         """Execute a function and measure the time it takes to complete.
 
         Parameters
@@ -91,12 +377,32 @@ class Task(VerboseMessages):
         print_timer: Bool. Default: Fasle.
             Whether print or not the timer value after stopping it.
 
+        allocations: Bool. Default: None.
+            Track the memory allocated by the function, the `allocations`
+            option of the task if None.
+
+        profile: Bool. Default: False.
+            Profile the function with cProfile, the stats are added to the
+            ones of the task under the name of the function.
+
         """
-        self.start_timer()
-        exec_f(*args)
+        self.start_timer(allocations)
+        profiler = self._start_profile(profile)
+        try:
+            exec_f(*args)
+        except BaseException:
+            self.__cancel_tracker()
+            raise
+        finally:
+            self._stop_profile(
+                profiler, getattr(exec_f, "__qualname__", "exec_time")
+            )
         return self.task_done(print_timer)
 
-    def exec_many_time(self, *exec_fs, args, print_timer=False, lap=False):
+    def exec_many_time(
+        self, *exec_fs, args, print_timer=False, lap=False, allocations=None,
+        profile=False
+    ):
         """
         Execute a list of functions and measure the time it takes to complete.
 
@@ -114,14 +420,176 @@ class Task(VerboseMessages):
         print_timer: Bool. Default: Fasle.
             Whether print or not the timer value after stopping it.
 
+        allocations: Bool. Default: None.
+            Track the memory allocated by the functions, the `allocations`
+            option of the task if None.
+
+        profile: Bool. Default: False.
+            Profile the functions with cProfile, the stats are added to the
+            ones of the task under the name "exec_many_time".
+
         """
-        self.start_timer()
-        for i, exec_f in exec_fs:
-            exec_f(*args[i])
-            if lap:
-                self.print_lap()
+        self.start_timer(allocations)
+        profiler = self._start_profile(profile)
+        try:
+            for i, exec_f in enumerate(exec_fs):
+                exec_f(*args[i])
+                if lap:
+                    self.print_lap()
+        except BaseException:
+            self.__cancel_tracker()
+            raise
+        finally:
+            self._stop_profile(profiler, "exec_many_time")
         return self.task_done(print_timer)
 
+    def section(
+        self, name, profile=False, allocations=None, print_timer=False
+    ):
+        """Time a block of code with the timer of the task.
+
+        The timer is started when the block is entered and the task is done
+        when it exits, also when the block raises an exception.
+
+        Parameters
+        ----------
+        name: Str.
+            Name of the section, under which its profile stats are added.
+
+        profile: Bool. Default: False.
+            Profile the block with cProfile.
+
+        allocations: Bool. Default: None.
+            Track the memory allocated by the block, the `allocations` option
+            of the task if None.
+
+        print_timer: Bool. Default: False.
+            Whether print or not the timer value after the block.
+
+        Returns
+        -------
+            Context manager which returns the task.
+
+        """
+        return Section(self, name, profile, allocations, print_timer)
+
+    def _start_profile(self, profile):
+        """Start profiling a run, if asked."""
+        if not profile:
+            return None
+
+        from pretty_verbose.profile_classes import SectionProfiler
+
+        profiler = SectionProfiler()
+        profiler.start()
+        return profiler
+
+    def _stop_profile(self, profiler, name):
+        """Stop profiling a run and add its stats to the ones of the task."""
+        if profiler is None:
+            return
+
+        stats = profiler.stop()
+        if stats is None:
+            return
+
+        if self._profiles is None:
+            self._profiles = {}
+        if name in self._profiles:
+            self._profiles[name].add(stats)
+        else:
+            self._profiles[name] = stats
+
+    def profile_stats(self, name=None):
+        """Return the profile stats of the profiled runs of the task.
+
+        Parameters
+        ----------
+        name: Str. Default: None.
+            Name of the section or function, all of them if None.
+
+        Returns
+        -------
+            pstats.Stats, or None if there is nothing profiled.
+
+        """
+        if not self._profiles:
+            return None
+
+        if name is not None:
+            return self._profiles.get(name)
+
+        from pretty_verbose.profile_classes import merge_stats
+
+        return merge_stats(self._profiles.values())
+
+    def print_profile(self, top=10, sort="cumulative", **opts):
+        """Print the functions which took the most time in the profiled runs.
+
+        Parameters
+        ----------
+        top: Int. Default: 10.
+            Number of functions.
+
+        sort: Str. Default: "cumulative".
+            Sort key of `pstats.Stats.sort_stats` ("cumulative", "tottime",
+            "ncalls"...).
+
+        **opts:
+            Arguments passed to `profile_stats`.
+
+        """
+        stats = self.profile_stats(**opts)
+        if stats is None:
+            self.warning("There are no profiled runs", skip_save=True)
+            return
+
+        from pretty_verbose.profile_classes import top_functions
+
+        self.info("\n".join([
+            f"Profile of {self.name} ({stats.total_tt * 1000:.3f}ms):",
+            *top_functions(stats, top, sort)
+        ]))
+
+    def dump_profile(self, path=None, **opts):
+        """Write the profile stats of the profiled runs to a file.
+
+        The file can be read with `pstats` or tools like snakeviz.
+
+        Parameters
+        ----------
+        path: Path, Str. Default: None.
+            File of the stats, `{name}.pstats` in the log directory if None.
+
+        **opts:
+            Arguments passed to `profile_stats`.
+
+        Returns
+        -------
+            Path of the file, or None if there is nothing profiled.
+
+        """
+        stats = self.profile_stats(**opts)
+        if stats is None:
+            self.warning("There are no profiled runs", skip_save=True)
+            return None
+
+        if path is None:
+            import os
+
+            path = os.path.join(
+                self.output_conf().log_dir, f"{self.name}.pstats"
+            )
+
+        stats.dump_stats(path)
+        return path
+
+    def __cancel_tracker(self):
+        """Stop tracking the allocations of a run which failed."""
+        if self._timer is not None and self._timer.tracker is not None:
+            self._timer.tracker.cancel()
+            self._timer.tracker = None
+
     def get_parents(self):
         """Extract the parents from the name.
 
@@ -133,36 +601,139 @@ class Task(VerboseMessages):
             task.
 
         """
-        n_parts = re.match(self.NAME_REGEX, self.name)
-        if n_parts is not None:
-            return (
-                "" if n_parts[1] is None else n_parts[1][:-1],
-                "" if n_parts[2] is None else n_parts[2][:-1],
-                "" if n_parts[3] is None else n_parts[3][:-1],
-                "" if n_parts[4] is None else n_parts[4]
-            )
+        # The components are parsed again only when the name changes.
+        name_parts = self._name_parts
+        if name_parts is None or name_parts[0] is not self.name:
+            name_parts = self.__parse_name()
+            self._name_parts = name_parts
+
+        name, parents, gran_parents, parent = name_parts
+        return (
+            parents, gran_parents, parent,
+            name[len(parents) + 1:] if parents else name
+        )
+
+    def __parse_name(self):
+        """Parse the name with the name regex.
+
+        Returns
+        -------
+            Tuple with the name, the parents, the gran-parents and the parent.
+            The parents are interned, as they are shared by the siblings.
 
-        # Return void if the match fails.
-        return "", "", "", self.name
+        """
+        import re
+
+        n_parts = re.match(self.NAME_REGEX, self.name)
+        if n_parts is None:
+            # Return void if the match fails.
+            return self.name, "", "", ""
+
+        return (
+            self.name,
+            "" if n_parts[1] is None else intern(n_parts[1][:-1]),
+            "" if n_parts[2] is None else intern(n_parts[2][:-1]),
+            "" if n_parts[3] is None else intern(n_parts[3][:-1])
+        )
 
     def reset_timer(self):
         """Reset the timer of the task."""
-        self.timer = {"ti": None, "tf": None, "diff": None, "on": False}
+        self._timer = None
+
+    def start_timer(self, allocations=None):
+        """Save the actual time and switch the timer on.
 
-    def start_timer(self):
-        """Save the actual time and switch the timer on."""
-        if self.timer["on"]:
+        Parameters
+        ----------
+        allocations: Bool. Default: None.
+            Track the memory allocated while the timer runs, the
+            `allocations` option of the task if None.
+
+        """
+        if self.timer.on:
             self.warning("Timer already running...")
             return
 
-        self.timer["ti"] = datetime.now()
-        self.timer["diff"] = None
-        self.timer["on"] = True
+        if allocations is None:
+            allocations = self._allocations
+        self.timer.allocations = None
+        if allocations:
+            from pretty_verbose.allocation_classes import AllocationTracker
+
+            self.timer.tracker = AllocationTracker()
+            self.timer.tracker.start()
+
+        if self._resources:
+            from pretty_verbose.resource_classes import ResourceUsage
+
+            self.timer.usage_i = ResourceUsage.sample()
+            self.timer.usage = None
+
+        self.timer.ti = datetime.now()
+        self.timer.diff = None
+        self.timer.on = True
+
+        if _WATCHDOG is not None:
+            _WATCHDOG.watch(self)
+
+    def usage(self):
+        """Return the resources used in the last run of the timer.
+
+        Returns
+        -------
+            ResourceUsage, or None if the resources are not sampled.
+
+        """
+        return None if self._timer is None else self._timer.usage
+
+    def allocations(self):
+        """Return the memory allocated in the last run of the timer.
+
+        Returns
+        -------
+            AllocationStats, or None if the allocations are not tracked.
+
+        """
+        return None if self._timer is None else self._timer.allocations
+
+    def print_allocations(self, top=None):
+        """Print the memory allocated in the last run of the timer.
+
+        Parameters
+        ----------
+        top: Int. Default: None.
+            Number of allocation sites, all of the kept ones if None.
+
+        """
+        allocations = self.allocations()
+        if allocations is None:
+            self.warning("The allocations are not tracked", skip_save=True)
+            return
+
+        self.info(f"Memory {allocations}", *allocations.report(top))
+
+    def deadline(self):
+        """Get the seconds the timer can run before the watchdog warns."""
+        return self._deadline
+
+    def set_deadline(self, deadline):
+        """
+        Set the seconds the timer can run before the watchdog warns.
+
+        The deadline is used from the next start of the timer.
+
+        Parameters
+        ----------
+        deadline: Float.
+            Seconds, the default deadline of the watchdog if None.
+
+        """
+        self._deadline = deadline
 
     def lap(self):
         """Return the partial duration of the task."""
-        if self.timer["on"]:
-            lap_time = datetime.now() - self.timer["ti"]
+        if self.timer.on:
+            lap_time = datetime.now() - self.timer.ti
             return self.__get_milliseconds(lap_time)
 
         self.warning("Timer is not running...")
@@ -170,13 +741,26 @@ class Task(VerboseMessages):
 
     def stop_timer(self):
         """Stop the timer of the task."""
-        if not self.timer["on"]:
+        if not self.timer.on:
             self.warning("Timer already stopped...")
             return
 
-        self.timer["tf"] = datetime.now()
-        self.timer["diff"] = self.timer["tf"] - self.timer["ti"]
-        self.timer["on"] = False
+        self.timer.tf = datetime.now()
+        self.timer.diff = self.timer.tf - self.timer.ti
+        self.timer.on = False
+
+        if _WATCHDOG is not None:
+            _WATCHDOG.unwatch(self)
+
+        if self.timer.usage_i is not None:
+            from pretty_verbose.resource_classes import ResourceUsage
+
+            self.timer.usage = ResourceUsage.sample() - self.timer.usage_i
+            self.timer.usage_i = None
+
+        if self.timer.tracker is not None:
+            self.timer.allocations = self.timer.tracker.stop()
+            self.timer.tracker = None
 
     def total_time(self):
         """Return the time the task took.
@@ -184,15 +768,15 @@ class Task(VerboseMessages):
         If the timer is still running, returning the lap.
 
         """
-        if self.timer["on"]:
+        if self.timer.on:
             self.warning("Timer is still running. Returning lap...")
             return self.lap()
 
-        if self.timer["diff"] is None:
+        if self.timer.diff is None:
             self.warning("Timer have not been started...")
             return None
 
-        return self.__get_milliseconds(self.timer['diff'])
+        return self.__get_milliseconds(self.timer.diff)
 
     def task_done(self, print_timer=False):
         """Stop the timer of the task and print the total timer.
@@ -204,15 +788,95 @@ class Task(VerboseMessages):
 
         """
         self.stop_timer()
+        total = self.total_time()
         if print_timer:
-            self.info(f"Task done in: {self.total_time()}ms")
+            details = ", ".join(
+                f"{detail}" for detail in (self.usage(), self.allocations())
+                if detail is not None
+            )
+            self.info(
+                f"Task done in: {total}ms"
+                + (f" ({details})" if details else "")
+            )
+
+        if self._parent is not None:
+            self._parent._child_done(self)
 
-        return self.total_time()
+        return total
 
     def print_lap(self):
         """Stop the timer of the task and print the total timer."""
         self.info(f"Task lap: {self.lap()}ms")
 
+    def counter(self, name="items", windows=None):
+        """Return a counter of processed items, created on first use.
+
+        In hot loops the counter is got once and its `add` method called for
+        each item.
+
+        Parameters
+        ----------
+        name: Str. Default: "items".
+            Name of the counter.
+
+        windows: Array. Default: None.
+            Windows of the rates in seconds, `RateCounter.WINDOWS` if None.
+            Only used when the counter is created.
+
+        Returns
+        -------
+            RateCounter.
+
+        """
+        if self._counters is None:
+            self._counters = {}
+
+        counter = self._counters.get(name)
+        if counter is None:
+            from pretty_verbose.metrics_classes import RateCounter
+
+            counter = self._counters[name] = RateCounter(windows)
+
+        return counter
+
+    def count(self, n_items=1, name="items"):
+        """Count processed items.
+
+        Parameters
+        ----------
+        n_items: Int. Default: 1.
+            Number of items.
+
+        name: Str. Default: "items".
+            Name of the counter.
+
+        """
+        self.counter(name).add(n_items)
+
+    def throughput(self):
+        """Return the values of the counters of the task.
+
+        Returns
+        -------
+            Dictionary with the total, the mean rate and the rate of each
+            window of each counter, by its name.
+
+        """
+        if not self._counters:
+            return {}
+
+        return {
+            name: counter.snapshot()
+            for name, counter in self._counters.items()
+        }
+
+    def print_throughput(self):
+        """Print the total and the rates of the counters of the task."""
+        from pretty_verbose.metrics_classes import format_throughput
+
+        for name, snapshot in self.throughput().items():
+            self.info(format_throughput(name, snapshot))
+
     def get_depth(self):
         """Abstract method for the process methods."""
         return 0
@@ -235,8 +899,9 @@ class Process(Task):
     name: Str.
         Name of the scope to know which process prints the message.
 
-    log_dir: Path, Str. Default: ".".
-        Directory for the output log files.
+    log_dir: Path, Str. Default: None.
+        Directory for the output log files, the one of `output_conf` or "."
+        if None.
 
     depth: Task. Default: None.
         Depth of the process.
@@ -244,33 +909,73 @@ class Process(Task):
     process: Task. Default: None.
         Parent process.
 
+    release_done: Bool. Default: None.
+        Release the tasks when they are done, keeping only their timing in
+        `Process.stats`. The value of the parent process if None, else False.
+
+    max_children: Int. Default: None.
+        Maximum number of tasks and subprocesses kept by the process, the
+        oldest finished ones, whose timer has stopped, (or the oldest ones, if
+        none of them is finished) are released when there are more. The value
+        of the parent process if None, unlimited if it is not set.
+
     **config:
         Parameters passed to `Task`.
 
+    Notes
+    -----
+    All the processes of a tree share a registry with every node indexed by
+    its full path (`"main.sub1:task1"`), see `Process.get_node`,
+    `Process.iter_subtree` and `Process.remove_node`.
+
+    A released node is removed from the tree and its log file is closed, so
+    a long-running process which creates a task per request does not grow.
+
     """
-    __depth = 0
+    __slots__ = (
+        "_subprocesses", "_tasks", "_registry", "__depth", "_release_done",
+        "_max_children", "_stats"
+    )
 
     NAME_REGEX = r"^(([^ \n]+\.)*([^ \n]+\.))?([^ \n.:]*)$"
     MAX_DEPTH = 5
 
     def __init__(
-        self, level, name, log_dir=".", depth=None, process=None, **config
+        self, level, name, log_dir=None, depth=None, process=None,
+        release_done=None, max_children=None, **config
     ):
         # Create task.
+        if log_dir is not None:
+            config["log_dir"] = log_dir
+
         super().__init__(
-            level, name, log_dir=log_dir,
-            log_file=config.pop("log_file", f"{name}.log"), **config
+            level, name, log_file=config.pop("log_file", f"{name}.log"),
+            **config
         )
 
-        self.subprocesses = {}
-        self.tasks = {}
+        # Children, created on first use.
+        self._subprocesses = None
+        self._tasks = None
+
+        # Retention policy, inherited from the parent process.
+        parent = depth if isinstance(depth, Process) else process
+        if isinstance(parent, Process):
+            if release_done is None:
+                release_done = parent._release_done
+            if max_children is None:
+                max_children = parent._max_children
+        self._release_done = bool(release_done)
+        self._max_children = max_children
+        self._stats = None
 
         # Configure tree. (Parent process)
         if isinstance(depth, Process):
             self.__config_depth(depth)
+            self._registry = depth._registry
 
         elif isinstance(process, Process):
             self.__config_depth(process)
+            self._registry = process._registry
 
             if process.has_subprocess(self):
                 self.name = self.scope = (
@@ -281,6 +986,325 @@ class Process(Task):
 
         else:
             self.__depth = 0
+            self._registry = {self.name: self}
+
+    @property
+    def subprocesses(self):
+        """Dictionary with the subprocesses of the process."""
+        if self._subprocesses is None:
+            self._subprocesses = {}
+        return self._subprocesses
+
+    @property
+    def tasks(self):
+        """Dictionary with the tasks of the process."""
+        if self._tasks is None:
+            self._tasks = {}
+        return self._tasks
+
+    def throughput(self, recursive=True):
+        """Return the values of the counters of the process.
+
+        Parameters
+        ----------
+        recursive: Bool. Default: True.
+            Add the counters with the same name of all the descendants, the
+            rates of the tasks running at the same time are summed. The
+            totals include the ones of the released tasks, which do not add
+            to the rates.
+
+        Returns
+        -------
+            Dictionary with the total, the mean rate and the rate of each
+            window of each counter, by its name.
+
+        """
+        if not recursive:
+            return super().throughput()
+
+        from pretty_verbose.metrics_classes import merge_throughput
+
+        snapshots = {}
+        for _, node in self.iter_subtree():
+            if node._counters:
+                for name, counter in node._counters.items():
+                    snapshots.setdefault(name, []).append(counter.snapshot())
+        for stats in self.stats().values():
+            for name, total in (stats.counters or {}).items():
+                snapshots.setdefault(name, []).append(
+                    {"total": total, "mean": 0.0, "rates": {}}
+                )
+
+        return {
+            name: merge_throughput(counter_snapshots)
+            for name, counter_snapshots in snapshots.items()
+        }
+
+    def print_throughput(self, recursive=True):
+        """Print the total and the rates of the counters of the process.
+
+        Parameters
+        ----------
+        recursive: Bool. Default: True.
+            Add the counters of all the descendants.
+
+        """
+        from pretty_verbose.metrics_classes import format_throughput
+
+        for name, snapshot in self.throughput(recursive).items():
+            self.info(format_throughput(name, snapshot))
+
+    def usage(self, recursive=False):
+        """Return the resources used by the process.
+
+        Parameters
+        ----------
+        recursive: Bool. Default: False.
+            Return the resources used by the tasks of the subtree instead,
+            including the released ones. The timers of the processes, which
+            usually enclose the ones of their tasks, are not added.
+
+        Returns
+        -------
+            ResourceUsage, or None if the resources are not sampled.
+
+        """
+        if not recursive:
+            return super().usage()
+
+        from pretty_verbose.resource_classes import ResourceUsage
+
+        usages = [
+            node._timer.usage for _, node in self.iter_subtree()
+            if not isinstance(node, Process) and node._timer is not None
+        ]
+        usages.extend(stats.usage for stats in self.stats().values())
+
+        total = None
+        for usage in usages:
+            if usage is not None:
+                if total is None:
+                    total = ResourceUsage()
+                total.merge(usage)
+
+        return total
+
+    def print_usage(self):
+        """Print the resources used by the tasks of the subtree."""
+        usage = self.usage(recursive=True)
+        if usage is None:
+            self.warning("The resources are not sampled", skip_save=True)
+            return
+
+        self.info(f"Resources used: {usage}")
+
+    def profile_stats(self, name=None, recursive=True):
+        """Return the profile stats of the profiled runs of the process.
+
+        Parameters
+        ----------
+        name: Str. Default: None.
+            Name of the section or function, all of them if None.
+
+        recursive: Bool. Default: True.
+            Add the stats of all the descendants.
+
+        Returns
+        -------
+            pstats.Stats, or None if there is nothing profiled.
+
+        """
+        if not recursive:
+            return super().profile_stats(name)
+
+        from pretty_verbose.profile_classes import merge_stats
+
+        return merge_stats(
+            stats for stats in (
+                Task.profile_stats(node, name)
+                for _, node in self.iter_subtree()
+            )
+            if stats is not None
+        )
+
+    def stats(self, recursive=True):
+        """Return the timing of the released tasks.
+
+        Parameters
+        ----------
+        recursive: Bool. Default: True.
+            Include the tasks released by the subprocesses.
+
+        Returns
+        -------
+            Dictionary with the `TaskStats` of each kind of task, by the name
+            of the tasks with the numbers replaced by "#".
+
+        """
+        stats = {}
+        for _, node in (
+            self.iter_subtree() if recursive else ((self.name, self),)
+        ):
+            if not isinstance(node, Process) or not node._stats:
+                continue
+            for key, node_stats in node._stats.items():
+                if key not in stats:
+                    stats[key] = TaskStats()
+                stats[key].merge(node_stats)
+
+        return stats
+
+    def release(self, path):
+        """Release a node and its descendants, keeping their timing.
+
+        The timers and the totals of the counters of the nodes are added to
+        the `stats` of the process, their records are written and their log
+        files closed, and they are removed from the tree.
+
+        Parameters
+        ----------
+        path: Str.
+            Full path of the node.
+
+        Returns
+        -------
+            The released node, or None if it is not in the tree.
+
+        """
+        node = self._registry.get(path)
+        if node is None:
+            return None
+
+        if self._stats is None:
+            self._stats = {}
+        stats = self._stats
+
+        for _, child in self.iter_subtree(path):
+            if isinstance(child, Process) and child._stats:
+                for key, child_stats in child._stats.items():
+                    if key not in stats:
+                        stats[key] = TaskStats()
+                    stats[key].merge(child_stats)
+                child._stats = None
+
+            key = _task_kind(child.get_parents()[3])
+            if key not in stats:
+                stats[key] = TaskStats()
+            timer = child._timer
+            if timer is None:
+                stats[key].add(None, counters=child._counters)
+            else:
+                stats[key].add(
+                    None if timer.diff is None
+                    else timer.diff.total_seconds() * 1000,
+                    None if isinstance(child, Process) else timer.usage,
+                    child._counters
+                )
+
+            child.flush()
+            if child._file is not None:
+                child._file.close()
+
+        return self.remove_node(path)
+
+    def _child_done(self, task):
+        """Release a task when it is done, if the process releases them."""
+        if self._release_done and task._parent is self:
+            self.release(task.name)
+
+    def __add_child(self, children, path, node):
+        """Add a child and release the old ones above `max_children`."""
+        children[path] = node
+        self._registry[path] = node
+        node._parent = self
+        if node.name != path or (
+            isinstance(node, Process) and node._registry is not self._registry
+        ):
+            self.__graft(path, node)
+
+        self.__release_over_cap(node)
+
+    def __release_over_cap(self, new=None):
+        """
+        Release the oldest children above `max_children`.
+
+        Parameters
+        ----------
+        new: Task. Default: None.
+            Child just added, which is kept.
+
+        """
+        max_children = self._max_children
+        if max_children is None:
+            return
+
+        n_children = len(self._tasks or ()) + len(self._subprocesses or ())
+        while n_children > max_children:
+            # Children in order of creation, the tasks first. The ones which
+            # are not started yet are not finished.
+            oldest = unfinished = None
+            for group in (self._tasks, self._subprocesses):
+                for child_path, child in (group or {}).items():
+                    if child is new:
+                        continue
+                    timer = child._timer
+                    if (
+                        timer is not None and timer.diff is not None and
+                        not timer.on
+                    ):
+                        oldest = child_path
+                        break
+                    if unfinished is None:
+                        unfinished = child_path
+                if oldest is not None:
+                    break
+
+            if oldest is None:
+                oldest = unfinished
+            if oldest is None:
+                return
+            self.release(oldest)
+            n_children -= 1
+
+    def __graft(self, path, node):
+        """Move a node of another tree, with its descendants, to this tree.
+
+        The nodes are renamed after their new path, and the processes share
+        the registry of the tree.
+
+        Parameters
+        ----------
+        path: Str.
+            Full path of the node in the tree.
+
+        node: Task.
+            Added node.
+
+        """
+        old_path = node.name
+        subtree = (
+            list(node.iter_subtree()) if isinstance(node, Process)
+            else [(old_path, node)]
+        )
+
+        for node_path, child in subtree:
+            child.name = child.scope = path + node_path[len(old_path):]
+            self._registry[child.name] = child
+
+            if isinstance(child, Process):
+                child._registry = self._registry
+                child.__config_depth(
+                    self if child is node else child._parent
+                )
+
+        # The children are indexed by their new paths.
+        for _, child in subtree:
+            if isinstance(child, Process):
+                for group in (child._tasks, child._subprocesses):
+                    if group:
+                        nodes = list(group.values())
+                        group.clear()
+                        group.update((item.name, item) for item in nodes)
 
     def __config_depth(self, process):
         """
@@ -305,6 +1329,131 @@ class Process(Task):
         """Return the depth of the process."""
         return self.__depth
 
+    def exec_parallel(
+        self, *exec_fs, args=None, executor="thread", max_workers=None,
+        task_name="parallel", print_timer=False
+    ):
+        """
+        Execute functions concurrently, each one in its own timed task.
+
+        A task `{task_name}_{i}` is created for each function, with the timer
+        set to the time the function took. The numbers continue after the
+        ones of the existing tasks, so the tasks of previous calls are kept.
+        The `max_children` cap is applied once the timers are set, so the
+        tasks are not released before they run. The total wall time is
+        compared with the summed CPU time of the functions.
+
+        Parameters
+        ----------
+        exec_fs: Callable.
+            Functions to be executed.
+
+        args: Array. Default: None.
+            List of arguments of each of the functions, with one item for
+            each function.
+
+        executor: Str, concurrent.futures.Executor. Default: "thread".
+            Pool in which run the functions, "thread", "process" or an
+            executor. In a process pool the functions and the arguments must
+            be picklable.
+
+        max_workers: Int. Default: None.
+            Number of workers of the created pool.
+
+        task_name: Str. Default: "parallel".
+            Prefix of the name of the tasks.
+
+        print_timer: Bool. Default: False.
+            Whether print or not the timer of each task and the total times.
+
+        Returns
+        -------
+            results, errors: Lists with the value returned and the exception
+            raised by each function (None when there is not).
+
+        """
+        from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                        ThreadPoolExecutor)
+
+        if args is None:
+            args = [()] * len(exec_fs)
+        elif len(args) != len(exec_fs):
+            self.error(
+                f"Got {len(args)} lists of arguments for {len(exec_fs)} "
+                "functions.",
+                err_id=108, err_str="ARGUMENTS MISMATCH"
+            )
+
+        if isinstance(executor, Executor):
+            pool, cpu_clock = executor, time.thread_time
+        elif executor == "thread":
+            pool = ThreadPoolExecutor(max_workers)
+            cpu_clock = time.thread_time
+        elif executor == "process":
+            pool = ProcessPoolExecutor(max_workers)
+            cpu_clock = time.process_time
+        else:
+            self.error(
+                f"Unknown executor: {executor}.",
+                err_id=106, err_str="UNKNOWN EXECUTOR"
+            )
+
+        # First number with free names for all the tasks.
+        first = 0
+        while any(
+            f"{self.name}:{task_name}_{first + i}" in self.tasks
+            for i in range(len(exec_fs))
+        ):
+            first += 1
+        max_children, self._max_children = self._max_children, None
+        try:
+            tasks = [
+                self.new_task(f"{task_name}_{first + i}")
+                for i in range(len(exec_fs))
+            ]
+        finally:
+            self._max_children = max_children
+
+        t_i = datetime.now()
+        try:
+            futures = [
+                pool.submit(_timed_call, exec_f, exec_args, cpu_clock)
+                for exec_f, exec_args in zip(exec_fs, args)
+            ]
+            outputs = [future.result() for future in futures]
+        finally:
+            if pool is not executor:
+                pool.shutdown()
+        wall = (datetime.now() - t_i).total_seconds() * 1000
+
+        results, errors = [], []
+        cpu = 0
+        for task, (result, error, t_start, t_stop, cpu_time) in zip(
+            tasks, outputs
+        ):
+            task.timer.ti = t_start
+            task.timer.tf = t_stop
+            task.timer.diff = t_stop - t_start
+            cpu += cpu_time * 1000
+
+            if error is not None:
+                task.error(f"Task failed: {error!r}")
+            elif print_timer:
+                task.info(f"Task done in: {task.total_time()}ms")
+            self._child_done(task)
+
+            results.append(result)
+            errors.append(error)
+        self.__release_over_cap()
+
+        if print_timer:
+            self.info(
+                f"Parallel tasks done in: {wall}ms (CPU time: {cpu:.3f}ms, "
+                f"speedup: {cpu / wall if wall else 0:.2f}x)"
+            )
+
+        return results, errors
+
     def new_task(self, name, **config):
         """Add a new task to the process.
 
@@ -321,16 +1470,21 @@ class Process(Task):
             The new task.
 
         """
-        self.tasks[f"{self.name}:{name}"] = Task(
-            self.level, f"{self.name}:{name}",
-            log_dir=config.pop("log_dir", self.output_conf().log_dir),
-            sep=config.pop("sep", self.output_conf().sep),
-            overwrite=config.pop("overwrite", self.output_conf().overwrite),
-            no_save=config.pop("no_save", self.output_conf().no_save),
+        full_name = f"{self.name}:{name}"
+        task = Task(
+            self.level, full_name,
+            output_conf=config.pop("output_conf", self.output_conf()),
+            layout=config.pop("layout", self.layout()),
+            console_sink=config.pop("console_sink", self.console_sink()),
+            sinks=config.pop("sinks", self._sinks),
+            metrics=config.pop("metrics", self._metrics),
+            resources=config.pop("resources", self._resources),
+            allocations=config.pop("allocations", self._allocations),
             **config
         )
+        self.__add_child(self.tasks, full_name, task)
 
-        return self.tasks[f"{self.name}:{name}"]
+        return task
 
     def add_task(self, task):
         """Add a new task to the process.
@@ -342,7 +1496,7 @@ class Process(Task):
 
         """
         _, _, _, name = task.get_parents()
-        self.tasks[f"{self.name}:{name}"] = task
+        self.__add_child(self.tasks, f"{self.name}:{name}", task)
 
     def has_task(self, task):
         """Check if the task is in the process.
@@ -361,7 +1515,10 @@ class Process(Task):
                 err_id=105, err_str="INCOMPATIBLE PARENTS"
             )
 
-        return self.tasks.get(f"{self.name}:{name}", None) is not None
+        if self._tasks is None:
+            return False
+
+        return self._tasks.get(f"{self.name}:{name}", None) is not None
 
     def new_subprocess(self, name, **config):
         """Add a new subprocess to the process.
@@ -379,16 +1536,21 @@ class Process(Task):
             The new process.
 
         """
-        self.subprocesses[f"{self.name}.{name}"] = Process(
-            self.level, f"{self.name}.{name}",
-            config.pop("log_dir", self.output_conf().log_dir),
-            sep=config.pop("sep", self.output_conf().sep),
-            overwrite=config.pop("overwrite", self.output_conf().overwrite),
-            no_save=config.pop("no_save", self.output_conf().no_save),
+        full_name = f"{self.name}.{name}"
+        process = Process(
+            self.level, full_name,
+            output_conf=config.pop("output_conf", self.output_conf()),
+            layout=config.pop("layout", self.layout()),
+            console_sink=config.pop("console_sink", self.console_sink()),
+            sinks=config.pop("sinks", self._sinks),
+            metrics=config.pop("metrics", self._metrics),
+            resources=config.pop("resources", self._resources),
+            allocations=config.pop("allocations", self._allocations),
             depth=self, **config
         )
+        self.__add_child(self.subprocesses, full_name, process)
 
-        return self.subprocesses[f"{self.name}.{name}"]
+        return process
 
     def add_subprocess(self, process):
         """Add a new subprocess to the process.
@@ -400,7 +1562,7 @@ class Process(Task):
 
         """
         _, _, _, name = process.get_parents()
-        self.tasks[f"{self.name}.{name}"] = process
+        self.__add_child(self.subprocesses, f"{self.name}.{name}", process)
 
     def has_subprocess(self, process):
         """Check if the subprocess is in the process.
@@ -419,4 +1581,131 @@ class Process(Task):
                 err_id=105, err_str="INCOMPATIBLE PARENTS"
             )
 
-        return self.subprocesses.get(f"{self.name}.{name}", None) is not None
+        if self._subprocesses is None:
+            return False
+
+        return self._subprocesses.get(f"{self.name}.{name}") is not None
+
+    def get_node(self, path):
+        """Return a task or process of the tree from its full path.
+
+        Parameters
+        ----------
+        path: Str.
+            Full path of the node, e.g. `"main.sub1:task1"`.
+
+        Returns
+        -------
+            The `Task` or `Process`, or None if it is not in the tree.
+
+        """
+        return self._registry.get(path)
+
+    def iter_subtree(self, path=None):
+        """Iterate over a node and all its descendants.
+
+        Parameters
+        ----------
+        path: Str. Default: None.
+            Full path of the root of the subtree, the process itself if None.
+
+        Yields
+        ------
+            Tuples with the full path and the node.
+
+        """
+        node = self if path is None else self._registry.get(path)
+        if node is None:
+            return
+
+        stack = [(node.name if path is None else path, node)]
+        while stack:
+            node_path, node = stack.pop()
+            yield node_path, node
+
+            if isinstance(node, Process):
+                if node._subprocesses:
+                    stack.extend(node._subprocesses.items())
+                if node._tasks:
+                    stack.extend(node._tasks.items())
+
+    def remove_node(self, path):
+        """Remove a node and all its descendants from the tree.
+
+        Parameters
+        ----------
+        path: Str.
+            Full path of the node.
+
+        Returns
+        -------
+            The removed node, or None if it is not in the tree.
+
+        """
+        node = self._registry.get(path)
+        if node is None:
+            return None
+
+        for node_path, _ in list(self.iter_subtree(path)):
+            self._registry.pop(node_path, None)
+        node._parent = None
+
+        # The parent path ends at the last separator of the path.
+        sep_index = max(path.rfind("."), path.rfind(":"))
+        parent = self._registry.get(path[:sep_index])
+        if isinstance(parent, Process):
+            if parent._tasks:
+                parent._tasks.pop(path, None)
+            if parent._subprocesses:
+                parent._subprocesses.pop(path, None)
+
+        return node
+
+    def merge_logs(self, path=None, **filters):
+        """Merge the logs of the process and its descendants by time.
+
+        The logs are streamed and merged with a heap, so the memory does not
+        grow with their size. The merged log has a `scope` column.
+
+        Parameters
+        ----------
+        path: Path, Str. Default: None.
+            Merged log file, `{name}.merged.log` in the log directory if None.
+
+        **filters:
+            Arguments passed to `LogReader.entries` (`types`, `scopes`,
+            `since` and `until`).
+
+        Returns
+        -------
+            Path of the merged log.
+
+        """
+        import os
+
+        from pretty_verbose.reader_classes import (
+            LogReader, merge_entries, write_log
+        )
+
+        if path is None:
+            path = os.path.join(
+                self.output_conf().log_dir, f"{self.name}.merged.log"
+            )
+
+        readers = {}
+        for _, node in self.iter_subtree():
+            node.flush()
+            if node._log_path not in readers and os.path.exists(
+                node._log_path
+            ):
+                readers[node._log_path] = LogReader(
+                    node._log_path, sep=node.output_conf().sep,
+                    scope=node.scope
+                )
+
+        write_log(
+            merge_entries(readers.values(), **filters), path,
+            self.output_conf().sep
+        )
+
+        return path
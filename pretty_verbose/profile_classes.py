@@ -0,0 +1,115 @@
+"""Classes of the profiling of the tasks."""
+import cProfile
+import pstats
+import threading
+
+# Profiler running in each thread, cProfile can not be nested.
+_LOCAL = threading.local()
+
+
+class SectionProfiler:
+    """Profiler of a run of a task.
+
+    Only one profiler runs in each thread, a run nested in a profiled one is
+    included in the stats of the outer run. Nothing is profiled if another
+    profiling tool is active.
+
+    """
+    __slots__ = ("_profile",)
+
+    def __init__(self):
+        self._profile = None
+
+    def start(self):
+        """Start profiling the current thread."""
+        if getattr(_LOCAL, "active", None) is not None:
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool is active (Python >= 3.12).
+            return
+
+        self._profile = profile
+        _LOCAL.active = self
+
+    def stop(self):
+        """
+        Stop profiling.
+
+        Returns
+        -------
+            pstats.Stats, or None if the run was not profiled.
+
+        """
+        profile, self._profile = self._profile, None
+        if profile is None:
+            return None
+
+        profile.disable()
+        _LOCAL.active = None
+        return pstats.Stats(profile)
+
+
+def merge_stats(stats):
+    """
+    Add several stats.
+
+    Parameters
+    ----------
+    stats: Iterable.
+        pstats.Stats to be added.
+
+    Returns
+    -------
+        pstats.Stats, or None if there are none.
+
+    """
+    merged = None
+    for item in stats:
+        if merged is None:
+            merged = pstats.Stats()
+        merged.add(item)
+
+    return merged
+
+
+def top_functions(stats, top=10, sort="cumulative"):
+    """
+    Return the lines of the functions which took the most time.
+
+    Parameters
+    ----------
+    stats: pstats.Stats.
+        Profile stats.
+
+    top: Int. Default: 10.
+        Number of functions.
+
+    sort: Str. Default: "cumulative".
+        Sort key of `pstats.Stats.sort_stats` ("cumulative", "tottime",
+        "ncalls"...).
+
+    Returns
+    -------
+        List of strings, the header and one for each function.
+
+    """
+    stats.sort_stats(sort)
+    lines = [
+        f"{'ncalls':>10} {'tottime':>12} {'cumtime':>12}  function"
+    ]
+    for func in stats.fcn_list[:top]:
+        primitive, n_calls, total, cumulative, _ = stats.stats[func]
+        calls = (
+            f"{n_calls}" if n_calls == primitive
+            else f"{n_calls}/{primitive}"
+        )
+        lines.append(
+            f"{calls:>10} {total * 1000:10.3f}ms {cumulative * 1000:10.3f}ms"
+            f"  {pstats.func_std_string(func)}"
+        )
+
+    return lines
@@ -0,0 +1,327 @@
+"""Interactive prompts of the messengers.
+
+This module is imported on the first call to `VerboseMessages.select` or
+`VerboseMessages.confirm`, so the regular expressions are only compiled by the
+programs that actually ask the user.
+
+"""
+import re
+
+# Single option number.
+NUM_RE = re.compile(r"\d+")
+
+# Option number or range of options.
+RANGE_RE = re.compile(r"\d+(?:-\d+)?")
+
+# Comma separated list of options or ranges of options.
+RANGE_LIST_RE = re.compile(r"\d+(?:-\d+)?(?:\s*,\s*\d+(?:-\d+)?)*")
+
+# Confirmation answers.
+YES_RE = re.compile(r"([Yy](es)?)?")
+NO_RE = re.compile(r"[Nn]o?")
+
+
+# Number of options above which the selection is paginated.
+PAGE_THRESHOLD = 50
+
+# Options per page of the paginated selection.
+DEFAULT_PAGE_SIZE = 20
+
+
+class OptionIndex:
+    """Index of the labels of the options, for substring searches.
+
+    The searches of three or more characters only check the options which
+    contain all the trigrams of the query.
+
+    Parameters
+    ----------
+    options: Array.
+        Available options.
+
+    """
+    __slots__ = ("labels", "_trigrams")
+
+    def __init__(self, options):
+        self.labels = [f"{option}".lower() for option in options]
+        self._trigrams = None
+
+    def __build(self):
+        trigrams = {}
+        for i, label in enumerate(self.labels):
+            for trigram in {label[j:j + 3] for j in range(len(label) - 2)}:
+                postings = trigrams.get(trigram)
+                if postings is None:
+                    trigrams[trigram] = [i]
+                else:
+                    postings.append(i)
+        self._trigrams = trigrams
+
+    def search(self, query):
+        """
+        Find the options which contain a text, ignoring the case.
+
+        Parameters
+        ----------
+        query: Str.
+            Text to be searched.
+
+        Returns
+        -------
+            List with the indices of the options, in order.
+
+        """
+        query = query.lower()
+        if len(query) < 3:
+            return [i for i, label in enumerate(self.labels) if query in label]
+
+        if self._trigrams is None:
+            self.__build()
+
+        postings = []
+        for trigram in {query[j:j + 3] for j in range(len(query) - 2)}:
+            indices = self._trigrams.get(trigram)
+            if indices is None:
+                return []
+            postings.append(indices)
+
+        # Intersect starting from the rarest trigram.
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for indices in postings[1:]:
+            candidates.intersection_update(indices)
+
+        labels = self.labels
+        return sorted(i for i in candidates if query in labels[i])
+
+
+def parse_selection(messages, response, options, many=False, repeat=False):
+    """
+    Parse the options selected by the user.
+
+    Parameters
+    ----------
+    messages: VerboseMessages.
+        Messenger used to print the warnings, which are not saved.
+
+    response: Str.
+        Input of the user.
+
+    options: Array.
+        Available options.
+
+    many: Bool. Default: False.
+        Allow selecting several options and ranges.
+
+    repeat: Bool. Default: False.
+        Keep the options selected more than once.
+
+    Returns
+    -------
+        Value of the selected option, tuple of values if `many`, or None if
+        the response is not valid.
+
+    """
+    if (RANGE_LIST_RE if many else NUM_RE).fullmatch(response) is None:
+        messages.warning("Invalid option.", skip_save=True)
+        return None
+
+    if not many:
+        selected = int(response)
+
+        if selected < len(options):
+            return options[selected]
+
+        messages.warning(
+            f"Value {selected} out of range, please select between "
+            f"0 and {len(options) - 1}.", skip_save=True
+        )
+        return None
+
+    ret_vals = []
+
+    for sel in RANGE_RE.findall(response):
+        if "-" in sel:
+            a, b = map(int, sel.split('-'))
+            if a > b:
+                messages.warning(f"Not valid option {sel}", skip_save=True)
+                return None
+
+            if b < len(options):
+                for item in options[a:b+1]:
+                    ret_vals.append(item)
+                continue
+
+            messages.warning(
+                f"Values {sel} out of range, please select between "
+                f"0 and {len(options) - 1}.", skip_save=True
+            )
+            return None
+
+        selected = int(sel)
+
+        if selected < len(options):
+            ret_vals.append(options[selected])
+            continue
+
+        messages.warning(
+            f"Values {sel} out of range, please select between "
+            f"0 and {len(options) - 1}.", skip_save=True
+        )
+        return None
+
+    if not repeat:
+        ret_vals = list(dict.fromkeys(ret_vals))
+
+    return (*ret_vals,)
+
+
+def select(messages, *message, options: dict, **opts):
+    """
+    Print a options list message from which the user should select.
+
+    The pages, the retries and the invalid responses are only printed, the
+    log saves the final selection.
+
+    Parameters
+    ----------
+    messages: VerboseMessages.
+        Messenger used to print the messages and ask the user.
+
+    message: Str.
+        Message text.
+
+    options: Array.
+        Available options.
+
+    **opts:
+        Arguments passed to VerboseMessages.
+
+    Returns
+    -------
+        Value of the selected option.
+
+    """
+    many = opts.pop("many", False)
+    repeat = opts.pop("repeat", False)
+    page_size = opts.pop("page_size", None)
+    skip_save = opts.pop("skip_save", False)
+    title = ", ".join(f"{el}" for el in message)
+
+    if page_size is None and len(options) > PAGE_THRESHOLD:
+        page_size = DEFAULT_PAGE_SIZE
+
+    if page_size:
+        response, selected = _select_pages(
+            messages, title, options, many, repeat, page_size, opts
+        )
+    else:
+        # The list is built once for all the retries.
+        listing = "\n".join([
+            title, *[f"{i}) {key}" for i, key in enumerate(options)]
+        ])
+        while True:
+            response = messages.input(
+                listing, input_text="Please select an option",
+                skip_save=True, **opts
+            )
+            selected = parse_selection(
+                messages, response, options, many, repeat
+            )
+            if selected is not None:
+                break
+
+    messages.log_input(response, skip_save)
+    return selected
+
+
+def _select_pages(messages, title, options, many, repeat, page_size, opts):
+    """
+    Ask the user to select options page by page.
+
+    Besides the numbers of the options, the user can write `n` and `p` to
+    move to the next and previous pages, `/text` to show only the options
+    which contain the text and `/` to show all the options again.
+
+    Returns
+    -------
+        Tuple with the response and the selected value.
+
+    """
+    import math
+
+    index = None
+    shown = range(len(options))
+    page = 0
+    while True:
+        n_pages = max(1, math.ceil(len(shown) / page_size))
+        page = min(page, n_pages - 1)
+        start = page * page_size
+
+        # Only the visible page is rendered.
+        lines = [title]
+        lines.extend(
+            f"{i}) {options[i]}" for i in shown[start:start + page_size]
+        )
+        lines.append(
+            f"Page {page + 1}/{n_pages}, {len(shown)} of {len(options)} "
+            "options (n: next, p: previous, /text: filter, /: all)"
+        )
+
+        response = messages.input(
+            "\n".join(lines), input_text="Please select an option",
+            skip_save=True, **opts
+        ).strip()
+
+        if response in ("n", ">"):
+            page = min(page + 1, n_pages - 1)
+        elif response in ("p", "<"):
+            page = max(page - 1, 0)
+        elif response.startswith("/"):
+            query = response[1:]
+            if query:
+                if index is None:
+                    index = OptionIndex(options)
+                shown = index.search(query)
+            else:
+                shown = range(len(options))
+            page = 0
+        else:
+            selected = parse_selection(
+                messages, response, options, many, repeat
+            )
+            if selected is not None:
+                return response, selected
+
+
+def confirm(messages, *message, **opts):
+    """
+    Print a confirmation message and return the response when it is valid.
+
+    Parameters
+    ----------
+    messages: VerboseMessages.
+        Messenger used to print the messages and ask the user.
+
+    message: Str.
+        Message text.
+
+    **opts:
+        Arguments passed to VerboseMessages.
+
+    Returns
+    -------
+        Bool with the confirmation value.
+
+    """
+    while True:
+        # Print input message.
+        response = messages.input(*message, input_text="[Y/n]", **opts)
+
+        if YES_RE.fullmatch(response) is not None:
+            return True
+
+        if NO_RE.match(response) is not None:
+            return False
+
+        messages.warning("Invalid option.")
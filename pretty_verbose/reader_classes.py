@@ -0,0 +1,676 @@
+"""Classes to read and replay the saved log files."""
+import io
+import os
+import sys
+
+from pretty_verbose.constants import colors
+from pretty_verbose.constants.message_types import MESSAGE_TYPES
+from pretty_verbose.messages_classes import DEFAULT_LAYOUT, compile_layout
+from pretty_verbose.sink_classes import (COMPRESSION_SUFFIXES,
+                                         SCOPED_LOG_HEADER, TIME_FORMAT,
+                                         format_row, format_time,
+                                         get_compression, open_compressed)
+
+# Size of the reads of the log files.
+CHUNK_SIZE = 1 << 20
+
+# Number of lines rendered before writing them to the stream.
+WRITE_BATCH = 4096
+
+# Suffixes of the log files.
+LOG_SUFFIXES = (".log",) + tuple(
+    f".log{suffix}" for suffix in COMPRESSION_SUFFIXES.values()
+)
+
+# Colors of the types of message which are not printed by the messengers.
+EXTRA_COLORS = {"USER INPUT": colors.CYAN}
+
+
+def parse_time(value):
+    """
+    Parse a time given by the user.
+
+    Parameters
+    ----------
+    value: Str.
+        Time in ISO format (`2024-01-31 12:00:00`) or as written in the logs
+        (`31/01/2024 12:00:00`).
+
+    Returns
+    -------
+        Datetime.
+
+    """
+    from datetime import datetime
+
+    value = value.strip("[]")
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+
+    for time_format in ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(value, time_format)
+        except ValueError:
+            pass
+
+    raise ValueError(f"invalid time: '{value}'")
+
+
+def time_key(value):
+    """
+    Return the epoch timestamp of a time.
+
+    Parameters
+    ----------
+    value: Int, Str, datetime.
+        Nanoseconds since the epoch, time as written in the old logs
+        (`[%d/%m/%Y %H:%M:%S]`), any time accepted by `parse_time` or
+        datetime.
+
+    Returns
+    -------
+        Int with the nanoseconds since the epoch.
+
+    """
+    from datetime import datetime
+
+    if isinstance(value, int):
+        return value
+
+    if isinstance(value, str):
+        if value.startswith("["):
+            value = datetime.strptime(value, TIME_FORMAT)
+        else:
+            value = parse_time(value)
+
+    return int(value.timestamp()) * 1_000_000_000 + value.microsecond * 1000
+
+
+class LogEntry:
+    """Message read from a log file.
+
+    Attributes
+    ----------
+    message_type: Str.
+        Type of message.
+
+    time: Int.
+        Time of the message, in nanoseconds since the epoch.
+
+    scope: Str.
+        Scope of the messenger which wrote the message.
+
+    message: Str.
+        Message text.
+
+    seq: Int. Default: 0.
+        Sequence number of the message in the process which wrote it, 0 in
+        the old logs.
+
+    """
+    __slots__ = ("message_type", "time", "scope", "message", "seq")
+
+    def __init__(self, message_type, time, scope, message, seq=0):
+        self.message_type = message_type
+        self.time = time
+        self.scope = scope
+        self.message = message
+        self.seq = seq
+
+    def __repr__(self):
+        return (
+            f"LogEntry({self.message_type!r}, {self.time!r}, {self.scope!r}, "
+            f"{self.message!r}, seq={self.seq!r})"
+        )
+
+
+class LogReader:
+    """Reader of a log file written by the messengers.
+
+    The columns are taken from the header of the file, so the logs of the
+    messengers and the dumps of the ring buffers (with a `scope` column) are
+    supported. The separator is detected from the header. The compressed logs
+    (`.gz` and `.xz`) are read up to their last flush, even while they are
+    being written.
+
+    Parameters
+    ----------
+    path: Path, Str.
+        Log file.
+
+    sep: Str. Default: None.
+        Separator of the values, detected from the header if None.
+
+    scope: Str. Default: None.
+        Scope of the messages of files without a `scope` column, the name of
+        the file without the `.log` (and compression) suffix if None.
+
+    chunk_size: Int. Default: CHUNK_SIZE.
+        Size in bytes of the reads of the file.
+
+    """
+    __slots__ = ("path", "sep", "scope", "chunk_size", "compression")
+
+    def __init__(self, path, sep=None, scope=None, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.sep = sep
+        self.chunk_size = chunk_size
+        self.compression = get_compression(path)
+
+        if scope is None:
+            scope = os.path.basename(os.fspath(path))
+            if self.compression is not None:
+                scope = scope[:-len(COMPRESSION_SUFFIXES[self.compression])]
+            if scope.endswith(".log"):
+                scope = scope[:-4]
+        self.scope = scope
+
+    def header(self):
+        """
+        Read the header of the file.
+
+        Returns
+        -------
+            Tuple with the separator, the names of the columns and the offset
+            in bytes of the first record.
+
+        """
+        if self.compression is None:
+            with open(self.path, "rb") as file:
+                line = file.readline()
+        else:
+            with open_compressed(self.path, "rb", self.compression) as file:
+                try:
+                    line = file.readline()
+                except EOFError:
+                    line = b""
+
+        sep = self.sep
+        header = line.decode("utf-8", "replace")
+        if not header.startswith("message_type"):
+            # File without header, with the default columns.
+            return sep or ";", ["message_type", "n_datetime", "message"], 0
+
+        sep = sep or header[len("message_type")]
+        return sep, header.rstrip("\r\n").split(sep), len(line)
+
+    def __open(self, start, end):
+        if self.compression is not None:
+            # The compressed files are read whole, skipping the header.
+            file = io.TextIOWrapper(
+                open_compressed(self.path, "rb", self.compression),
+                encoding="utf-8", errors="replace", newline=""
+            )
+            if start:
+                file.readline()
+            return file
+
+        if end is None:
+            file = open(
+                self.path, newline="", encoding="utf-8", errors="replace",
+                buffering=self.chunk_size
+            )
+            file.seek(start)
+            return file
+
+        raw = _RangeFile(self.path, start, end)
+        return io.TextIOWrapper(
+            io.BufferedReader(raw, self.chunk_size), encoding="utf-8",
+            errors="replace", newline=""
+        )
+
+    def __iter__(self):
+        return self.entries()
+
+    def entries(
+        self, types=None, scopes=None, since=None, until=None, start=0,
+        end=None
+    ):
+        """
+        Iterate over the messages of the file.
+
+        Parameters
+        ----------
+        types: Array. Default: None.
+            Types of message to keep, all of them if None.
+
+        scopes: Array. Default: None.
+            Scopes to keep, all of them if None.
+
+        since: Str, datetime. Default: None.
+            Keep the messages written at or after this time.
+
+        until: Str, datetime. Default: None.
+            Keep the messages written at or before this time.
+
+        start: Int. Default: 0.
+            Offset in bytes where the reading starts, at a record boundary.
+
+        end: Int. Default: None.
+            Offset in bytes where the reading stops, at a record boundary. The
+            end of the file if None.
+
+        Returns
+        -------
+            Iterator of LogEntry.
+
+        """
+        import csv
+
+        types = None if types is None else frozenset(types)
+        scopes = None if scopes is None else frozenset(scopes)
+        since = None if since is None else time_key(since)
+        until = None if until is None else time_key(until)
+
+        sep, columns, offset = self.header()
+        i_type = columns.index("message_type")
+        legacy = "time_ns" not in columns
+        i_time = columns.index("n_datetime" if legacy else "time_ns")
+        i_seq = columns.index("seq") if "seq" in columns else None
+        i_message = columns.index("message")
+        i_scope = columns.index("scope") if "scope" in columns else None
+        n_columns = len(columns)
+
+        # The formatted times of the old logs are parsed once per second.
+        last_text = None
+        time = 0
+        seq = 0
+
+        scope = self.scope
+        if scopes is not None and i_scope is None and scope not in scopes:
+            return
+
+        with self.__open(max(start, offset), end) as file:
+            lines = file if self.compression is None else _read_lines(file)
+            for row in csv.reader(lines, delimiter=sep):
+                if len(row) < n_columns:
+                    continue
+
+                message_type = row[i_type]
+                if types is not None and message_type not in types:
+                    continue
+
+                if i_scope is not None:
+                    scope = row[i_scope]
+                    if scopes is not None and scope not in scopes:
+                        continue
+
+                if legacy:
+                    text = row[i_time]
+                    if text != last_text:
+                        last_text = text
+                        time = time_key(text)
+                else:
+                    time = int(row[i_time])
+
+                if (
+                    (since is not None and time < since) or
+                    (until is not None and time > until)
+                ):
+                    continue
+
+                if i_seq is not None:
+                    seq = int(row[i_seq])
+
+                yield LogEntry(
+                    message_type, time, scope, row[i_message], seq
+                )
+
+    def split(self, n_chunks):
+        """
+        Split the file in byte ranges aligned on the record boundaries.
+
+        A boundary is the start of a line with a type of message and a time,
+        so the records with several lines are never split.
+
+        Parameters
+        ----------
+        n_chunks: Int.
+            Number of ranges, fewer if the file is small.
+
+        Returns
+        -------
+            List of tuples with the start and end offsets of each range.
+
+        """
+        import re
+
+        sep, columns, offset = self.header()
+        if self.compression is not None:
+            # The compressed files can not be split.
+            return [(offset, None)]
+
+        size = os.path.getsize(self.path)
+        sep_bytes = re.escape(sep.encode())
+        if columns[:3] == ["message_type", "time_ns", "seq"]:
+            time_pattern = rb"\d+" + sep_bytes + rb"\d+" + sep_bytes
+        elif columns[:2] == ["message_type", "n_datetime"]:
+            time_pattern = rb"\[\d\d/\d\d/\d{4} \d\d:\d\d:\d\d\]"
+        else:
+            return [(offset, size)]
+
+        record_start = re.compile(
+            rb"\n[A-Z][A-Z ]*" + sep_bytes + time_pattern
+        )
+
+        bounds = [offset]
+        with open(self.path, "rb") as file:
+            for i in range(1, n_chunks):
+                target = offset + (size - offset) * i // n_chunks
+                if target <= bounds[-1]:
+                    continue
+
+                position = _find_record(file, target - 1, record_start)
+                if position is None:
+                    break
+                if position > bounds[-1]:
+                    bounds.append(position)
+
+        bounds.append(size)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _read_lines(file):
+    """Iterate over the lines of a compressed file which may be unfinished."""
+    try:
+        yield from file
+    except EOFError:
+        # The end of the file is not flushed yet.
+        return
+
+
+class _RangeFile(io.RawIOBase):
+    """Raw file limited to a byte range."""
+
+    def __init__(self, path, start, end):
+        self._file = open(path, "rb", buffering=0)
+        self._file.seek(start)
+        self._left = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._left)
+        if size <= 0:
+            return 0
+
+        size = self._file.readinto(memoryview(buffer)[:size])
+        self._left -= size
+        return size
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _find_record(file, position, record_start, block_size=1 << 16):
+    """
+    Find the first record which starts after a position of a file.
+
+    Parameters
+    ----------
+    file: File.
+        Binary file.
+
+    position: Int.
+        Offset where the search starts.
+
+    record_start: Pattern.
+        Regular expression of a line break followed by a record.
+
+    block_size: Int. Default: 1 << 16.
+        Size of the reads.
+
+    Returns
+    -------
+        Int with the offset of the record, None if there is none.
+
+    """
+    # Blocks overlap so a match is never split between two of them.
+    overlap = 64
+    while True:
+        file.seek(position)
+        block = file.read(block_size)
+        match = record_start.search(block)
+        if match is not None:
+            return position + match.start() + 1
+
+        if len(block) < block_size:
+            return None
+
+        position += block_size - overlap
+
+
+class Renderer:
+    """Render the entries of the logs as the console of the messengers.
+
+    Parameters
+    ----------
+    layout: Str. Default: DEFAULT_LAYOUT.
+        Layout of the console lines.
+
+    plain: Bool. Default: False.
+        Lines without colors.
+
+    """
+    __slots__ = ("layout", "plain", "_templates")
+
+    def __init__(self, layout=DEFAULT_LAYOUT, plain=False):
+        self.layout = layout
+        self.plain = plain
+        self._templates = {}
+
+    def render(self, entry):
+        """
+        Return the console line of an entry.
+
+        Parameters
+        ----------
+        entry: LogEntry.
+            Entry to be rendered.
+
+        Returns
+        -------
+            String with the line.
+
+        """
+        key = (entry.message_type, entry.scope)
+        template = self._templates.get(key)
+        if template is None:
+            if self.plain:
+                color = reset = ""
+            else:
+                reset = colors.RESET
+                color = EXTRA_COLORS.get(entry.message_type, colors.RESET)
+                if entry.message_type in MESSAGE_TYPES:
+                    color = MESSAGE_TYPES[entry.message_type][1]
+
+            template = self._templates[key] = compile_layout(
+                self.layout, entry.message_type, entry.scope, " ", color,
+                reset
+            )
+
+        return template.format(format_time(entry.time), entry.message)
+
+
+def log_paths(paths):
+    """
+    Expand the directories of a list of logs.
+
+    Parameters
+    ----------
+    paths: Array.
+        Log files and directories, replaced by their `*.log` files sorted by
+        name (compressed or not). The merged logs and the ring buffer dumps of
+        the directories are skipped, as their messages are already in the
+        other logs.
+
+    Returns
+    -------
+        List of paths.
+
+    """
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.endswith(LOG_SUFFIXES) and ".merged.log" not in name
+                and ".crash.log" not in name
+            )
+        else:
+            expanded.append(path)
+
+    return expanded
+
+
+def _entry_key(entry):
+    return entry.time, entry.seq
+
+
+def merge_entries(readers, **filters):
+    """
+    Merge the entries of several logs by time.
+
+    The logs are streamed and merged with a heap, so only one entry of each
+    log is kept in memory. The entries are sorted by time and sequence
+    number, which orders exactly the messages written by one process. The
+    entries of the old logs with the same time keep the order of the readers
+    and the order inside each log.
+
+    Parameters
+    ----------
+    readers: Array.
+        LogReader of each log, sorted by time.
+
+    **filters:
+        Arguments passed to `LogReader.entries`.
+
+    Returns
+    -------
+        Iterator of LogEntry.
+
+    """
+    import heapq
+
+    return heapq.merge(
+        *(reader.entries(**filters) for reader in readers), key=_entry_key
+    )
+
+
+def write_log(entries, path, sep=";"):
+    """
+    Write log entries to a file with a `scope` column.
+
+    The file can be read again with `LogReader`.
+
+    Parameters
+    ----------
+    entries: Iterable.
+        LogEntry to be written.
+
+    path: Path, Str, File.
+        Output file, compressed if it ends in `.gz` or `.xz`, or an open text
+        stream.
+
+    sep: Str. Default: ";".
+        Separator of the values.
+
+    Returns
+    -------
+        Int with the number of entries written.
+
+    """
+    if hasattr(path, "write"):
+        return _write_entries(entries, path, sep)
+
+    compression = get_compression(path)
+    if compression is not None:
+        with io.TextIOWrapper(
+            open_compressed(path, "wb", compression), encoding="utf-8",
+            newline=""
+        ) as file:
+            return _write_entries(entries, file, sep)
+
+    with open(
+        path, "w", newline="", encoding="utf-8", buffering=CHUNK_SIZE
+    ) as file:
+        return _write_entries(entries, file, sep)
+
+
+def _write_entries(entries, file, sep):
+    file.write(format_row(SCOPED_LOG_HEADER, sep))
+
+    n_entries = 0
+    rows = []
+    for entry in entries:
+        rows.append(format_row((
+            entry.message_type, entry.time, entry.seq, entry.scope,
+            entry.message
+        ), sep))
+        if len(rows) >= WRITE_BATCH:
+            file.write("".join(rows))
+            n_entries += len(rows)
+            rows.clear()
+
+    if rows:
+        file.write("".join(rows))
+        n_entries += len(rows)
+
+    return n_entries
+
+
+def replay(entries, stream=None, layout=DEFAULT_LAYOUT, plain=None):
+    """
+    Write log entries to a stream as the console of the messengers.
+
+    The lines are written in batches, so long logs are replayed at the speed
+    of the disk.
+
+    Parameters
+    ----------
+    entries: Iterable.
+        LogEntry to be written.
+
+    stream: File. Default: None.
+        Output stream, `sys.stdout` if None.
+
+    layout: Str. Default: DEFAULT_LAYOUT.
+        Layout of the console lines.
+
+    plain: Bool. Default: None.
+        Lines without colors. If None, it is active when the stream is not a
+        terminal.
+
+    Returns
+    -------
+        Int with the number of entries written.
+
+    """
+    if stream is None:
+        stream = sys.stdout
+
+    if plain is None:
+        try:
+            plain = not stream.isatty()
+        except (AttributeError, ValueError):
+            plain = True
+
+    render = Renderer(layout, plain).render
+    n_entries = 0
+    lines = []
+    for entry in entries:
+        lines.append(render(entry))
+        if len(lines) >= WRITE_BATCH:
+            stream.write("\n".join(lines) + "\n")
+            n_entries += len(lines)
+            lines.clear()
+
+    if lines:
+        stream.write("\n".join(lines) + "\n")
+        n_entries += len(lines)
+
+    return n_entries
@@ -0,0 +1,163 @@
+"""Classes of the resource usage of the tasks."""
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows.
+    resource = None
+
+# Usage of the thread when the system gives it (Linux), of the process if not.
+RUSAGE_WHO = getattr(
+    resource, "RUSAGE_THREAD", getattr(resource, "RUSAGE_SELF", None)
+)
+
+# Bytes of the units of `ru_maxrss`: bytes in macOS, KiB elsewhere.
+MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# Current resident memory of the process, only in Linux.
+STATM_PATH = "/proc/self/statm"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _current_rss():
+    """Return the resident memory of the process in bytes, None if unknown."""
+    try:
+        with open(STATM_PATH, "rb") as file:
+            return int(file.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class ResourceUsage:
+    """Resources used by a task, or sampled at an instant.
+
+    Without the `resource` module (Windows) only the CPU time of the process
+    is known, and the rest of values are None.
+
+    Attributes
+    ----------
+    user: Float.
+        CPU time in user mode in seconds.
+
+    system: Float.
+        CPU time in system mode in seconds.
+
+    max_rss: Int.
+        Peak resident memory of the process in bytes.
+
+    rss: Int.
+        Resident memory of the process in bytes, its growth in a difference.
+
+    voluntary: Int.
+        Voluntary context switches, when waiting for a resource.
+
+    involuntary: Int.
+        Involuntary context switches, when preempted.
+
+    """
+    __slots__ = (
+        "user", "system", "max_rss", "rss", "voluntary", "involuntary"
+    )
+
+    def __init__(
+        self, user=0.0, system=0.0, max_rss=None, rss=None, voluntary=None,
+        involuntary=None
+    ):
+        self.user = user
+        self.system = system
+        self.max_rss = max_rss
+        self.rss = rss
+        self.voluntary = voluntary
+        self.involuntary = involuntary
+
+    def __repr__(self):
+        return f"ResourceUsage({self})"
+
+    def __str__(self):
+        parts = [
+            f"CPU {self.user * 1000:.3f}ms user, "
+            f"{self.system * 1000:.3f}ms system"
+        ]
+        if self.max_rss is not None:
+            parts.append(f"peak RSS {self.max_rss / 2 ** 20:.1f}MiB")
+        if self.rss is not None:
+            parts.append(f"RSS {self.rss / 2 ** 20:+.1f}MiB")
+        if self.voluntary is not None:
+            parts.append(
+                f"{self.voluntary}/{self.involuntary} context switches"
+            )
+        return ", ".join(parts)
+
+    def __sub__(self, other):
+        """Return the usage between two samples, `self` being the last."""
+        return ResourceUsage(
+            self.user - other.user, self.system - other.system,
+            self.max_rss, _sub(self.rss, other.rss),
+            _sub(self.voluntary, other.voluntary),
+            _sub(self.involuntary, other.involuntary)
+        )
+
+    @classmethod
+    def sample(cls):
+        """
+        Sample the resources used until now.
+
+        Returns
+        -------
+            ResourceUsage, of the current thread if the system gives it.
+
+        """
+        if resource is None:
+            return cls(time.process_time())
+
+        usage = resource.getrusage(RUSAGE_WHO)
+        return cls(
+            usage.ru_utime, usage.ru_stime, usage.ru_maxrss * MAXRSS_UNIT,
+            _current_rss(), usage.ru_nvcsw, usage.ru_nivcsw
+        )
+
+    def merge(self, other):
+        """
+        Add the usage of another task.
+
+        The times, the growth of the memory and the context switches are
+        summed, and the peak memory is the maximum.
+
+        Parameters
+        ----------
+        other: ResourceUsage.
+            Usage to be added.
+
+        Returns
+        -------
+            The usage itself.
+
+        """
+        self.user += other.user
+        self.system += other.system
+        self.max_rss = _max(self.max_rss, other.max_rss)
+        self.rss = _add(self.rss, other.rss)
+        self.voluntary = _add(self.voluntary, other.voluntary)
+        self.involuntary = _add(self.involuntary, other.involuntary)
+        return self
+
+
+def _sub(value, other):
+    """Subtract two optional values."""
+    return None if value is None or other is None else value - other
+
+
+def _add(value, other):
+    """Add two optional values."""
+    if value is None:
+        return other
+    return value if other is None else value + other
+
+
+def _max(value, other):
+    """Return the maximum of two optional values."""
+    if value is None:
+        return other
+    return value if other is None else max(value, other)
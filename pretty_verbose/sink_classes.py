@@ -0,0 +1,952 @@
+"""Classes of the outputs of the messages.
+
+A message is turned once into a `Record`, which is routed to the sinks whose
+level accepts it. The sinks can be shared by several messengers.
+
+"""
+import atexit
+import math
+import os
+import sys
+import time
+from _thread import allocate_lock
+from datetime import datetime
+from itertools import count
+
+from pretty_verbose.constants import colors
+
+# Header of the log files.
+LOG_HEADER = ("message_type", "time_ns", "seq", "message")
+
+# Header of the log files written before the epoch timestamps.
+LEGACY_LOG_HEADER = ("message_type", "n_datetime", "message")
+
+# Header of the logs with messages of several scopes.
+SCOPED_LOG_HEADER = ("message_type", "time_ns", "seq", "scope", "message")
+
+# Format of the times on the console.
+TIME_FORMAT = "[%d/%m/%Y %H:%M:%S]"
+
+# Sequence numbers of the records of the process.
+_SEQUENCE = count()
+
+# Last second formatted, and its text.
+_LAST_SECOND = (None, "")
+
+# Suffixes of the compressed log files.
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "xz": ".xz"}
+
+# Identifiers of the console streams whose last line ended in "\r".
+_CARRIAGE_RETURN = set()
+
+# Maximum number of log files kept open, the least recently used ones are
+# closed and reopened on their next write.
+MAX_OPEN_FILES = 64
+
+# Sinks with open files, from the least to the most recently used.
+_OPEN_SINKS = {}
+_OPEN_LOCK = allocate_lock()
+
+# Queue and thread shared by the sinks of the "async" mode.
+_ASYNC_QUEUE = None
+_ASYNC_THREAD = None
+
+# Records kept by default by the ring buffers.
+RING_CAPACITY = 5000
+
+# Ring buffers dumped by the exception hook.
+_RING_BUFFERS = None
+
+
+def get_compression(path):
+    """
+    Return the compression of a log file from its suffix.
+
+    Parameters
+    ----------
+    path: Path, Str.
+        Log file.
+
+    Returns
+    -------
+        Str with the compression ("gzip" or "xz"), None if not compressed.
+
+    """
+    path = os.fspath(path)
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def open_compressed(path, mode, compression):
+    """
+    Open a compressed file in binary mode.
+
+    Parameters
+    ----------
+    path: Path, Str.
+        File.
+
+    mode: Str.
+        Binary mode ("rb", "wb" or "ab").
+
+    compression: Str.
+        Compression of the file ("gzip" or "xz").
+
+    Returns
+    -------
+        File object.
+
+    """
+    if compression == "gzip":
+        import gzip
+        return gzip.open(path, mode)
+
+    if compression == "xz":
+        import lzma
+        return lzma.open(path, mode)
+
+    raise ValueError(
+        f"Unknown compression {compression!r}, use one of "
+        f"{tuple(COMPRESSION_SUFFIXES)}"
+    )
+
+
+def format_time(time_ns):
+    """
+    Format an epoch timestamp as the console does.
+
+    The text of the last second is cached, as many records share it.
+
+    Parameters
+    ----------
+    time_ns: Int.
+        Nanoseconds since the epoch.
+
+    Returns
+    -------
+        String with the time in `TIME_FORMAT`.
+
+    """
+    global _LAST_SECOND
+
+    second = time_ns // 1_000_000_000
+    last_second, text = _LAST_SECOND
+    if second != last_second:
+        text = datetime.fromtimestamp(second).strftime(TIME_FORMAT)
+        _LAST_SECOND = (second, text)
+
+    return text
+
+
+def format_row(values, sep=";"):
+    """
+    Format a row of a log file, as `csv.writer` does.
+
+    Parameters
+    ----------
+    values: Array.
+        Values of the row.
+
+    sep: Str. Default: ";".
+        Separator of the values.
+
+    Returns
+    -------
+        String with the row and the line terminator.
+
+    """
+    fields = []
+    for value in values:
+        value = f"{value}"
+        if sep in value or '"' in value or "\n" in value or "\r" in value:
+            value = '"' + value.replace('"', '""') + '"'
+        fields.append(value)
+
+    return sep.join(fields) + "\r\n"
+
+
+class Record:
+    """Message to be written by the sinks.
+
+    Attributes
+    ----------
+    message_type: Str.
+        Type of message.
+
+    min_level: Int.
+        Minimum level of verbose to write the message.
+
+    color: Color.
+        Color for the console text.
+
+    decorator: Str.
+        Decorator to initialize the message.
+
+    end: Str.
+        End of the line for the console.
+
+    time: Int.
+        Time of the message, in nanoseconds since the epoch.
+
+    scope: Str.
+        Scope of the messenger.
+
+    message: Str.
+        Message text.
+
+    source: VerboseMessages.
+        Messenger of the message, which renders the console lines.
+
+    seq: Int.
+        Sequence number of the record, increasing in the whole process, which
+        orders the records of the same time.
+
+    """
+    __slots__ = (
+        "message_type", "min_level", "color", "decorator", "end", "time",
+        "scope", "message", "source", "seq", "_row", "_row_sep"
+    )
+
+    def __init__(
+        self, message_type, min_level, color, decorator, end, time, scope,
+        message, source
+    ):
+        self.message_type = message_type
+        self.min_level = min_level
+        self.color = color
+        self.decorator = decorator
+        self.end = end
+        self.time = time
+        self.scope = scope
+        self.message = message
+        self.source = source
+        self.seq = next(_SEQUENCE)
+        self._row = None
+        self._row_sep = None
+
+    def row(self, sep=";"):
+        """
+        Return the row of the record for the log files.
+
+        The row is formatted once and shared by all the file sinks.
+
+        Parameters
+        ----------
+        sep: Str. Default: ";".
+            Separator of the values.
+
+        Returns
+        -------
+            String with the row.
+
+        """
+        if self._row is None or self._row_sep != sep:
+            self._row = format_row(
+                (self.message_type, self.time, self.seq, self.message), sep
+            )
+            self._row_sep = sep
+
+        return self._row
+
+    def legacy_row(self, sep=";"):
+        """
+        Return the row of the record for the log files with formatted times.
+
+        Parameters
+        ----------
+        sep: Str. Default: ";".
+            Separator of the values.
+
+        Returns
+        -------
+            String with the row.
+
+        """
+        return format_row(
+            (self.message_type, format_time(self.time), self.message), sep
+        )
+
+
+class Sink:
+    """Base class of the outputs of the messages.
+
+    Parameters
+    ----------
+    level: Int. Default: None.
+        Level of verbose of the sink, the one of the messenger if None.
+
+    Attributes
+    ----------
+    bytes_written: Int.
+        Characters written by the sink (bytes for ASCII messages).
+
+    """
+    __slots__ = ("level", "bytes_written", "_lock", "__weakref__")
+
+    # Whether the sink saves the messages or not, skipped with `skip_save`.
+    saves = False
+
+    def __init__(self, level=None):
+        self.level = level
+        self.bytes_written = 0
+        # The threading module is only imported by the sinks that use threads.
+        self._lock = allocate_lock()
+
+    def label(self):
+        """Return the name of the sink in the metrics."""
+        return type(self).__name__
+
+    def accepts(self, min_level, level):
+        """
+        Check if the sink writes the messages of a level.
+
+        Parameters
+        ----------
+        min_level: Int.
+            Minimum level of verbose of the message.
+
+        level: Int.
+            Level of verbose of the messenger.
+
+        """
+        return (level if self.level is None else self.level) >= min_level
+
+    def emit(self, record):
+        """
+        Write a record.
+
+        Parameters
+        ----------
+        record: Record.
+            Record to be written.
+
+        """
+        raise NotImplementedError
+
+    def emit_many(self, records):
+        """
+        Write several records.
+
+        Parameters
+        ----------
+        records: Array.
+            Records to be written.
+
+        """
+        for record in records:
+            self.emit(record)
+
+    def flush(self):
+        """Write the buffered records."""
+
+    def close(self):
+        """Write the buffered records and release the resources."""
+        self.flush()
+
+
+class ConsoleSink(Sink):
+    """Output of the messages to the console.
+
+    Parameters
+    ----------
+    stream: File. Default: None.
+        Console stream, `sys.stdout` if None.
+
+    plain: Bool. Default: None.
+        Print plain lines, without colors or progress lines ending in a
+        carriage return. If None, it is active when the stream is not a
+        terminal (a pipe, a file, the systemd journal...).
+
+    level: Int. Default: None.
+        Level of verbose of the sink, the one of the messenger if None.
+
+    """
+    __slots__ = ("_stream", "plain")
+
+    def __init__(self, stream=None, plain=None, level=None):
+        super().__init__(level)
+        self._stream = stream
+
+        if plain is None:
+            try:
+                plain = not self.stream.isatty()
+            except (AttributeError, ValueError):
+                plain = True
+
+        self.plain = plain
+
+    @property
+    def stream(self):
+        """Console stream."""
+        return sys.stdout if self._stream is None else self._stream
+
+    def label(self):
+        return "console"
+
+    def render(self, record):
+        """
+        Render the console line of a record with the template of its source.
+
+        Parameters
+        ----------
+        record: Record.
+            Record to be rendered.
+
+        Returns
+        -------
+            String with the line.
+
+        """
+        return record.source.get_template(
+            record.message_type, record.color, record.decorator, self.plain
+        ).format(format_time(record.time), record.message)
+
+    def emit(self, record):
+        # Plain consoles skip the progress lines.
+        if self.plain:
+            if record.end != "\r":
+                text = self.render(record) + record.end
+                self.bytes_written += len(text)
+                self.stream.write(text)
+            return
+
+        self.__write_line(self.render(record), record.end)
+
+    def emit_many(self, records):
+        if not records:
+            return
+
+        # Write all the lines at once.
+        text = "\n".join(self.render(record) for record in records)
+        if self.plain:
+            self.bytes_written += len(text) + 1
+            self.stream.write(text + "\n")
+        else:
+            self.__write_line(text, "\n")
+
+    def __write_line(self, text, end):
+        """
+        Write a line to the terminal.
+
+        The rest of the line is erased only when the previous line ended in a
+        carriage return, so it overwrites the whole progress line.
+
+        Parameters
+        ----------
+        text: Str.
+            Text of the line, or lines.
+
+        end: Str.
+            End of the line.
+
+        """
+        stream = self.stream
+        stream_id = id(stream)
+
+        if stream_id in _CARRIAGE_RETURN:
+            first_end = text.find("\n")
+            if first_end < 0:
+                text += colors.ERASE_LINE
+            else:
+                text = text[:first_end] + colors.ERASE_LINE + text[first_end:]
+
+            if end != "\r":
+                _CARRIAGE_RETURN.discard(stream_id)
+        elif end == "\r":
+            _CARRIAGE_RETURN.add(stream_id)
+
+        self.bytes_written += len(text) + len(end)
+        stream.write(text + end)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class FileSink(Sink):
+    """Output of the messages to a log file.
+
+    Parameters
+    ----------
+    path: Path, Str.
+        Log file.
+
+    sep: Str. Default: ";".
+        Separator of the log file.
+
+    level: Int. Default: None.
+        Level of verbose of the sink, the one of the messenger if None.
+
+    overwrite: Bool. Default: False.
+        Overwrite the log file.
+
+    mode: Str. Default: "sync".
+        Writing policy:
+        "sync": each message is appended opening and closing the file.
+        "buffered": the file is kept open and written in blocks.
+        "async": the file is written by a background thread, shared by all
+        the sinks.
+
+    fsync: Bool. Default: False.
+        Force the writes to disk, only with the "sync" mode.
+
+    buffer_size: Int. Default: 65536.
+        Size of the buffer of the "buffered" and "async" modes.
+
+    compression: Str. Default: None.
+        Compress the file with "gzip" or "xz", from the suffix of the path
+        (`.gz` or `.xz`) if None.
+
+    flush_interval: Float. Default: 1.0.
+        Seconds between the flushes of the compressor, so the data written
+        before the last flush can be read while the file is open. The
+        messages of errors are flushed at once. It applies to every mode, as
+        flushing each message would break the compression.
+
+    Notes
+    -----
+    The compressed files are written through a compressor kept open. The gzip
+    compressor is flushed with a sync flush, while the xz stream is finished
+    and a new one is appended, as concatenated streams are valid xz files.
+
+    At most `MAX_OPEN_FILES` files are kept open by all the sinks, the least
+    recently used ones are closed and reopened on their next write (a
+    compressed file gets a new stream appended).
+
+    """
+    __slots__ = (
+        "path", "sep", "mode", "fsync", "buffer_size", "compression",
+        "flush_interval", "_file", "_next_flush", "_legacy"
+    )
+
+    saves = True
+
+    MODES = ("sync", "buffered", "async")
+
+    def __init__(
+        self, path, sep=";", level=None, overwrite=False, mode="sync",
+        fsync=False, buffer_size=65536, compression=None, flush_interval=1.0
+    ):
+        super().__init__(level)
+
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode {mode!r}, use one of {self.MODES}")
+
+        self.path = os.fspath(path)
+        self.sep = sep
+        self.mode = mode
+        self.fsync = fsync
+        self.buffer_size = buffer_size
+        self.compression = compression or get_compression(self.path)
+        self.flush_interval = flush_interval
+        self._file = None
+        self._next_flush = 0.0
+        self._legacy = False
+
+        if overwrite or not os.path.exists(self.path):
+            header = format_row(LOG_HEADER, sep)
+            if self.compression is None:
+                with open(
+                    self.path, "w", newline="", encoding="utf-8"
+                ) as file:
+                    file.write(header)
+            else:
+                with open_compressed(
+                    self.path, "wb", self.compression
+                ) as file:
+                    file.write(header.encode("utf-8"))
+        else:
+            # Old logs keep their format, to be appended consistently.
+            self._legacy = self.__read_header() == format_row(
+                LEGACY_LOG_HEADER, sep
+            )
+
+    def __read_header(self):
+        """Read the header of the existing file."""
+        if self.compression is None:
+            with open(self.path, newline="", encoding="utf-8") as file:
+                return file.readline()
+
+        with open_compressed(self.path, "rb", self.compression) as file:
+            try:
+                return file.readline().decode("utf-8")
+            except EOFError:
+                return ""
+
+    def label(self):
+        return self.path
+
+    def __open(self):
+        """Open the file of the "buffered" and "async" modes, or touch it."""
+        if self._file is not None:
+            _touch_open_sink(self)
+            return
+
+        if self.compression is None:
+            self._file = open(
+                self.path, "a", buffering=self.buffer_size, newline="",
+                encoding="utf-8"
+            )
+        else:
+            self._file = open_compressed(self.path, "ab", self.compression)
+            self._next_flush = time.monotonic() + self.flush_interval
+        _register_open_sink(self)
+
+    def __close_file(self):
+        """Close the open file, with the lock of the sink held."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        _unregister_open_sink(self)
+
+    def _release_file(self):
+        """
+        Close the file if the sink is not writing, to reopen it later.
+
+        Returns
+        -------
+            Bool, whether the file was closed.
+
+        """
+        if not self._lock.acquire(False):
+            return False
+
+        try:
+            self.__close_file()
+        finally:
+            self._lock.release()
+        return True
+
+    def __write_compressed(self, text, urgent):
+        """
+        Write the rows to the compressor, flushing it if it is time.
+
+        Parameters
+        ----------
+        text: Str.
+            Rows to be written.
+
+        urgent: Bool.
+            Flush the compressor at once.
+
+        """
+        self.__open()
+        self._file.write(text.encode("utf-8"))
+
+        now = time.monotonic()
+        if urgent or now >= self._next_flush:
+            self.__flush_compressed()
+            self._next_flush = now + self.flush_interval
+
+    def __flush_compressed(self):
+        """Flush the compressor, so the written data can be read."""
+        if self._file is None:
+            return
+
+        if self.compression != "xz":
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            return
+
+        # Finish the stream, the next write appends a new one. The end of the
+        # stream is only written by the close, so the file is synced after.
+        self.__close_file()
+        if self.fsync:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def __write(self, text, urgent=False):
+        """
+        Write the rows to the file.
+
+        Parameters
+        ----------
+        text: Str.
+            Rows to be written.
+
+        urgent: Bool. Default: False.
+            Rows with errors, flushed at once by the compressed files.
+
+        """
+        self.bytes_written += len(text)
+
+        if self.compression is not None and self.mode != "async":
+            with self._lock:
+                self.__write_compressed(text, urgent)
+            return
+
+        if self.mode == "sync":
+            with open(self.path, "a", newline="", encoding="utf-8") as file:
+                file.write(text)
+                if self.fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            return
+
+        if self.mode == "buffered":
+            with self._lock:
+                self.__open()
+                self._file.write(text)
+            return
+
+        _async_queue().put((self, text, urgent))
+
+    def _write_queued(self, text, urgent):
+        """Write the rows taken from the queue, in the "async" mode."""
+        with self._lock:
+            if self.compression is not None:
+                self.__write_compressed(text, urgent)
+            else:
+                self.__open()
+                self._file.write(text)
+
+    def _flush_queued(self):
+        """Flush the file when the queue is empty, in the "async" mode."""
+        with self._lock:
+            if self.compression is None and self._file is not None:
+                self._file.flush()
+
+    def emit(self, record):
+        if self._legacy:
+            self.__write(record.legacy_row(self.sep), record.min_level <= 0)
+        else:
+            self.__write(record.row(self.sep), record.min_level <= 0)
+
+    def emit_many(self, records):
+        if not records:
+            return
+
+        if self._legacy:
+            rows = (record.legacy_row(self.sep) for record in records)
+        else:
+            rows = (record.row(self.sep) for record in records)
+        self.__write("".join(rows), records[0].min_level <= 0)
+
+    def flush(self):
+        if self.mode == "async":
+            if _ASYNC_QUEUE is not None:
+                if self.compression is not None:
+                    # Empty rows which force the flush of the compressor.
+                    _ASYNC_QUEUE.put((self, "", True))
+                _ASYNC_QUEUE.join()
+            return
+
+        with self._lock:
+            if self.compression is not None:
+                self.__flush_compressed()
+            elif self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        if self.mode == "async" and _ASYNC_QUEUE is not None:
+            # Write the queued rows of the sink.
+            _ASYNC_QUEUE.join()
+
+        with self._lock:
+            self.__close_file()
+
+
+class RingBufferSink(Sink):
+    """In-memory buffer with the last records of one or more messengers.
+
+    The records are kept regardless of the verbose level of the messengers,
+    and are dumped to a file on demand, when a messenger exits with an error
+    and when an exception is not handled.
+
+    Parameters
+    ----------
+    capacity: Int. Default: RING_CAPACITY.
+        Maximum number of records kept.
+
+    path: Path, Str. Default: "crash.log".
+        File in which dump the records.
+
+    sep: Str. Default: ";".
+        Separator of the dump file.
+
+    level: Int. Default: math.inf.
+        Level of verbose of the sink, every record by default.
+
+    """
+    __slots__ = ("records", "path", "sep")
+
+    def __init__(
+        self, capacity=RING_CAPACITY, path="crash.log", sep=";",
+        level=math.inf
+    ):
+        from collections import deque
+
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+        self.path = path
+        self.sep = sep
+
+        _install_excepthook()
+        _RING_BUFFERS.add(self)
+
+    def __len__(self):
+        return len(self.records)
+
+    def emit(self, record):
+        self.records.append((
+            record.message_type, record.time, record.seq, record.scope,
+            record.message
+        ))
+
+    def dump(self, path=None):
+        """
+        Write the records to a file, oldest first.
+
+        Parameters
+        ----------
+        path: Path, Str. Default: None.
+            File in which dump the records, the `path` of the buffer if None.
+
+        Returns
+        -------
+            Path of the file.
+
+        """
+        path = self.path if path is None else path
+
+        records = list(self.records)
+
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            file.write(format_row(SCOPED_LOG_HEADER, self.sep))
+            file.writelines(format_row(record, self.sep) for record in records)
+
+        return path
+
+    def clear(self):
+        """Remove all the records."""
+        self.records.clear()
+
+
+def _register_open_sink(sink):
+    """Add a sink with an open file, closing the idle ones above the cap."""
+    with _OPEN_LOCK:
+        _OPEN_SINKS.pop(sink, None)
+        _OPEN_SINKS[sink] = None
+        if len(_OPEN_SINKS) <= MAX_OPEN_FILES:
+            return
+        oldest = [other for other in _OPEN_SINKS if other is not sink]
+
+    # The locks of the sinks are not taken with the lock of the list held.
+    n_open = len(oldest) + 1
+    for other in oldest:
+        if n_open <= MAX_OPEN_FILES:
+            break
+        if other._release_file():
+            n_open -= 1
+
+
+def _touch_open_sink(sink):
+    """Mark a sink with an open file as the most recently used."""
+    with _OPEN_LOCK:
+        if sink in _OPEN_SINKS:
+            del _OPEN_SINKS[sink]
+            _OPEN_SINKS[sink] = None
+
+
+def _unregister_open_sink(sink):
+    """Remove a sink which closed its file."""
+    with _OPEN_LOCK:
+        _OPEN_SINKS.pop(sink, None)
+
+
+def _async_queue():
+    """Return the queue of the "async" sinks, starting their thread."""
+    global _ASYNC_QUEUE, _ASYNC_THREAD
+
+    with _OPEN_LOCK:
+        if _ASYNC_THREAD is None:
+            import queue
+            import threading
+
+            _ASYNC_QUEUE = queue.Queue()
+            _ASYNC_THREAD = threading.Thread(
+                target=_async_worker, name="FileSink writer", daemon=True
+            )
+            _ASYNC_THREAD.start()
+
+    return _ASYNC_QUEUE
+
+
+def _async_worker():
+    """Write the rows of the "async" sinks, flushing them when idle."""
+    pending = set()
+    while True:
+        sink, text, urgent = _ASYNC_QUEUE.get()
+        try:
+            sink._write_queued(text, urgent)
+            pending.add(sink)
+            if _ASYNC_QUEUE.empty():
+                for pending_sink in pending:
+                    pending_sink._flush_queued()
+                pending.clear()
+        except (OSError, ValueError) as exc:
+            sys.stderr.write(f"Could not write {sink.path}: {exc}\n")
+        finally:
+            _ASYNC_QUEUE.task_done()
+
+
+@atexit.register
+def close_all():
+    """Write the buffered records and close all the open sinks."""
+    if _ASYNC_QUEUE is not None:
+        _ASYNC_QUEUE.join()
+
+    with _OPEN_LOCK:
+        sinks = list(_OPEN_SINKS)
+    for sink in sinks:
+        sink.close()
+
+
+def _dump_all():
+    """Dump all the ring buffers with records."""
+    for ring in list(_RING_BUFFERS):
+        if ring.records:
+            try:
+                path = ring.dump()
+            except OSError as exc:
+                sys.stderr.write(f"Could not dump {ring.path}: {exc}\n")
+            else:
+                sys.stderr.write(f"Last records dumped to {path}\n")
+
+
+def _install_excepthook():
+    """Dump the ring buffers when an exception is not handled."""
+    global _RING_BUFFERS
+
+    if _RING_BUFFERS is None:
+        import weakref
+
+        _RING_BUFFERS = weakref.WeakSet()
+
+    if getattr(sys.excepthook, "_dumps_ring_buffers", False):
+        return
+
+    previous_hook = sys.excepthook
+
+    def excepthook(*exc_info):
+        _dump_all()
+        previous_hook(*exc_info)
+
+    excepthook._dumps_ring_buffers = True
+    sys.excepthook = excepthook
+
+    import threading
+
+    previous_thread_hook = threading.excepthook
+
+    def thread_excepthook(args):
+        if not issubclass(args.exc_type, SystemExit):
+            _dump_all()
+        previous_thread_hook(args)
+
+    threading.excepthook = thread_excepthook
@@ -0,0 +1,303 @@
+"""Classes to summarize the saved log files."""
+import os
+import re
+from datetime import datetime
+
+from pretty_verbose.reader_classes import LogReader
+
+# Numbers masked in the messages, so the messages which only differ in their
+# numbers are counted together.
+NUMBER_RE = re.compile(r"\d+")
+
+# Minimum size in bytes of the ranges of the files processed in parallel.
+MIN_CHUNK_SIZE = 1 << 24
+
+
+class LogSummary:
+    """Counters of the messages of the logs.
+
+    The summaries of several files, or of several ranges of a file, are
+    combined with `merge`.
+
+    Parameters
+    ----------
+    bucket: Int. Default: 3600.
+        Seconds of the time buckets of the error rate.
+
+    mask_numbers: Bool. Default: True.
+        Count together the messages which only differ in their numbers.
+
+    Attributes
+    ----------
+    counts: Dict.
+        Number of messages of each scope and type.
+
+    buckets: Dict.
+        Number of errors and messages of each time bucket, by the epoch
+        seconds of the start of the bucket.
+
+    messages: Dict.
+        Number of times each type and message is written.
+
+    """
+    __slots__ = ("bucket", "mask_numbers", "counts", "buckets", "messages")
+
+    def __init__(self, bucket=3600, mask_numbers=True):
+        self.bucket = bucket
+        self.mask_numbers = mask_numbers
+        self.counts = {}
+        self.buckets = {}
+        self.messages = {}
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def update(self, entries):
+        """
+        Count the messages of several entries.
+
+        Parameters
+        ----------
+        entries: Iterable.
+            LogEntry to be counted.
+
+        """
+        counts = self.counts
+        buckets = self.buckets
+        messages = self.messages
+        bucket = self.bucket
+        bucket_ns = bucket * 1_000_000_000
+        mask = NUMBER_RE.sub if self.mask_numbers else None
+
+        for entry in entries:
+            message_type = entry.message_type
+            key = (entry.scope, message_type)
+            counts[key] = counts.get(key, 0) + 1
+
+            start = entry.time // bucket_ns * bucket
+            errors = buckets.get(start)
+            if errors is None:
+                errors = buckets[start] = [0, 0]
+            errors[1] += 1
+            if message_type == "ERROR":
+                errors[0] += 1
+
+            message = entry.message
+            if mask is not None:
+                message = mask("#", message)
+            key = (message_type, message)
+            messages[key] = messages.get(key, 0) + 1
+
+    def merge(self, other):
+        """
+        Add the counters of another summary.
+
+        Parameters
+        ----------
+        other: LogSummary.
+            Summary with the same bucket.
+
+        Returns
+        -------
+            The summary itself.
+
+        """
+        for mine, theirs in (
+            (self.counts, other.counts), (self.messages, other.messages)
+        ):
+            for key, value in theirs.items():
+                mine[key] = mine.get(key, 0) + value
+
+        for start, (n_errors, n_messages) in other.buckets.items():
+            errors = self.buckets.setdefault(start, [0, 0])
+            errors[0] += n_errors
+            errors[1] += n_messages
+
+        return self
+
+    def by_type(self):
+        """Return the number of messages of each type."""
+        totals = {}
+        for (_, message_type), value in self.counts.items():
+            totals[message_type] = totals.get(message_type, 0) + value
+        return totals
+
+    def by_scope(self):
+        """Return the number of messages of each scope."""
+        totals = {}
+        for (scope, _), value in self.counts.items():
+            totals[scope] = totals.get(scope, 0) + value
+        return totals
+
+    def error_rates(self):
+        """
+        Return the error rate of each time bucket.
+
+        Returns
+        -------
+            List of tuples with the start of the bucket (datetime), the number
+            of errors, the number of messages and the error rate, in order.
+
+        """
+        return [
+            (
+                datetime.fromtimestamp(start), n_errors, n_messages,
+                n_errors / n_messages
+            )
+            for start, (n_errors, n_messages) in sorted(self.buckets.items())
+        ]
+
+    def most_frequent(self, top=10):
+        """
+        Return the most frequent messages.
+
+        Parameters
+        ----------
+        top: Int. Default: 10.
+            Number of messages.
+
+        Returns
+        -------
+            List of tuples with the type, the message and its count.
+
+        """
+        import heapq
+
+        return [
+            (message_type, message, value)
+            for (message_type, message), value in heapq.nlargest(
+                top, self.messages.items(), key=lambda item: item[1]
+            )
+        ]
+
+    def report(self, top=10):
+        """
+        Return the summary as text.
+
+        Parameters
+        ----------
+        top: Int. Default: 10.
+            Number of most frequent messages.
+
+        Returns
+        -------
+            String with the report.
+
+        """
+        lines = [f"Messages: {len(self)}", "", "Messages per scope and type:"]
+        lines.extend(
+            f"  {scope} {message_type}: {value}"
+            for (scope, message_type), value in sorted(self.counts.items())
+        )
+
+        lines.extend(("", f"Error rate per {self.bucket}s:"))
+        lines.extend(
+            f"  {start:[%d/%m/%Y %H:%M:%S]} {n_errors}/{n_messages} "
+            f"({rate:.2%})"
+            for start, n_errors, n_messages, rate in self.error_rates()
+        )
+
+        lines.extend(("", "Most frequent messages:"))
+        lines.extend(
+            f"  {value} [{message_type}] " + message.replace("\n", "\\n")
+            for message_type, message, value in self.most_frequent(top)
+        )
+
+        return "\n".join(lines)
+
+
+def _summarize_range(path, start, end, bucket, mask_numbers, filters, sep):
+    """Summarize a byte range of a file, in a worker process."""
+    summary = LogSummary(bucket, mask_numbers)
+    summary.update(
+        LogReader(path, sep=sep).entries(*filters, start=start, end=end)
+    )
+    return summary
+
+
+def summarize(
+    paths, bucket=3600, mask_numbers=True, types=None, scopes=None,
+    since=None, until=None, max_workers=None, min_chunk_size=MIN_CHUNK_SIZE,
+    sep=None
+):
+    """
+    Summarize saved log files in parallel.
+
+    The files are split in byte ranges aligned on the record boundaries,
+    which are summarized in a process pool and merged.
+
+    Parameters
+    ----------
+    paths: Array.
+        Log files.
+
+    bucket: Int. Default: 3600.
+        Seconds of the time buckets of the error rate.
+
+    mask_numbers: Bool. Default: True.
+        Count together the messages which only differ in their numbers.
+
+    types: Array. Default: None.
+        Types of message to keep, all of them if None.
+
+    scopes: Array. Default: None.
+        Scopes to keep, all of them if None.
+
+    since: Str, datetime. Default: None.
+        Keep the messages written at or after this time.
+
+    until: Str, datetime. Default: None.
+        Keep the messages written at or before this time.
+
+    max_workers: Int. Default: None.
+        Number of processes, the number of CPUs if None. With 1 the files are
+        summarized in the current process.
+
+    min_chunk_size: Int. Default: MIN_CHUNK_SIZE.
+        Minimum size in bytes of the ranges.
+
+    sep: Str. Default: None.
+        Separator of the values, detected from the header of each file if
+        None.
+
+    Returns
+    -------
+        LogSummary.
+
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    filters = (types, scopes, since, until)
+    jobs = []
+    for path in paths:
+        n_chunks = min(
+            max_workers, max(1, os.path.getsize(path) // min_chunk_size)
+        )
+        jobs.extend(
+            (path, start, end)
+            for start, end in LogReader(path, sep=sep).split(n_chunks)
+        )
+
+    summary = LogSummary(bucket, mask_numbers)
+    if max_workers == 1 or len(jobs) < 2:
+        for path, start, end in jobs:
+            summary.merge(_summarize_range(
+                path, start, end, bucket, mask_numbers, filters, sep
+            ))
+        return summary
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(min(max_workers, len(jobs))) as executor:
+        futures = [
+            executor.submit(
+                _summarize_range, path, start, end, bucket, mask_numbers,
+                filters, sep
+            )
+            for path, start, end in jobs
+        ]
+        for future in futures:
+            summary.merge(future.result())
+
+    return summary
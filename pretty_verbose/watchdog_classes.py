@@ -0,0 +1,201 @@
+"""Classes of the watchdog of the running tasks."""
+import heapq
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from itertools import count
+
+from pretty_verbose import processes_classes
+
+
+class Watchdog:
+    """Thread which warns about the tasks running over their deadline.
+
+    When the watchdog is started, every timer started afterwards with a
+    deadline (its own one or the default one) is pushed to a heap ordered by
+    deadline. The thread sleeps until the first deadline, so there is no work
+    while the tasks finish in time. A stopped timer drops its task from its
+    entry, and the heap is rebuilt without the dropped entries when they are
+    most of it, so the heap only grows with the running timers.
+
+    Parameters
+    ----------
+    default_deadline: Float. Default: None.
+        Seconds a task can run when it has no deadline of its own, the tasks
+        without deadline are not watched if None.
+
+    stack: Bool. Default: False.
+        Add to the warning the stack of the thread which started the timer.
+
+    Attributes
+    ----------
+    late: Int.
+        Number of late tasks found.
+
+    """
+    __slots__ = (
+        "default_deadline", "stack", "late", "_heap", "_entries", "_dropped",
+        "_condition", "_thread", "_order"
+    )
+
+    # Dropped entries kept in the heap before rebuilding it.
+    MIN_DROPPED = 1024
+
+    def __init__(self, default_deadline=None, stack=False):
+        self.default_deadline = default_deadline
+        self.stack = stack
+        self.late = 0
+        self._heap = []
+        self._entries = {}
+        self._dropped = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._order = count()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """
+        Start watching the timers started from now on.
+
+        Returns
+        -------
+            The watchdog itself.
+
+        """
+        with self._condition:
+            if self._thread is not None:
+                return self
+
+            self._thread = threading.Thread(
+                target=self.__run, name="Watchdog", daemon=True
+            )
+            self._thread.start()
+
+        processes_classes._WATCHDOG = self
+        return self
+
+    def stop(self):
+        """Stop the thread and forget the watched timers."""
+        if processes_classes._WATCHDOG is self:
+            processes_classes._WATCHDOG = None
+
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._heap.clear()
+            self._entries.clear()
+            self._dropped = 0
+            self._condition.notify()
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def watch(self, task):
+        """
+        Watch the running timer of a task.
+
+        Parameters
+        ----------
+        task: Task.
+            Task whose timer has just been started.
+
+        """
+        deadline = task.deadline()
+        if deadline is None:
+            deadline = self.default_deadline
+        if deadline is None:
+            return
+
+        # The entries are lists, so the task can be dropped when it stops.
+        entry = [
+            time.monotonic() + deadline, next(self._order), task,
+            task.timer.ti, deadline, threading.get_ident()
+        ]
+        with self._condition:
+            if self._thread is None:
+                return
+
+            self.__drop(task)
+            self._entries[task] = entry
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._condition.notify()
+
+    def unwatch(self, task):
+        """
+        Stop watching the timer of a task.
+
+        Parameters
+        ----------
+        task: Task.
+            Task whose timer has just been stopped.
+
+        """
+        with self._condition:
+            self.__drop(task)
+
+            heap = self._heap
+            if self._dropped > max(self.MIN_DROPPED, len(heap) // 2):
+                heap[:] = [entry for entry in heap if entry[2] is not None]
+                heapq.heapify(heap)
+                self._dropped = 0
+
+    def __drop(self, task):
+        """Drop the task from its entry, with the lock held."""
+        entry = self._entries.pop(task, None)
+        if entry is not None:
+            entry[2] = None
+            self._dropped += 1
+
+    def __run(self):
+        """Wait for the deadlines and warn about the late tasks."""
+        thread = threading.current_thread()
+        while True:
+            with self._condition:
+                while True:
+                    if self._thread is not thread:
+                        return
+
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            entry = heapq.heappop(self._heap)
+                            if entry[2] is None:
+                                self._dropped -= 1
+                                continue
+                            self._entries.pop(entry[2], None)
+                            break
+                    else:
+                        wait = None
+                    self._condition.wait(wait)
+
+            # The messages are written without holding the lock.
+            self.__check(*entry[2:])
+
+    def __check(self, task, started, deadline, thread_id):
+        """Warn if the timer is still running."""
+        timer = task._timer
+        if timer is None or not timer.on or timer.ti is not started:
+            return
+
+        self.late += 1
+        lap = (datetime.now() - started).total_seconds() * 1000
+        message = (
+            f"Task running for {lap}ms, over its deadline of {deadline}s"
+        )
+
+        if self.stack:
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                message += "\n" + "".join(
+                    traceback.format_stack(frame)
+                ).rstrip("\n")
+            del frame
+
+        task.warning(message)
@@ -0,0 +1,68 @@
+import io
+import logging
+
+from pretty_verbose import Process, VerboseHandler
+from pretty_verbose.handler_classes import capture_logging
+from pretty_verbose.sink_classes import FileSink
+
+
+class CountingFormatter(logging.Formatter):
+    """Formatter that counts the formatted records."""
+
+    def __init__(self):
+        super().__init__("%(name)s: %(message)s")
+        self.count = 0
+
+    def format(self, record):
+        self.count += 1
+        return super().format(record)
+
+
+def test_handler(tmp_path):
+    """Test the logging records written by a process."""
+    stream = io.StringIO()
+    debug = FileSink(tmp_path / "debug.log", level=4)
+    process = Process(
+        2, "main", log_dir=str(tmp_path), stream=stream, sinks=[debug]
+    )
+    task = process.new_task("deps")
+
+    logger = logging.getLogger("deps.test")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = capture_logging(task, logger)
+    formatter = CountingFormatter()
+    handler.setFormatter(formatter)
+
+    try:
+        logger.debug("debug %s", 1)
+        logger.info("info %s", 2)
+        logger.warning("warning %s", 3)
+        logger.critical("critical %s", 4)
+    finally:
+        logger.removeHandler(handler)
+
+    output = stream.getvalue()
+    assert "[WARNING] [main:deps]: deps.test: warning 3" in output
+    assert "[ERROR] [main:deps]: deps.test: critical 4" in output
+    assert "info 2" not in output
+
+    # The shared debug sink receives every record, each formatted once.
+    assert formatter.count == 4
+    assert "deps.test: debug 1" in (tmp_path / "debug.log").read_text()
+
+
+def test_handler_rejects_early(tmp_path):
+    """Test the discarded records are never formatted."""
+    process = Process(1, "main", log_dir=str(tmp_path), stream=io.StringIO())
+    handler = VerboseHandler(process)
+    formatter = CountingFormatter()
+    handler.setFormatter(formatter)
+
+    record = logging.LogRecord("x", logging.INFO, "", 0, "info", (), None)
+    assert not handler.handle(record)
+    assert formatter.count == 0
+
+    record = logging.LogRecord("x", logging.ERROR, "", 0, "error", (), None)
+    handler.handle(record)
+    assert formatter.count == 1
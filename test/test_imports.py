@@ -0,0 +1,32 @@
+"""Test the import cost of the package."""
+import subprocess
+import sys
+
+
+def loaded_modules(code):
+    """Run the code in a fresh interpreter and return the loaded modules."""
+    proc = subprocess.run(
+        [sys.executable, "-c", f"{code}; import sys; print(*sys.modules)"],
+        stdout=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    return set(proc.stdout.split())
+
+
+def test_lazy_imports():
+    """Test the heavy modules are not imported with the package."""
+    modules = loaded_modules("import pretty_verbose")
+    for name in (
+        "readline", "csv", "re", "dataclasses", "pathlib", "logging"
+    ):
+        assert name not in modules
+    assert "pretty_verbose.logger_classes" not in modules
+    assert "pretty_verbose.prompts" not in modules
+    assert "pretty_verbose.handler_classes" not in modules
+    assert "pretty_verbose.watchdog_classes" not in modules
+
+
+def test_lazy_logger():
+    """Test the logger is imported on first access."""
+    modules = loaded_modules("from pretty_verbose import Logger")
+    assert "pretty_verbose.logger_classes" in modules
+    assert "readline" not in modules
@@ -0,0 +1,48 @@
+"""Test the Logger input history."""
+import builtins
+import io
+
+import pytest
+
+from pretty_verbose import Logger
+
+readline = pytest.importorskip("readline")
+
+
+def test_history(tmp_path, monkeypatch):
+    """Test the incremental and capped history of the inputs."""
+    responses = iter(f"command {i}" for i in range(20))
+
+    def fake_input(prompt=""):
+        response = next(responses)
+        readline.add_history(response)
+        return response
+
+    monkeypatch.setattr(builtins, "input", fake_input)
+    history = tmp_path / ".history"
+    history.write_text("old command\n")
+
+    # The entries already in memory are kept.
+    readline.clear_history()
+    readline.add_history("interpreter command")
+
+    logger = Logger(
+        3, "Main", str(tmp_path), history_length=4, stream=io.StringIO()
+    )
+    assert logger.input("First") == "command 0"
+    assert readline.get_history_item(1) == "interpreter command"
+    assert readline.get_history_item(2) == "old command"
+
+    # The file is appended past the cap until it doubles it, then rewritten
+    # with the last entries.
+    sizes = []
+    for _ in range(19):
+        logger.input("Next")
+        sizes.append(len(history.read_text().splitlines()))
+    assert sizes[:7] == [3, 4, 5, 6, 7, 8, 4]
+    assert max(sizes) == 8
+
+    lines = history.read_text().splitlines()
+    assert len(lines) <= 8
+    assert lines[-4:] == [f"command {i}" for i in range(16, 20)]
+    assert readline.get_current_history_length() == 4
@@ -1,7 +1,9 @@
 """Test the messages printing."""
+import io
 import time
 
 from pretty_verbose import VerboseMessages
+from pretty_verbose.constants import colors
 
 messages = VerboseMessages(
     level=3,
@@ -50,3 +52,61 @@ def test_multiple_messages():
     messages.debug("This ", "is ", "a ", "debug ", "message.")
     messages.debug("Trying numbers", 0, 1, 0.1)
     messages.debug("Trying lists", ["A", 0, 1.5])
+
+
+def test_batch_messages():
+    """Test printing several messages at once."""
+    messages.batch("info", (f"Item {i} done." for i in range(10)))
+    messages.batch("DEBUG", [("Trying numbers", 0, 1, 0.1)], same_time=False)
+
+
+def test_layout():
+    """Test the compiled templates of a custom layout."""
+    custom = VerboseMessages(
+        level=3, name="layout", no_save=True,
+        layout="{time} {type} {scope}: {message}"
+    )
+    template = custom.get_template("INFO", colors.BLUE)
+
+    assert template.endswith(" INFO layout: {1}")
+    assert custom.get_template("INFO", colors.BLUE) is template
+
+    custom.name = custom.scope = "renamed"
+    assert custom.get_template("INFO", colors.BLUE).endswith("renamed: {1}")
+    custom.info("Message with {braces}.")
+
+
+def test_plain_console():
+    """Test the plain output when the console is not a terminal."""
+    stream = io.StringIO()
+    plain = VerboseMessages(level=3, name="plain", no_save=True, stream=stream)
+
+    for i in range(10):
+        plain.progress("Plain progress.", (i+1)*10)
+    plain.info("Plain message.")
+
+    assert plain.is_plain()
+    assert "\r" not in stream.getvalue() and "\033" not in stream.getvalue()
+    assert stream.getvalue().count("\n") == 2
+
+    colored = VerboseMessages(
+        level=3, name="colored", no_save=True, stream=stream, plain=False
+    )
+    colored.info("Colored message.")
+    assert colors.BLUE in stream.getvalue()
+
+
+def test_erase_line():
+    """Test the lines after a progress line erase the rest of the line."""
+    stream = io.StringIO()
+    terminal = VerboseMessages(
+        level=3, name="erase", no_save=True, stream=stream, plain=False
+    )
+
+    terminal.info("First message.")
+    terminal.progress("Progress.", 50)
+    terminal.info("Second message.")
+    lines = stream.getvalue().split("\r")
+
+    assert not lines[0].endswith(" \n") and colors.ERASE_LINE not in lines[0]
+    assert lines[1].endswith(colors.ERASE_LINE + "\n")
@@ -0,0 +1,130 @@
+import io
+
+from pretty_verbose import Process, VerboseMessages
+from pretty_verbose.metrics_classes import (LatencyHistogram, LogMetrics,
+                                            RateCounter)
+
+
+def test_latency_histogram():
+    """Test the buckets of the latency histogram."""
+    histogram = LatencyHistogram()
+    for duration in (1, 3, 900, 1000):
+        histogram.add(duration)
+
+    assert histogram.count == 4
+    assert histogram.total == 1904
+    assert histogram.quantile(0.5) == 4
+    assert histogram.quantile(1) == 1024
+
+
+def test_metrics_counts(tmp_path):
+    """Test the counters of emitted and suppressed messages."""
+    messenger = VerboseMessages(
+        level=2, log_dir=str(tmp_path), stream=io.StringIO(), metrics=True
+    )
+    messenger.error("error")
+    messenger.success("success")
+    messenger.info("info")
+    messenger.debug("debug")
+    messenger.batch("WARNING", ["a", "b", "c"])
+
+    metrics = messenger.metrics()
+    assert metrics.emitted == {"ERROR": 1, "SUCCESS": 1, "WARNING": 3}
+    assert metrics.suppressed == {"INFO": 1, "DEBUG": 1}
+    assert metrics.latency["format"].count == 3
+    assert "5 emitted, 2 suppressed" in messenger.metrics_summary()
+
+    # The console counts the written bytes.
+    written = len(messenger.console().getvalue().encode())
+    assert messenger.console_sink().bytes_written == written
+
+    path = messenger.write_metrics(tmp_path / "metrics.prom")
+    text = path.read_text()
+    assert 'pretty_verbose_records_emitted_total{type="WARNING"} 3' in text
+    assert 'pretty_verbose_sink_bytes_total{sink="console"}' in text
+    assert 'pretty_verbose_log_latency_seconds_count{stage="file"} 3' in text
+
+
+def test_shared_metrics(tmp_path):
+    """Test that the tasks of a process share its metrics."""
+    metrics = LogMetrics()
+    process = Process(
+        3, "main", log_dir=str(tmp_path), stream=io.StringIO(),
+        metrics=metrics
+    )
+    task = process.new_task("task")
+    task.info("task message")
+    process.info("process message")
+
+    assert task.metrics() is metrics
+    assert metrics.emitted == {"INFO": 2}
+
+
+def test_summary_interval(tmp_path):
+    """Test the periodic summary line."""
+    stream = io.StringIO()
+    messenger = VerboseMessages(
+        level=3, log_dir=str(tmp_path), stream=stream,
+        metrics=LogMetrics(summary_interval=0)
+    )
+    messenger.success("done")
+
+    assert "Log metrics: 1 emitted" in stream.getvalue()
+
+
+def test_rate_counter(monkeypatch):
+    """Test the exponentially weighted rates of the counters."""
+    from pretty_verbose import metrics_classes
+
+    now = [100.0]
+    monkeypatch.setattr(metrics_classes.time, "monotonic", lambda: now[0])
+
+    counter = RateCounter(windows=(1, 60))
+    for _ in range(8):
+        now[0] += 0.125
+        counter.add(10)
+    # The first tick sets the rates.
+    assert counter.total == 80
+    assert counter.rates == [80.0, 80.0]
+
+    # Idle for a second, the short window decays faster.
+    now[0] += 1
+    rates = counter.snapshot()["rates"]
+    assert rates[1] < 80 * 0.37
+    assert 78 < rates[60] < 80
+    assert counter.snapshot()["mean"] == 40
+
+
+def test_task_throughput(tmp_path):
+    """Test the counters of the tasks and their roll-up in the process."""
+    stream = io.StringIO()
+    process = Process(3, "pipeline", log_dir=tmp_path, stream=stream)
+    parse = process.new_task("parse")
+    load = process.new_subprocess("load").new_task("rows")
+
+    rows = parse.counter("rows")
+    for _ in range(1000):
+        rows.add()
+    load.count(500, name="rows")
+    load.count(name="files")
+
+    assert parse.throughput()["rows"]["total"] == 1000
+    assert process.throughput(recursive=False) == {}
+    throughput = process.throughput()
+    assert throughput["rows"]["total"] == 1500
+    assert throughput["files"]["total"] == 1
+
+    process.print_throughput()
+    assert "Throughput of rows: 1500 items" in stream.getvalue()
+
+    # The totals of the released tasks are kept.
+    process.release("pipeline.load")
+    process.release(parse.name)
+    throughput = process.throughput()
+    assert throughput["rows"]["total"] == 1500
+    assert throughput["files"]["total"] == 1
+    assert process.stats()["load"].counters is None
+    assert process.stats()["rows"].counters == {"rows": 500, "files": 1}
+
+    process.print_throughput()
+    assert "Throughput of files: 1 items, mean 0.0/s" in stream.getvalue()
@@ -2,7 +2,9 @@
 import time
 from random import random
 
-from pretty_verbose import Process
+import pytest
+
+from pretty_verbose import Process, Task
 
 process = Process(3, "test", log_file="messages.log")
 
@@ -86,3 +88,373 @@ def test_subprocess():
     sp1.stop_timer()
     ssp1.stop_timer()
     tsk1.stop_timer()
+
+
+def test_compact_tasks():
+    """Test the tasks share the configuration and have no dictionary."""
+    tsk: Task = process.new_task("Compact")
+
+    assert tsk.output_conf() is process.output_conf()
+    assert not hasattr(tsk, "__dict__")
+    assert tsk.timer["on"] is False
+
+
+def test_registry():
+    """Test the lookup, iteration and removal of the tree registry."""
+    root = Process(3, "reg", no_save=True)
+    sub = root.new_subprocess("Sub")
+    ssub = sub.new_subprocess("SubSub")
+    tsk = ssub.new_task("Task")
+
+    assert root.get_node("reg.Sub.SubSub:Task") is tsk
+    assert sub.get_node("reg.Sub.SubSub") is ssub
+    assert {path for path, _ in root.iter_subtree("reg.Sub")} == {
+        "reg.Sub", "reg.Sub.SubSub", "reg.Sub.SubSub:Task"
+    }
+
+    assert root.remove_node("reg.Sub.SubSub") is ssub
+    assert root.get_node("reg.Sub.SubSub:Task") is None
+    assert not sub.has_subprocess(ssub)
+    assert [path for path, _ in root.iter_subtree()] == ["reg", "reg.Sub"]
+
+
+def test_graft_subtree():
+    """Test that an added process brings its descendants to the registry."""
+    root = Process(-1, "root", no_save=True)
+    other = Process(-1, "other", no_save=True)
+    task = other.new_task("t")
+    sub_task = other.new_subprocess("sub").new_task("s")
+
+    root.add_subprocess(other)
+
+    assert other._registry is root._registry
+    assert other.get_depth() == 1
+    assert set(root._registry) == {
+        "root", "root.other", "root.other:t", "root.other.sub",
+        "root.other.sub:s"
+    }
+    assert root.get_node("root.other:t") is task
+    assert sub_task.scope == "root.other.sub:s"
+    assert list(other.tasks) == ["root.other:t"]
+
+    # The children created later are in the same registry.
+    later = other.new_task("later")
+    assert root.get_node("root.other:later") is later
+
+
+def work(size):
+    """Function with some CPU work for the parallel tests."""
+    if size < 0:
+        raise ValueError("Negative size")
+    return sum(i * i for i in range(size))
+
+
+def test_exec_parallel():
+    """Test the parallel execution of functions in tasks."""
+    results, errors = process.exec_parallel(
+        work, work, work, args=[(1000,), (-1,), (10,)], print_timer=True
+    )
+
+    assert results == [work(1000), None, work(10)]
+    assert errors[0] is None and isinstance(errors[1], ValueError)
+    assert process.get_node("test:parallel_0").total_time() is not None
+
+    # The tasks of a new call do not replace the previous ones.
+    first_task = process.get_node("test:parallel_0")
+    process.exec_parallel(work, args=[(10,)])
+    assert process.get_node("test:parallel_0") is first_task
+    assert process.get_node("test:parallel_3").total_time() is not None
+
+    # Every function needs its arguments.
+    n_tasks = len(process.tasks)
+    with pytest.raises(SystemExit):
+        process.exec_parallel(work, work, args=[(10,)])
+    assert len(process.tasks) == n_tasks
+
+    results, _ = process.exec_parallel(
+        work, work, args=[(100,), (200,)], executor="process",
+        task_name="process"
+    )
+    assert results == [work(100), work(200)]
+
+
+def test_exec_many_time():
+    """Test the sequential execution of functions."""
+    tsk: Task = process.new_task("Many")
+    assert tsk.exec_many_time(work, work, args=[(10,), (20,)]) is not None
+
+
+def test_ring_buffer(tmp_path):
+    """Test the in-memory buffer of records and its dumps."""
+    ring_process = Process(
+        0, "ring", log_dir=tmp_path, no_save=True, ring_buffer=3
+    )
+    tsk = ring_process.new_task("Task")
+    assert tsk.ring_buffer() is ring_process.ring_buffer()
+
+    ring_process.debug("First debug message.")
+    ring_process.info("Info message.")
+    tsk.debug("Task debug message.")
+    tsk.warning("Task warning message.")
+
+    with open(ring_process.dump_ring(), encoding="utf-8") as file:
+        lines = file.read().splitlines()
+
+    assert lines[0] == "message_type;time_ns;seq;scope;message"
+    assert [line.split(";")[0] for line in lines[1:]] == [
+        "INFO", "DEBUG", "WARNING"
+    ]
+    assert lines[-1].endswith(";ring:Task;Task warning message.")
+
+    with pytest.raises(SystemExit):
+        tsk.error("Fatal error.", err_id=2)
+    assert (tmp_path / "ring.crash.log").read_text().count("Fatal error") == 1
+
+    # With True the buffer has the default capacity.
+    from pretty_verbose.sink_classes import RING_CAPACITY
+
+    default = Process(0, "default", no_save=True, ring_buffer=True)
+    assert default.ring_buffer().records.maxlen == RING_CAPACITY
+    default.info("Info message.")
+    assert len(default.ring_buffer()) == 1
+
+    with pytest.raises(TypeError):
+        Process(0, "invalid", no_save=True, ring_buffer="3")
+
+
+def test_release_done():
+    """Test that the finished tasks are released and their timing kept."""
+    process = Process(-1, "released", release_done=True, no_save=True)
+    sub = process.new_subprocess("sub")
+
+    for i in range(5):
+        task = sub.new_task(f"request_{i}", timer=True)
+        task.task_done()
+
+    running = sub.new_task("running", timer=True)
+
+    assert list(sub.tasks) == ["released.sub:running"]
+    assert process.get_node("released.sub:request_0") is None
+    assert sub.stats()["request_#"].count == 5
+    assert process.stats()["request_#"].count == 5
+    assert process.stats(recursive=False) == {}
+
+    running.task_done()
+    assert sub.tasks == {}
+
+    # The tasks which were not timed do not count in the durations.
+    process.release(process.new_task("untimed").name)
+    stats = process.stats()["untimed"]
+    assert (stats.count, stats.timed, stats.mean()) == (1, 0, None)
+    assert "min=n/a" in repr(stats)
+
+
+def test_max_children():
+    """Test that the oldest finished children are released above the cap."""
+    process = Process(-1, "capped", max_children=3, no_save=True)
+
+    first = process.new_task("first", timer=True)
+    for i in range(5):
+        process.new_task(f"task_{i}", timer=True).task_done()
+
+    assert len(process.tasks) == 3
+    assert "capped:first" in process.tasks
+    assert process.stats()["task_#"].count == 3
+
+    # With all the children running, the oldest one is released.
+    for i in range(3):
+        process.new_task(f"busy_{i}", timer=True)
+    assert "capped:first" not in process.tasks
+    assert process.stats()["first"].count == 1
+    assert process.stats()["first"].timed == 0
+    assert len(process.tasks) == 3
+
+    # The parallel tasks are released once they have run, with their timing.
+    parallel = Process(-1, "parallel", max_children=2, no_save=True)
+    parallel.exec_parallel(work, work, work, work, args=[(10000,)] * 4)
+    assert list(parallel.tasks) == [
+        "parallel:parallel_2", "parallel:parallel_3"
+    ]
+    assert all(task.timer.diff is not None for task in parallel.tasks.values())
+    assert parallel.stats()["parallel_#"].count == 2
+    assert parallel.stats()["parallel_#"].timed == 2
+    assert parallel.stats()["parallel_#"].total > 0
+
+    # A task which is not started yet is not finished.
+    idle = Process(-1, "idle", max_children=2, no_save=True)
+    idle.new_task("waiting")
+    idle.new_task("done", timer=True).task_done()
+    idle.new_task("next")
+    assert list(idle.tasks) == ["idle:waiting", "idle:next"]
+
+
+def test_release_memory_soak(tmp_path):
+    """Test that a process creating a task per request does not grow."""
+    import gc
+    import tracemalloc
+
+    process = Process(
+        -1, "soak", log_dir=tmp_path, release_done=True, max_children=100
+    )
+
+    def serve(n_requests):
+        for i in range(n_requests):
+            task = process.new_task(f"request_{i}", timer=True)
+            task.debug("Serving")
+            task.task_done()
+
+    tracemalloc.start()
+    try:
+        serve(2000)
+        gc.collect()
+        warm, _ = tracemalloc.get_traced_memory()
+        serve(10000)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(process.tasks) == 0
+    assert len(process._registry) == 1
+    assert process.stats()["request_#"].count == 12000
+    assert current - warm < 64 * 1024
+
+
+def test_resource_usage(monkeypatch):
+    """Test the sampling of the resources used by the tasks."""
+    from pretty_verbose import resource_classes
+
+    process = Process(-1, "resources", resources=True, no_save=True)
+    sub = process.new_subprocess("sub", release_done=True)
+
+    task = process.new_task("task", timer=True)
+    busy = time.thread_time() + 0.05
+    while time.thread_time() < busy:
+        pass
+    task.task_done()
+
+    usage = task.usage()
+    assert usage.user + usage.system > 0
+    assert usage.max_rss > 0
+    assert usage.voluntary >= 0 and usage.involuntary >= 0
+
+    # The released tasks keep their usage in the stats.
+    for i in range(3):
+        sub.new_task(f"released_{i}", timer=True).task_done()
+    assert sub.stats()["released_#"].usage is not None
+
+    total = process.usage(recursive=True)
+    assert total.user >= usage.user
+    assert total.max_rss >= usage.max_rss
+    assert process.usage() is None
+
+    # Not sampled by default.
+    assert Process(-1, "plain", no_save=True).new_task(
+        "task", timer=True
+    ).usage() is None
+
+    # Only the CPU time is known without the resource module.
+    monkeypatch.setattr(resource_classes, "resource", None)
+    sample = resource_classes.ResourceUsage.sample()
+    assert sample.user > 0 and sample.max_rss is None
+    assert "context switches" not in str(sample - sample)
+
+
+def test_allocation_tracking():
+    """Test the memory allocated while the timers run."""
+    import tracemalloc
+
+    process = Process(-1, "allocations", allocations=True, no_save=True)
+    outer = process.new_task("outer")
+    inner = process.new_task("inner")
+    kept = []
+
+    def allocate():
+        kept.append([bytearray(1000) for _ in range(1000)])
+        temporary = bytearray(4 * 2 ** 20)
+        del temporary
+
+    outer.start_timer()
+    assert tracemalloc.is_tracing()
+    inner.exec_time(allocate)
+    # The trace runs while a tracked timer is running.
+    assert tracemalloc.is_tracing()
+    outer.task_done()
+    assert not tracemalloc.is_tracing()
+
+    for task in (inner, outer):
+        allocations = task.allocations()
+        assert allocations.net > 10 ** 6
+        assert allocations.peak > 4 * 2 ** 20
+    assert __file__ in inner.allocations().sites[0][0]
+
+    # A failed run stops the trace.
+    with pytest.raises(ZeroDivisionError):
+        inner.exec_time(lambda: 1 / 0)
+    assert not tracemalloc.is_tracing()
+
+    # A trace started by someone else is kept.
+    tracemalloc.start()
+    try:
+        inner.reset_timer()
+        inner.exec_time(allocate)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    # Untracked runs.
+    inner.reset_timer()
+    inner.exec_time(allocate, allocations=False)
+    assert inner.allocations() is None
+
+
+def test_profile(tmp_path):
+    """Test the profile stats of the tasks and their merge in the process."""
+    import io
+    import pstats
+
+    def slow_step(n):
+        return sum(i * i for i in range(n))
+
+    stream = io.StringIO()
+    process = Process(3, "profiled", log_dir=tmp_path, stream=stream)
+    task = process.new_task("task")
+
+    for _ in range(3):
+        task.reset_timer()
+        task.exec_time(slow_step, 1000, profile=True)
+
+    stats = task.profile_stats("test_profile.<locals>.slow_step")
+    calls = [
+        value[1] for func, value in stats.stats.items()
+        if func[2] == "slow_step"
+    ]
+    assert calls == [3]
+
+    sub_task = process.new_subprocess("sub").new_task("task")
+    with sub_task.section("loop", profile=True) as section_task:
+        assert section_task is sub_task
+        slow_step(1000)
+    assert not sub_task.timer.on
+
+    # The nested runs are profiled by the outer one.
+    with task.section("outer", profile=True):
+        sub_task.reset_timer()
+        sub_task.exec_time(slow_step, 10, profile=True)
+    assert sub_task.profile_stats("test_profile.<locals>.slow_step") is None
+
+    merged = process.profile_stats()
+    calls = [
+        value[1] for func, value in merged.stats.items()
+        if func[2] == "slow_step"
+    ]
+    assert calls == [5]
+    assert process.profile_stats(recursive=False) is None
+
+    task.print_profile(top=3)
+    assert "Profile of profiled:task" in stream.getvalue()
+    assert "slow_step" in stream.getvalue()
+
+    path = process.dump_profile()
+    assert path == str(tmp_path / "profiled.pstats")
+    assert pstats.Stats(path).total_calls == merged.total_calls
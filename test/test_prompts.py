@@ -0,0 +1,67 @@
+import builtins
+import io
+
+from pretty_verbose import VerboseMessages
+from pretty_verbose.prompts import OptionIndex
+
+
+def answer(monkeypatch, *responses):
+    """Answer the inputs with the given responses."""
+    responses = iter(responses)
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(responses))
+
+
+def test_option_index():
+    """Test the substring search of the options."""
+    options = [f"option {i:04d}" for i in range(1000)] + ["Other Thing"]
+    index = OptionIndex(options)
+
+    assert index.search("0042") == [42]
+    assert index.search("thing") == [1000]
+    for query in ("99", "n 09", "ON 1"):
+        assert index.search(query) == [
+            i for i, option in enumerate(options)
+            if query.lower() in option.lower()
+        ]
+    assert index.search("missing") == []
+
+
+def test_select(tmp_path, monkeypatch):
+    """Test the selection of options, logging only the final selection."""
+    stream = io.StringIO()
+    messenger = VerboseMessages(
+        level=3, log_dir=str(tmp_path), stream=stream
+    )
+
+    answer(monkeypatch, "x", "7", "1")
+    assert messenger.select("Pick", options=["a", "b", "c"]) == "b"
+
+    answer(monkeypatch, "0-1, 1, 2")
+    assert messenger.select(
+        "Pick", options=["a", "b", "c"], many=True
+    ) == ("a", "b", "c")
+
+    log = messenger.filename.read_text()
+    assert log.count("USER INPUT") == 2
+    assert "Invalid option" not in log and "Pick" not in log
+
+
+def test_select_pages(tmp_path, monkeypatch):
+    """Test the paginated selection of many options."""
+    stream = io.StringIO()
+    messenger = VerboseMessages(
+        level=3, log_dir=str(tmp_path), stream=stream
+    )
+    options = [f"item {i}" for i in range(10000)]
+
+    answer(monkeypatch, "n", "/item 9999", "9999")
+    assert messenger.select("Pick", options=options) == "item 9999"
+
+    output = stream.getvalue()
+    assert "Page 2/500" in output
+    assert "item 5000" not in output
+    assert "1 of 10000 options" in output
+
+    rows = messenger.filename.read_text().splitlines()
+    assert len(rows) == 2
+    assert rows[1].startswith("USER INPUT") and rows[1].endswith("9999")
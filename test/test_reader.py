@@ -0,0 +1,196 @@
+import io
+
+from pretty_verbose import Process, VerboseMessages
+from pretty_verbose.__main__ import main
+from pretty_verbose.reader_classes import LogReader, replay, time_key
+
+
+def write_logs(log_dir):
+    """Write the logs of a process and one of its tasks."""
+    process = Process(4, "main", log_dir=str(log_dir), stream=io.StringIO())
+    task = process.new_task("task")
+    process.info("first; message")
+    task.warning('quoted "message"')
+    task.error("multi\nline")
+    process.debug("last")
+    process.flush()
+
+    return process, task
+
+
+def test_log_reader(tmp_path):
+    """Test reading the entries of a log file."""
+    process, task = write_logs(tmp_path)
+
+    entries = list(LogReader(process.filename))
+    assert [entry.message_type for entry in entries] == ["INFO", "DEBUG"]
+    assert entries[0].message == "first; message"
+    assert entries[0].scope == "main"
+
+    entries = list(LogReader(task.filename).entries(types=["ERROR"]))
+    assert len(entries) == 1
+    assert entries[0].message == "multi\nline"
+    assert entries[0].scope == "main:task"
+
+    assert not list(LogReader(task.filename).entries(until="2000-01-01"))
+    assert not list(LogReader(process.filename).entries(scopes=["other"]))
+
+
+def test_replay(tmp_path):
+    """Test that the replayed lines match the console."""
+    stream = io.StringIO()
+    process = Process(
+        3, "main", log_dir=str(tmp_path), stream=stream, plain=False
+    )
+    process.info("message")
+    process.success("done")
+
+    output = io.StringIO()
+    n_entries = replay(LogReader(process.filename), output, plain=False)
+
+    assert n_entries == 2
+    assert output.getvalue() == stream.getvalue()
+
+
+def test_replay_command(tmp_path, capsys):
+    """Test the replay command line."""
+    process, task = write_logs(tmp_path)
+
+    code = main([
+        "replay", "--plain", "-t", "warning", "-s", "main:task",
+        str(process.filename), str(task.filename)
+    ])
+
+    assert code == 0
+    assert capsys.readouterr().out.endswith(
+        "[WARNING] [main:task]: quoted \"message\"\n"
+    )
+
+
+def test_split_ranges(tmp_path):
+    """Test that the byte ranges keep every record whole."""
+    process = Process(4, "main", log_dir=str(tmp_path), stream=io.StringIO())
+    for i in range(500):
+        process.info(f"message {i}\nwith ERROR;[01/01/2000 00:00:00] inside")
+    process.flush()
+
+    reader = LogReader(process.filename)
+    ranges = reader.split(7)
+    assert len(ranges) > 1
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    entries = [
+        entry for start, end in ranges
+        for entry in reader.entries(start=start, end=end)
+    ]
+    assert [entry.message for entry in entries] == [
+        entry.message for entry in reader
+    ]
+
+
+def test_summary(tmp_path, capsys):
+    """Test the summary of the logs, in one and several processes."""
+    from pretty_verbose.summary_classes import summarize
+
+    process, task = write_logs(tmp_path)
+    for i in range(200):
+        task.error(f"failure {i}")
+    paths = [process.filename, task.filename]
+
+    summary = summarize(paths, max_workers=1)
+    assert summary.by_type() == {
+        "INFO": 1, "DEBUG": 1, "WARNING": 1, "ERROR": 201
+    }
+    assert summary.by_scope() == {"main": 2, "main:task": 202}
+    assert summary.most_frequent(1) == [("ERROR", "failure #", 200)]
+    assert sum(rate[1] for rate in summary.error_rates()) == 201
+
+    parallel = summarize(paths, max_workers=2, min_chunk_size=1024)
+    assert parallel.counts == summary.counts
+    assert parallel.messages == summary.messages
+
+    assert main(["summary", "--workers", "1", str(task.filename)]) == 0
+    assert "200 [ERROR] failure #" in capsys.readouterr().out
+
+    # A file without header needs the separator.
+    path = tmp_path / "no_header.log"
+    path.write_text("ERROR,[14/11/2023 22:13:20],boom\n")
+    assert main(["summary", "--workers", "1", "--sep", ",", str(path)]) == 0
+    assert "1 [ERROR] boom" in capsys.readouterr().out
+
+
+def test_merge_logs(tmp_path):
+    """Test merging the logs of a process tree by time."""
+    from pretty_verbose.reader_classes import merge_entries
+
+    process = Process(4, "main", log_dir=str(tmp_path), stream=io.StringIO())
+    subprocess = process.new_subprocess("sub")
+    task = subprocess.new_task("task")
+    for i in range(3):
+        process.info(f"process {i}")
+        task.warning(f"task {i}")
+        subprocess.error(f"subprocess {i}")
+
+    entries = list(LogReader(process.merge_logs()))
+    assert len(entries) == 9
+
+    # Messages of the same time keep the order of their log.
+    for scope in ("main", "main.sub", "main.sub:task"):
+        messages = [entry.message for entry in entries if entry.scope == scope]
+        assert [message[-1] for message in messages] == ["0", "1", "2"]
+
+    # Records of different times are sorted.
+    first = tmp_path / "first.log"
+    first.write_text(
+        "message_type;n_datetime;message\r\n"
+        "INFO;[01/01/2024 10:00:00];a\r\n"
+        "INFO;[01/01/2024 10:00:02];c\r\n"
+    )
+    second = tmp_path / "second.log"
+    second.write_text(
+        "message_type;n_datetime;message\r\n"
+        "INFO;[01/01/2024 10:00:01];b\r\n"
+        "INFO;[01/01/2024 10:00:02];d\r\n"
+    )
+    merged = merge_entries([LogReader(first), LogReader(second)])
+    assert [entry.message for entry in merged] == ["a", "b", "c", "d"]
+
+    output = tmp_path / "all.log"
+    assert main(["merge", str(tmp_path), "-o", str(output)]) == 0
+    assert len(list(LogReader(output))) == 13
+
+
+def test_sequence_numbers(tmp_path):
+    """Test that the records of one process are merged exactly in order."""
+    process = Process(4, "main", log_dir=str(tmp_path), stream=io.StringIO())
+    tasks = [process.new_task(f"task{i}") for i in range(3)]
+    for i in range(300):
+        tasks[i % 3].info(f"{i}")
+
+    entries = list(LogReader(process.merge_logs()))
+    assert [int(entry.message) for entry in entries] == list(range(300))
+    assert all(
+        (a.time, a.seq) < (b.time, b.seq) for a, b in zip(entries, entries[1:])
+    )
+
+
+def test_legacy_logs(tmp_path):
+    """Test reading and appending to the logs with formatted times."""
+    path = tmp_path / "old.log"
+    path.write_text(
+        "message_type;n_datetime;message\r\n"
+        "INFO;[01/01/2024 10:00:00];old message\r\n"
+    )
+
+    messenger = VerboseMessages(
+        level=3, log_dir=str(tmp_path), filename="old.log",
+        stream=io.StringIO()
+    )
+    messenger.info("new message")
+
+    entries = list(LogReader(path))
+    assert [entry.message for entry in entries] == [
+        "old message", "new message"
+    ]
+    assert entries[0].time == time_key("2024-01-01 10:00:00")
+    assert entries[1].time > entries[0].time
@@ -0,0 +1,194 @@
+"""Test the sinks of the messages."""
+import io
+import os
+
+from pretty_verbose import Process, VerboseMessages
+from pretty_verbose.sink_classes import ConsoleSink, FileSink, format_row
+
+
+def read_rows(path):
+    """Read the rows of a log file, without the header."""
+    with open(path, encoding="utf-8", newline="") as file:
+        return file.read().split("\r\n")[1:-1]
+
+
+def test_format_row():
+    """Test the rows are quoted as the csv module does."""
+    assert format_row(("INFO", "now", "a;b")) == 'INFO;now;"a;b"\r\n'
+    assert format_row(("INFO", "now", 'say "hi"')) == (
+        'INFO;now;"say ""hi"""\r\n'
+    )
+
+
+def test_level_routing(tmp_path):
+    """Test each sink writes the messages of its own level."""
+    errors = FileSink(tmp_path / "errors.log", level=0, fsync=True)
+    debug = FileSink(tmp_path / "debug.log", level=4, mode="async")
+    stream = io.StringIO()
+
+    messages = VerboseMessages(
+        level=3, name="routing", log_dir=tmp_path, stream=stream,
+        sinks=[errors, debug]
+    )
+    messages.error("Error message.")
+    messages.info("Info message.")
+    messages.debug("Debug message.")
+    messages.flush()
+
+    assert read_rows(tmp_path / "errors.log") == [
+        row for row in read_rows(tmp_path / "errors.log")
+        if row.startswith("ERROR;")
+    ]
+    assert len(read_rows(tmp_path / "errors.log")) == 1
+    assert len(read_rows(tmp_path / "debug.log")) == 3
+    assert len(read_rows(tmp_path / "messages.log")) == 2
+    assert stream.getvalue().count("\n") == 2
+    debug.close()
+
+
+def test_shared_sinks(tmp_path):
+    """Test the sinks are shared by the tasks of a process."""
+    shared = FileSink(tmp_path / "all.log", mode="buffered", level=4)
+    process = Process(
+        0, "shared", log_dir=tmp_path, no_save=True, sinks=[shared],
+        stream=io.StringIO()
+    )
+    tsk = process.new_task("Task")
+    sub = process.new_subprocess("Sub")
+
+    assert tsk.console_sink() is process.console_sink()
+    assert shared in tsk.sinks() and shared in sub.sinks()
+
+    process.info("Process message.")
+    tsk.info("Task message.")
+    sub.batch("debug", ["Batch 1.", "Batch 2."])
+    tsk.info("Not saved message.", skip_save=True)
+    shared.close()
+
+    assert len(read_rows(tmp_path / "all.log")) == 4
+
+
+def test_console_sink():
+    """Test a console sink with its own level."""
+    stream = io.StringIO()
+    messages = VerboseMessages(
+        level=0, name="console", no_save=True,
+        console_sink=ConsoleSink(stream, level=3)
+    )
+    messages.info("Info message.")
+    messages.debug("Debug message.")
+
+    assert "Info message." in stream.getvalue()
+    assert "Debug message." not in stream.getvalue()
+
+
+def test_compressed_file_sink(tmp_path):
+    """Test the compressed logs, readable up to their last flush."""
+    import gzip
+
+    from pretty_verbose.reader_classes import LogReader
+
+    for compression, mode in (
+        ("gzip", "buffered"), ("xz", "sync"), ("gzip", "async")
+    ):
+        messenger = VerboseMessages(
+            level=3, filename=f"{compression}_{mode}.log",
+            log_dir=str(tmp_path),
+            stream=io.StringIO(), compression=compression, mode=mode,
+            flush_interval=60
+        )
+        suffix = ".gz" if compression == "gzip" else ".xz"
+        assert messenger.filename.name == f"{compression}_{mode}.log{suffix}"
+
+        messenger.batch("INFO", [f"row {i}" for i in range(100)])
+        # The errors are flushed at once.
+        messenger.error("failure")
+        messenger.flush()
+        messages = [entry.message for entry in LogReader(messenger.filename)]
+        assert messages == [f"row {i}" for i in range(100)] + ["failure"]
+
+    # The files are valid for the standard tools once closed.
+    messenger.set_no_save(True)
+    with gzip.open(messenger.filename, "rt", newline="") as file:
+        assert file.readline() == "message_type;time_ns;seq;message\r\n"
+
+    # The messages written one by one are compressed together.
+    sizes = {}
+    for compression in (None, "gzip", "xz"):
+        for mode in ("sync", "buffered", "async"):
+            messenger = VerboseMessages(
+                level=3, filename=f"size_{compression}_{mode}.log",
+                log_dir=str(tmp_path), stream=io.StringIO(),
+                compression=compression, mode=mode
+            )
+            for i in range(2000):
+                messenger.info(f"Processed row {i}")
+            messenger.set_no_save(True)
+            sizes[compression, mode] = os.path.getsize(messenger.filename)
+
+    for mode in ("sync", "buffered", "async"):
+        assert sizes["gzip", mode] < sizes[None, mode] / 3
+        assert sizes["xz", mode] < sizes[None, mode] / 3
+
+
+def test_compressed_fsync(tmp_path, monkeypatch):
+    """Test the compressed logs are synced to the disk when flushed."""
+    synced = []
+    fsync = os.fsync
+
+    def record_fsync(fd):
+        synced.append(os.fstat(fd).st_size)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", record_fsync)
+    for compression in ("gzip", "xz"):
+        sink = FileSink(
+            tmp_path / f"{compression}.log", compression=compression,
+            fsync=True
+        )
+        messages = VerboseMessages(
+            level=3, log_dir=tmp_path, stream=io.StringIO(), no_save=True,
+            sinks=[sink]
+        )
+        messages.error("Error message.")
+
+        # The file is synced with the end of the compressed stream.
+        assert synced and synced[-1] == os.path.getsize(sink.path)
+        synced.clear()
+        sink.close()
+
+
+def test_open_files_cap(tmp_path, monkeypatch):
+    """Test the cap of open log files and the shared writer thread."""
+    import threading
+
+    from pretty_verbose import sink_classes
+    from pretty_verbose.reader_classes import LogReader
+
+    monkeypatch.setattr(sink_classes, "MAX_OPEN_FILES", 8)
+
+    for config in (
+        {"mode": "buffered"}, {"compression": "gzip"}, {"mode": "async"}
+    ):
+        log_dir = tmp_path / "_".join(config.values())
+        log_dir.mkdir()
+        process = Process(
+            3, "capped", log_dir=str(log_dir), stream=io.StringIO(), **config
+        )
+        tasks = [process.new_task(f"task_{i}") for i in range(40)]
+        for _ in range(2):
+            for i, task in enumerate(tasks):
+                task.info(f"message {i}")
+        for task in tasks:
+            task.flush()
+
+        assert len(sink_classes._OPEN_SINKS) <= 8
+        for i, task in enumerate(tasks):
+            messages = [entry.message for entry in LogReader(task.filename)]
+            assert messages == [f"message {i}"] * 2
+
+    writers = [
+        thread for thread in threading.enumerate()
+        if thread.name == "FileSink writer"
+    ]
+    assert len(writers) == 1
@@ -0,0 +1,77 @@
+import io
+import time
+
+from pretty_verbose import Process, Watchdog
+from pretty_verbose import processes_classes
+
+
+def test_watchdog_late_task(tmp_path):
+    """Test the warning of a task running over its deadline."""
+    stream = io.StringIO()
+    process = Process(3, "watched", log_dir=tmp_path, stream=stream)
+
+    with Watchdog(stack=True) as watchdog:
+        assert processes_classes._WATCHDOG is watchdog
+
+        fast = process.new_task("fast", deadline=0.05, timer=True)
+        fast.task_done()
+
+        slow = process.new_task("slow", deadline=0.05, timer=True)
+        time.sleep(0.3)
+        slow.task_done()
+
+        # Tasks without deadline are not watched without a default one.
+        untimed = process.new_task("untimed", timer=True)
+        time.sleep(0.1)
+        untimed.task_done()
+
+    assert processes_classes._WATCHDOG is None
+    assert watchdog.late == 1
+
+    output = stream.getvalue()
+    assert "[watched:slow]" in output
+    assert "over its deadline of 0.05s" in output
+    assert "test_watchdog_late_task" in output
+    assert "[watched:fast]: Task running" not in output
+
+
+def test_watchdog_default_deadline(tmp_path):
+    """Test the default deadline of the watchdog."""
+    stream = io.StringIO()
+    process = Process(3, "default", log_dir=tmp_path, stream=stream)
+
+    watchdog = Watchdog(default_deadline=0.05).start()
+    try:
+        task = process.new_task("task")
+        task.start_timer()
+        time.sleep(0.3)
+        task.task_done()
+
+        # Restarted timers are watched again.
+        task.set_deadline(10)
+        task.start_timer()
+        time.sleep(0.1)
+        task.task_done()
+    finally:
+        watchdog.stop()
+
+    assert watchdog.late == 1
+    assert "over its deadline of 0.05s" in stream.getvalue()
+    assert "File \"" not in stream.getvalue()
+
+
+def test_watchdog_drops_stopped_timers(tmp_path):
+    """Test that the stopped timers do not stay in the watchdog."""
+    process = Process(-1, "many", log_dir=tmp_path, no_save=True)
+    task = process.new_task("task", deadline=60)
+
+    with Watchdog() as watchdog:
+        for _ in range(5000):
+            task.start_timer()
+            task.task_done()
+        running = process.new_task("running", deadline=60, timer=True)
+
+        assert len(watchdog._heap) <= 2 * Watchdog.MIN_DROPPED
+        assert list(watchdog._entries) == [running]
+        running.task_done()
+        assert not watchdog._entries